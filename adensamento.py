@@ -0,0 +1,264 @@
+# adensamento.py
+
+"""
+Recalque por adensamento primário (Terzaghi) e sua evolução no tempo.
+
+Para cada camada de argila sob o tanque:
+    Δσ   = q · [1 - (1 / (1 + (a/z)²))^1,5]         (eixo de área circular, Boussinesq)
+    S    = H/(1 + e0) · [Cr·log(σp/σ0) + Cc·log(σf/σp)]   (recompressão + compressão virgem)
+    Tv   = cv · t / Hd²
+    U    = 1 - Σ 2/M² · exp(-M²·Tv),  M = (2m + 1)·π/2
+
+A história de carregamento (primeiro enchimento, teste hidrostático) é
+discretizada em incrementos; cada incremento adensa a partir do instante
+em que é aplicado e o recalque é a superposição dos incrementos. A tensão
+de pré-adensamento é atualizada a cada incremento, de modo que o
+recarregamento após o teste hidrostático ocorre em recompressão.
+
+O cálculo é vetorizado em tanques × incrementos × tempos × camadas × termos
+da série. O número de termos é escolhido pelo menor Tv da avaliação e fica
+em cache; para Tv < 0,05 usa-se a forma fechada U = 2·√(Tv/π), exata
+nessa faixa (erro < 1e-10).
+
+Unidades: comprimentos em m, tensões em kN/m², cv em m²/ano, tempos em dias.
+"""
+
+from functools import lru_cache
+import math
+
+import numpy as np
+
+GAMMA_AGUA = 9.81       # kN/m³
+TV_SERIE = 0.05         # abaixo deste Tv usa-se U = 2·√(Tv/π)
+
+
+@lru_cache(maxsize=None)
+def coeficientes_serie(tv_minimo: float, tolerancia: float = 1e-8):
+    """
+    Termos da série de Terzaghi necessários para o erro de truncamento ficar
+    abaixo da tolerância em Tv >= tv_minimo.
+
+    :return: (M², 2/M²) como arrays somente leitura
+    """
+    n = 1
+    while True:
+        M = (2 * n + 1) * math.pi / 2
+        # cauda da série a partir do termo n, majorada por uma progressão geométrica
+        razao = math.exp(-2 * math.pi ** 2 * tv_minimo)
+        if 2 / M ** 2 * math.exp(-M ** 2 * tv_minimo) / (1 - razao) < tolerancia:
+            break
+        n += 1
+    M = (2 * np.arange(n) + 1) * np.pi / 2
+    M2 = M ** 2
+    coef = 2 / M2
+    M2.flags.writeable = False
+    coef.flags.writeable = False
+    return M2, coef
+
+
+def grau_adensamento(Tv, tolerancia: float = 1e-8):
+    """
+    Grau médio de adensamento U(Tv) de Terzaghi, vetorizado.
+
+    Tv <= 0 resulta em U = 0.
+    """
+    Tv = np.asarray(Tv, dtype=float)
+    U = np.zeros_like(Tv)
+    pequeno = (Tv > 0) & (Tv < TV_SERIE)
+    U[pequeno] = 2 * np.sqrt(Tv[pequeno] / np.pi)
+
+    serie = Tv >= TV_SERIE
+    if np.any(serie):
+        tv = Tv[serie]
+        # o menor Tv é arredondado para baixo em escala logarítmica, para reaproveitar o cache
+        chave = 10 ** (math.floor(math.log10(float(tv.min())) * 8) / 8)
+        M2, coef = coeficientes_serie(chave, tolerancia)
+        U[serie] = 1 - np.exp(-tv[:, np.newaxis] * M2) @ coef
+    return U
+
+
+def _camadas_em_arrays(camadas, nivel_agua):
+    espessura = np.array([c['espessura'] for c in camadas], dtype=float)
+    gamma = np.array([c.get('gamma', 17.0) for c in camadas], dtype=float)
+    topo = np.concatenate([[0.0], np.cumsum(espessura)[:-1]])
+    meio = topo + espessura / 2
+
+    # tensão efetiva inicial no meio de cada camada (integração por trechos acima/abaixo do NA)
+    sigma_topo = np.zeros_like(meio)
+    acumulado = 0.0
+    for i in range(len(camadas)):
+        sigma_topo[i] = acumulado
+        seco = np.clip(nivel_agua - topo[i], 0, espessura[i])
+        acumulado += gamma[i] * seco + (gamma[i] - GAMMA_AGUA) * (espessura[i] - seco)
+    seco_meio = np.clip(nivel_agua - topo, 0, espessura / 2)
+    sigma0 = sigma_topo + gamma * seco_meio + (gamma - GAMMA_AGUA) * (espessura / 2 - seco_meio)
+
+    drenagem_dupla = np.array([c.get('drenagem', 'dupla') == 'dupla' for c in camadas])
+    return {
+        'espessura': espessura,
+        'profundidade': meio,
+        'sigma0': sigma0,
+        'sigma_p': np.array([c.get('sigma_pre', 0.0) for c in camadas], dtype=float),
+        'Cc': np.array([c['Cc'] for c in camadas], dtype=float),
+        'Cr': np.array([c.get('Cr', c['Cc'] / 10) for c in camadas], dtype=float),
+        'e0': np.array([c['e0'] for c in camadas], dtype=float),
+        'cv': np.array([c['cv'] for c in camadas], dtype=float),
+        'Hd': np.where(drenagem_dupla, espessura / 2, espessura),
+    }
+
+
+def _recalque_incremento(sigma_a, sigma_b, sigma_p, Cc, Cr, fator):
+    """Recalque de consolidação final de σa → σb, dada a tensão de pré-adensamento σp."""
+    carga = sigma_b >= sigma_a
+    recomp_ate = np.minimum(sigma_b, np.maximum(sigma_p, sigma_a))
+    recompressao = Cr * np.log10(np.maximum(recomp_ate, sigma_a) / sigma_a)
+    virgem = Cc * np.log10(np.maximum(sigma_b, np.maximum(sigma_p, sigma_a)) / np.maximum(sigma_p, sigma_a))
+    expansao = Cr * np.log10(sigma_b / sigma_a)
+    return fator * np.where(carga, recompressao + virgem, expansao)
+
+
+def historico(*trechos):
+    """
+    Monta uma história de carregamento a partir de trechos (duração_dias, pressão_final).
+
+    Ex.: historico((30, 120.0), (60, 120.0)) → rampa até 120 kN/m² em 30 dias e 60 dias de espera.
+
+    As pressões podem ser arrays (uma por tanque); nesse caso o último eixo do
+    resultado é o dos vértices.
+
+    :return: (tempos_dias, pressoes) nos vértices, começando em (0, 0)
+    """
+    tempos, pressoes = [0.0], [0.0]
+    for duracao, pressao in trechos:
+        tempos.append(tempos[-1] + duracao)
+        pressoes.append(pressao)
+    pressoes = np.broadcast_arrays(*[np.asarray(p, dtype=float) for p in pressoes])
+    return np.array(tempos), np.stack(pressoes, axis=-1)
+
+
+def recalque_adensamento(camadas, diametro, tempos_carga, pressoes_carga, tempos,
+                         nivel_agua=0.0, passos_por_rampa=10, tolerancia=1e-8):
+    """
+    Curvas de recalque por adensamento × tempo para um ou vários tanques.
+
+    :param camadas: lista de camadas (do topo para baixo), dicionários com 'espessura' (m),
+                    'Cc', 'e0', 'cv' (m²/ano) e opcionalmente 'Cr' (padrão Cc/10),
+                    'gamma' (kN/m³, padrão 17), 'sigma_pre' (kN/m²; padrão = normalmente
+                    adensada) e 'drenagem' ('dupla' ou 'simples')
+    :param diametro: diâmetro do tanque (m), escalar ou array (n_tanques,)
+    :param tempos_carga: instantes dos vértices da história de carga (dias)
+    :param pressoes_carga: pressão aplicada nos vértices (kN/m²), (n_vertices,) ou (n_tanques, n_vertices)
+    :param tempos: instantes de saída (dias)
+    :param nivel_agua: profundidade do nível d'água abaixo da base (m)
+    :param passos_por_rampa: incrementos de carga por trecho de rampa
+    :param tolerancia: erro de truncamento admitido na série de Terzaghi
+    :return: dicionário com tempos, recalque total e por camada (mm), recalque final e grau de adensamento
+    """
+    c = _camadas_em_arrays(camadas, nivel_agua)
+    diametro = np.atleast_1d(np.asarray(diametro, dtype=float))
+    pressoes_carga = np.atleast_2d(np.asarray(pressoes_carga, dtype=float))
+    n_tanques = max(diametro.size, pressoes_carga.shape[0])
+    diametro = np.broadcast_to(diametro, (n_tanques,))
+    pressoes_carga = np.broadcast_to(pressoes_carga, (n_tanques, pressoes_carga.shape[1]))
+    tempos_carga = np.asarray(tempos_carga, dtype=float)
+    tempos = np.asarray(tempos, dtype=float)
+
+    # Discretização da história em incrementos (aplicados no meio de cada passo da rampa)
+    instantes, pressoes = [], []
+    for k in range(1, tempos_carga.size):
+        t0, t1 = tempos_carga[k - 1], tempos_carga[k]
+        q0, q1 = pressoes_carga[:, k - 1], pressoes_carga[:, k]
+        if np.allclose(q0, q1):
+            continue
+        passos = passos_por_rampa if t1 > t0 else 1
+        for s in range(1, passos + 1):
+            instantes.append(t0 + (t1 - t0) * (s - 0.5) / passos if t1 > t0 else t0)
+            pressoes.append(q0 + (q1 - q0) * s / passos)
+    instantes = np.array(instantes)
+    pressoes = np.array(pressoes).T if pressoes else np.zeros((n_tanques, 0))  # (n_tanques, n_incr)
+
+    # Acréscimo de tensão no meio das camadas: (n_tanques, n_incr, n_camadas)
+    a = diametro[:, None, None] / 2
+    z = c['profundidade'][None, None, :]
+    influencia = 1 - (1 / (1 + (a / z) ** 2)) ** 1.5
+    sigma = c['sigma0'] + pressoes[:, :, None] * influencia
+
+    fator = c['espessura'] / (1 + c['e0'])
+    sigma_p = np.broadcast_to(np.maximum(c['sigma_p'], c['sigma0']), (n_tanques, c['sigma0'].size)).copy()
+    anterior = np.broadcast_to(c['sigma0'], sigma_p.shape)
+    incrementos = np.empty_like(sigma)
+    for k in range(sigma.shape[1]):
+        incrementos[:, k] = _recalque_incremento(anterior, sigma[:, k], sigma_p, c['Cc'], c['Cr'], fator)
+        sigma_p = np.maximum(sigma_p, sigma[:, k])
+        anterior = sigma[:, k]
+
+    # Superposição no tempo: (n_incr, n_tempos, n_camadas)
+    decorrido = (tempos[None, :] - instantes[:, None]) / 365.0
+    Tv = c['cv'][None, None, :] * decorrido[:, :, None] / c['Hd'][None, None, :] ** 2
+    U = grau_adensamento(Tv, tolerancia)
+    por_camada = np.einsum('ikc,ktc->itc', incrementos, U)  # (n_tanques, n_tempos, n_camadas)
+
+    total = por_camada.sum(axis=2)
+    final = incrementos.sum(axis=(1, 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        grau = np.where(final[:, None] != 0, total / final[:, None], 0.0)
+
+    return {
+        'tempos_dias': tempos,
+        'recalque_mm': total * 1000,
+        'recalque_camadas_mm': por_camada * 1000,
+        'recalque_final_mm': final * 1000,
+        'grau_adensamento': grau,
+    }
+
+
+def cronogramas_padrao(pressao_produto, pressao_agua, dias_enchimento=30, dias_hidroteste=(15, 30, 10),
+                       dias_operacao=3650):
+    """
+    Histórias de carga típicas.
+
+    :param pressao_produto: pressão do tanque cheio de produto (kN/m²)
+    :param pressao_agua: pressão do tanque cheio de água (kN/m²)
+    :param dias_enchimento: duração do primeiro enchimento com produto
+    :param dias_hidroteste: (enchimento, espera cheio, esvaziamento) do teste hidrostático
+    :param dias_operacao: horizonte de operação após o enchimento
+    :return: {'primeiro_enchimento': (tempos, pressoes), 'hidroteste': (tempos, pressoes)}
+    """
+    enchendo, espera, esvaziando = dias_hidroteste
+    return {
+        'primeiro_enchimento': historico((dias_enchimento, pressao_produto), (dias_operacao, pressao_produto)),
+        'hidroteste': historico(
+            (enchendo, pressao_agua), (espera, pressao_agua), (esvaziando, 0.0),
+            (dias_enchimento, pressao_produto), (dias_operacao, pressao_produto)
+        ),
+    }
+
+
+def curvas_tanques(colunas: dict, camadas, tempos=None, nivel_agua=0.0, densidade_agua=9.81, **cronograma):
+    """
+    Curvas de recalque × tempo do primeiro enchimento e do teste hidrostático
+    para tanques descritos pelas colunas de motor_vetorizado.
+
+    A pressão aplicada é p = p1 + p2 - p3 da verificação do solo compactado,
+    com o produto ou com água.
+
+    :param colunas: entradas com as chaves de motor_vetorizado.CAMPOS_ENTRADA (escalares ou arrays)
+    :param camadas: camadas de solo (ver recalque_adensamento)
+    :param tempos: instantes de saída em dias (padrão: escala logarítmica até 10 anos)
+    :return: {'primeiro_enchimento': {...}, 'hidroteste': {...}}
+    """
+    p1 = 18.0 * np.asarray(colunas['h1'], dtype=float)
+    p3 = 16.0 * (np.asarray(colunas['h2'], dtype=float) + np.asarray(colunas['h3'], dtype=float))
+    altura = np.asarray(colunas['altura'], dtype=float)
+    pressao_produto = np.atleast_1d(p1 + np.asarray(colunas['densidade_fluido']) * altura - p3)
+    pressao_agua = np.atleast_1d(p1 + densidade_agua * altura - p3)
+    if tempos is None:
+        tempos = np.concatenate([[0.0], np.logspace(-1, math.log10(3650 + 200), 120)])
+
+    historias = cronogramas_padrao(pressao_produto, pressao_agua, **cronograma)
+    resultado = {}
+    for nome, (tempos_carga, pressoes) in historias.items():
+        resultado[nome] = recalque_adensamento(
+            camadas, colunas['diametro'], tempos_carga, pressoes, tempos, nivel_agua
+        )
+    return resultado
@@ -1,13 +1,15 @@
 import math
 
+from utils import converter_unidades
+
 def calcular_armadura_flexao(
     Md_pos_kNm, Md_neg_kNm,
     h_m, base1_m, base2_m,
     fck=30, fyk=500
 ):
     # Constantes e conversões
-    bw = (base1_m + base2_m) * 1000  # largura em mm
-    h = h_m * 1000  # altura em mm
+    bw = converter_unidades(base1_m + base2_m, 'm', 'mm')  # largura em mm
+    h = converter_unidades(h_m, 'm', 'mm')  # altura em mm
     cobrimento = 40  # mm
     d = h - cobrimento  # mm
     fcd = fck / 1.4  # MPa
@@ -17,14 +19,14 @@ def calcular_armadura_flexao(
         if Md_kNm <= 0:
             return 0.0, 0.0
         
-        Md_Nmm = Md_kNm * 1e6  # kNm para Nmm
+        Md_Nmm = converter_unidades(Md_kNm, 'kNm', 'Nmm')
         z = 0.68 * d  # mm
         
         # Cálculo direto da armadura As pela NBR 6118
         As_mm2 = Md_Nmm / (fyd * z)
         y_d = As_mm2 / (bw * d)  # razão geométrica (para referência)
         
-        As_cm2 = As_mm2 / 100  # conversão correta para cm²
+        As_cm2 = converter_unidades(As_mm2, 'mm2', 'cm2')
         
         return y_d, As_cm2
 
@@ -32,8 +34,8 @@ def calcular_armadura_flexao(
     y_d_neg, As_neg = calcular_As(abs(Md_neg_kNm)) if Md_neg_kNm < 0 else (0.0, 0.0)
 
     # Armadura mínima conforme NBR 6118
-    As_min = 0.0015 * bw * h / 100  # cm²
-    As_pele = 0.001 * bw * h / 100  # cm²
+    As_min = converter_unidades(0.0015 * bw * h, 'mm2', 'cm2')
+    As_pele = converter_unidades(0.001 * bw * h, 'mm2', 'cm2')
 
     return {
         "armadura_minima_cm2": round(As_min, 2),
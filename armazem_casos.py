@@ -0,0 +1,320 @@
+# armazem_casos.py
+
+"""
+Armazém colunar de casos para estudos com muitos tanques.
+
+Em vez de um EntradaDados (quatro dicionários) por caso, cada entrada do
+cálculo é uma coluna NumPy com os nomes de motor_vetorizado.CAMPOS_ENTRADA
+(valores já nas unidades do motor: tensão admissível em kN/m²), mais o tipo
+de solo como coluna categórica.
+
+Em disco, o armazém é um diretório com um arquivo .npy por coluna e um
+meta.json. Ao abrir, as colunas são mapeadas em memória (np.load com
+mmap_mode), de modo que um estudo com milhões de casos abre instantaneamente
+e só as páginas usadas são lidas. Fatias (fatia, blocos) são vistas sem
+cópia; um armazém mapeado é enviado a outros processos apenas como
+(diretório, início, fim), e cada processo mapeia os mesmos arquivos.
+"""
+
+import csv
+import json
+import os
+import re
+
+import numpy as np
+
+from motor_vetorizado import CAMPOS_ENTRADA, UNIDADES_ENTRADA, colunas_de_entrada
+from utils import converter_colunas, fator_conversao
+
+VERSAO = 1
+ARQUIVO_META = 'meta.json'
+KGFCM2_PARA_KNM2 = fator_conversao('kgf/cm2', 'kN/m2')
+
+# Cabeçalho de planilha: 'nome [unidade]' ou 'nome (unidade)'
+_CABECALHO = re.compile(r'^\s*([^\[\(]+?)\s*(?:[\[\(]\s*([^\]\)]*?)\s*[\]\)])?\s*$')
+
+
+class ArmazemCasos:
+    """
+    Conjunto de casos em colunas (struct of arrays).
+    """
+    def __init__(self, colunas: dict, tipos_solo=None, categorias=(), diretorio=None, inicio=0):
+        """
+        :param colunas: nome → array 1D, com as chaves de CAMPOS_ENTRADA e mesmo comprimento
+        :param tipos_solo: códigos (índices em `categorias`) do tipo de solo de cada caso
+        :param categorias: nomes dos tipos de solo
+        :param diretorio: diretório de origem, quando as colunas são mapeadas de disco
+        :param inicio: posição do primeiro caso dentro do armazém em disco
+        """
+        faltantes = [nome for nome in CAMPOS_ENTRADA if nome not in colunas]
+        if faltantes:
+            raise ValueError(f"Colunas ausentes no armazém: {faltantes}")
+        tamanhos = {len(colunas[nome]) for nome in CAMPOS_ENTRADA}
+        if len(tamanhos) > 1:
+            raise ValueError("Todas as colunas devem ter o mesmo número de casos.")
+
+        self._colunas = {nome: colunas[nome] for nome in CAMPOS_ENTRADA}
+        quantidade = tamanhos.pop()
+        self.tipos_solo = (np.zeros(quantidade, dtype=np.int16) if tipos_solo is None else tipos_solo)
+        self.categorias = list(categorias)
+        self.diretorio = diretorio
+        self.inicio = inicio
+
+    # ------------------------------------------------------------------ construção
+
+    @classmethod
+    def vazio(cls, quantidade: int) -> 'ArmazemCasos':
+        """Armazém em memória com todas as colunas zeradas."""
+        return cls({nome: np.zeros(quantidade) for nome in CAMPOS_ENTRADA})
+
+    @classmethod
+    def de_entradas(cls, pares) -> 'ArmazemCasos':
+        """
+        Monta o armazém a partir de pares (EntradaDados, Materiais).
+
+        Os valores padrão são os mesmos dos métodos de cálculo (colunas_de_entrada).
+        """
+        pares = list(pares)
+        armazem = cls.vazio(len(pares))
+        categorias = {}
+        for i, (entrada, materiais) in enumerate(pares):
+            for nome, valor in colunas_de_entrada(entrada, materiais).items():
+                armazem._colunas[nome][i] = valor
+            tipo = entrada.solo.get('tipo', '')
+            armazem.tipos_solo[i] = categorias.setdefault(tipo, len(categorias))
+        armazem.categorias = list(categorias)
+        return armazem
+
+    @classmethod
+    def de_casos(cls, casos) -> 'ArmazemCasos':
+        """
+        Monta o armazém a partir de dicionários no formato do arquivo JSON de entrada.
+        """
+        from dados_entrada import EntradaDados
+        from processamento import montar_materiais
+
+        def pares():
+            for dados in casos:
+                entrada = EntradaDados()
+                entrada.definir_dados(dados)
+                yield entrada, montar_materiais(entrada)
+
+        return cls.de_entradas(pares())
+
+    @classmethod
+    def de_planilha(cls, caminho: str, unidades: dict = None) -> 'ArmazemCasos':
+        """
+        Monta o armazém a partir de uma planilha (CSV) com um caso por linha e unidades mistas.
+
+        Cada coluna de CAMPOS_ENTRADA pode indicar a sua unidade no cabeçalho
+        ('altura [ft]', 'tensao_admissivel (kgf/cm²)') ou em `unidades`; colunas sem
+        unidade já estão nas unidades do motor (UNIDADES_ENTRADA). Cada coluna é convertida
+        de uma vez (utils.converter_colunas). A coluna 'tensao_adm_kgfcm2' do formato JSON
+        é aceita no lugar de 'tensao_admissivel' e 'tipo' (opcional) é o tipo de solo.
+        Com separador ';', a vírgula decimal é aceita.
+
+        :param caminho: arquivo CSV
+        :param unidades: nome da coluna → unidade (prevalece sobre o cabeçalho)
+        """
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            amostra = f.read(4096)
+            f.seek(0)
+            separador = ';' if amostra.count(';') > amostra.count(',') else ','
+            leitor = csv.reader(f, delimiter=separador)
+            cabecalho = next(leitor)
+            linhas = [linha for linha in leitor if any(campo.strip() for campo in linha)]
+
+        nomes, origem = [], {}
+        for titulo in cabecalho:
+            nome, unidade = _CABECALHO.match(titulo).groups()
+            if nome == 'tensao_adm_kgfcm2':
+                nome, unidade = 'tensao_admissivel', 'kgf/cm2'
+            nomes.append(nome)
+            if unidade:
+                origem[nome] = unidade
+        origem.update(unidades or {})
+
+        faltantes = [nome for nome in CAMPOS_ENTRADA if nome not in nomes]
+        if faltantes:
+            raise ValueError(f"{caminho}: colunas ausentes na planilha: {faltantes}")
+        texto = np.array(linhas, dtype=str).reshape(len(linhas), len(cabecalho))
+        if separador == ';':
+            texto = np.char.replace(texto, ',', '.')
+        colunas = {nome: texto[:, nomes.index(nome)].astype(float) for nome in CAMPOS_ENTRADA}
+        colunas = converter_colunas(colunas, origem, UNIDADES_ENTRADA)
+
+        categorias = {}
+        tipos = np.zeros(len(linhas), dtype=np.int16)
+        if 'tipo' in nomes:
+            tipos[:] = [categorias.setdefault(tipo.strip(), len(categorias)) for tipo in texto[:, nomes.index('tipo')]]
+        return cls(colunas, tipos, list(categorias))
+
+    @classmethod
+    def criar(cls, diretorio: str, quantidade: int, categorias=()) -> 'ArmazemCasos':
+        """
+        Cria em disco um armazém zerado, mapeado para escrita.
+
+        Serve para preencher estudos maiores que a memória bloco a bloco
+        (ex.: for bloco in armazem.blocos(100000): bloco.coluna('altura')[:] = ...).
+        Ao final, chame fechar() para gravar as alterações.
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        colunas = {
+            nome: np.lib.format.open_memmap(os.path.join(diretorio, f'{nome}.npy'), mode='w+',
+                                            dtype=np.float64, shape=(quantidade,))
+            for nome in CAMPOS_ENTRADA
+        }
+        tipos = np.lib.format.open_memmap(os.path.join(diretorio, 'tipo_solo.npy'), mode='w+',
+                                          dtype=np.int16, shape=(quantidade,))
+        armazem = cls(colunas, tipos, categorias, diretorio)
+        armazem._gravar_meta(diretorio)
+        return armazem
+
+    @classmethod
+    def abrir(cls, diretorio: str, modo: str = 'r', inicio: int = 0, fim: int = None) -> 'ArmazemCasos':
+        """
+        Abre um armazém salvo, com as colunas mapeadas em memória.
+
+        :param diretorio: diretório criado por salvar() ou criar()
+        :param modo: 'r' (somente leitura), 'r+' (leitura e escrita) ou 'c' (cópia na escrita)
+        :param inicio, fim: intervalo de casos a expor (sem cópia)
+        """
+        with open(os.path.join(diretorio, ARQUIVO_META), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('versao') != VERSAO:
+            raise ValueError(f"Versão do armazém não suportada: {meta.get('versao')}")
+
+        fatia = slice(inicio, fim)
+        colunas = {
+            nome: np.load(os.path.join(diretorio, f'{nome}.npy'), mmap_mode=modo)[fatia]
+            for nome in CAMPOS_ENTRADA
+        }
+        tipos = np.load(os.path.join(diretorio, 'tipo_solo.npy'), mmap_mode=modo)[fatia]
+        return cls(colunas, tipos, meta['categorias'], diretorio, inicio)
+
+    # ------------------------------------------------------------------ persistência
+
+    def _gravar_meta(self, diretorio):
+        meta = {
+            'versao': VERSAO,
+            'quantidade': len(self),
+            'colunas': list(CAMPOS_ENTRADA),
+            'categorias': self.categorias,
+        }
+        temporario = os.path.join(diretorio, ARQUIVO_META + '.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, os.path.join(diretorio, ARQUIVO_META))
+
+    def salvar(self, diretorio: str):
+        """
+        Grava o armazém em disco (um .npy por coluna e meta.json).
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        for nome, valores in self._colunas.items():
+            np.save(os.path.join(diretorio, f'{nome}.npy'), np.asarray(valores, dtype=np.float64))
+        np.save(os.path.join(diretorio, 'tipo_solo.npy'), np.asarray(self.tipos_solo, dtype=np.int16))
+        self._gravar_meta(diretorio)
+
+    def fechar(self):
+        """Grava em disco as alterações das colunas mapeadas para escrita."""
+        for valores in list(self._colunas.values()) + [self.tipos_solo]:
+            if isinstance(valores, np.memmap):
+                valores.flush()
+        if self.diretorio and self.inicio == 0 and isinstance(self.tipos_solo, np.memmap):
+            self._gravar_meta(self.diretorio)
+
+    def __getstate__(self):
+        # Armazém mapeado de disco: envia só a referência, cada processo mapeia os arquivos
+        if self.diretorio is not None and all(isinstance(v, np.memmap) for v in self._colunas.values()):
+            return {'diretorio': self.diretorio, 'inicio': self.inicio, 'fim': self.inicio + len(self)}
+        return self.__dict__
+
+    def __setstate__(self, estado):
+        if set(estado) == {'diretorio', 'inicio', 'fim'}:
+            estado = ArmazemCasos.abrir(estado['diretorio'], 'r', estado['inicio'], estado['fim']).__dict__
+        self.__dict__.update(estado)
+
+    # ------------------------------------------------------------------ acesso
+
+    def __len__(self):
+        return len(self.tipos_solo)
+
+    @property
+    def nbytes(self) -> int:
+        """Tamanho dos dados (bytes)."""
+        return sum(v.nbytes for v in self._colunas.values()) + self.tipos_solo.nbytes
+
+    def coluna(self, nome: str) -> np.ndarray:
+        """Coluna de uma entrada (vista, sem cópia)."""
+        return self._colunas[nome]
+
+    def colunas(self) -> dict:
+        """Todas as colunas, no formato aceito por motor_vetorizado.avaliar (vistas, sem cópia)."""
+        return dict(self._colunas)
+
+    def fatia(self, inicio: int, fim: int) -> 'ArmazemCasos':
+        """Casos [inicio, fim) como um novo armazém que compartilha a memória deste."""
+        inicio, fim, _ = slice(inicio, fim).indices(len(self))
+        return ArmazemCasos(
+            {nome: valores[inicio:fim] for nome, valores in self._colunas.items()},
+            self.tipos_solo[inicio:fim], self.categorias, self.diretorio, self.inicio + inicio
+        )
+
+    def blocos(self, tamanho: int):
+        """Percorre o armazém em fatias consecutivas de até `tamanho` casos (sem cópia)."""
+        for inicio in range(0, len(self), tamanho):
+            yield self.fatia(inicio, inicio + tamanho)
+
+    def caso(self, i: int) -> dict:
+        """
+        Caso i no formato do arquivo JSON de entrada.
+
+        fck, fyk e γ do concreto são gravados na geometria, como no arquivo de
+        referência; no cálculo escalar esses valores vêm de Materiais (ver entrada()).
+        """
+        v = {nome: float(valores[i]) for nome, valores in self._colunas.items()}
+        tipo = self.categorias[self.tipos_solo[i]] if self.categorias else ''
+        vento = {chave: v[chave] for chave in ('vento_v0', 'vento_s1', 'vento_s2', 'vento_s3')}
+        geometria = {
+            chave: v[chave] for chave in (
+                'altura', 'diametro', 'diametro_base', 'altura_base', 'lado_a_m', 'lado_b_m', 'h1', 'h2', 'h3'
+            )
+        }
+        geometria.update(fck=v['fck'], gamma=v['gamma_concreto'], fyk=v['fyk'], tipo=tipo,
+                         peso_tanque_vazio=v['peso_tanque_vazio'], **vento)
+        return {
+            'geometria': geometria,
+            'solo': {
+                'tipo': tipo,
+                'tensao_adm_kgfcm2': v['tensao_admissivel'] / KGFCM2_PARA_KNM2,
+                'Esolo': v['Esolo'],
+                'poisson': v['poisson'],
+            },
+            'cargas': dict(vento, pressao_interna=0.0),
+            'dados_tanque': {
+                'PTV': v['peso_tanque_vazio'],
+                'dens_fluido': v['densidade_fluido'],
+            },
+        }
+
+    def entrada(self, i: int):
+        """
+        Caso i como (EntradaDados, Materiais), com fck, fyk e γ do concreto da coluna.
+        """
+        from dados_entrada import EntradaDados
+        from materiais import Materiais
+
+        entrada = EntradaDados()
+        entrada.definir_dados(self.caso(i))
+        materiais = Materiais()
+        materiais.definir_tensao_admissivel(float(self._colunas['tensao_admissivel'][i]))
+        materiais.concreto['fck'] = float(self._colunas['fck'][i])
+        materiais.concreto['gamma'] = float(self._colunas['gamma_concreto'][i])
+        materiais.aco['fyk'] = float(self._colunas['fyk'][i])
+        return entrada, materiais
+
+    def casos(self):
+        """Percorre todos os casos no formato do arquivo JSON de entrada."""
+        for i in range(len(self)):
+            yield self.caso(i)
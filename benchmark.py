@@ -0,0 +1,295 @@
+# benchmark.py
+
+"""
+Suíte de desempenho do IBcalc.
+
+Mede, sobre uma população sintética e reprodutível de tanques (gerador_casos),
+a latência por caso, a vazão em lote com 1 e N processos, o tempo de
+renderização do relatório, o tempo de importação/inicialização e o pico de
+memória de cada ponto de entrada. Os resultados são gravados em JSON e podem
+ser comparados com uma execução anterior usando limites de regressão.
+
+Uso:
+    python benchmark.py --casos 200 --saida bench.json
+    python benchmark.py --saida nova.json --referencia bench.json --tolerancia 0.25
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from gerador_casos import gerar_casos, caso_para_entrada
+from processamento import calcular_caso, montar_materiais, processar_lote
+from relatorio import Relatorio
+
+MODULOS_IMPORTACAO = ('processamento', 'relatorio', 'calculos', 'interface')
+
+
+class _CampoFixo:
+    """Substitui um CTkEntry da interface: devolve sempre o mesmo texto."""
+    def __init__(self, valor):
+        self.valor = str(valor)
+
+    def get(self):
+        return self.valor
+
+
+def _campos_interface(caso: dict) -> dict:
+    campos = {}
+    for secao in ('geometria', 'solo', 'cargas'):
+        for chave, valor in caso[secao].items():
+            campos.setdefault(chave, _CampoFixo(valor))
+    campos['densidade_fluido'] = _CampoFixo(caso['dados_tanque']['dens_fluido'])
+    return campos
+
+
+def _caminho_interface(caso: dict):
+    """Mesmo caminho do botão "Calcular": calculos.executar_calculo com caixas de diálogo desativadas."""
+    import calculos
+    entrada = caso_para_entrada(caso)
+    calculos.executar_calculo(entrada, montar_materiais(entrada), _campos_interface(caso))
+
+
+def _gerar_html(caso: dict):
+    entrada = caso_para_entrada(caso)
+    Relatorio(entrada, montar_materiais(entrada)).gerar_html(os.path.join(os.getcwd(), 'relatorio.html'))
+
+
+PONTOS_ENTRADA = {
+    'interface': _caminho_interface,
+    'gerar_html': _gerar_html,
+    'calcular_caso': calcular_caso,
+}
+
+
+def _metrica(valor, unidade, maior_melhor=False):
+    return {'valor': valor, 'unidade': unidade, 'maior_melhor': maior_melhor}
+
+
+@contextlib.contextmanager
+def _ambiente_isolado():
+    """Diretório temporário, stdout descartado e caixas de diálogo sem efeito."""
+    from tkinter import messagebox
+    originais = (messagebox.showinfo, messagebox.showerror)
+    erros = []
+    messagebox.showinfo = lambda *args, **kwargs: None
+    messagebox.showerror = lambda titulo, mensagem, **kwargs: erros.append(mensagem)
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporario, open(os.devnull, 'w') as nulo:
+        os.chdir(temporario)
+        try:
+            with contextlib.redirect_stdout(nulo):
+                yield erros
+        finally:
+            os.chdir(diretorio_original)
+            messagebox.showinfo, messagebox.showerror = originais
+
+
+def medir_latencia(funcao, casos, repeticoes=3):
+    """
+    Mede a latência de uma chamada por caso.
+
+    :return: (mediana_ms, p95_ms)
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        for caso in casos:
+            inicio = time.perf_counter()
+            funcao(caso)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return statistics.median(tempos), tempos[int(0.95 * (len(tempos) - 1))]
+
+
+def medir_memoria(funcao, caso):
+    """
+    Mede o pico de memória alocada (tracemalloc) durante uma chamada.
+
+    :return: pico em KiB
+    """
+    tracemalloc.start()
+    try:
+        funcao(caso)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico / 1024
+
+
+def medir_importacao(modulo, repeticoes=5):
+    """
+    Mede, em um interpretador novo, o tempo de importação do módulo e o tempo
+    total de inicialização (interpretador + importação).
+
+    :return: (importacao_ms, inicializacao_ms) ou None se o módulo não puder ser importado
+    """
+    codigo = (
+        "import time; t = time.perf_counter(); import {0}; "
+        "print((time.perf_counter() - t) * 1000)"
+    ).format(modulo)
+    importacoes, inicializacoes = [], []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        processo = subprocess.run(
+            [sys.executable, '-c', codigo],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        total = (time.perf_counter() - inicio) * 1000
+        if processo.returncode != 0:
+            return None
+        importacoes.append(float(processo.stdout.strip().splitlines()[-1]))
+        inicializacoes.append(total)
+    return statistics.median(importacoes), statistics.median(inicializacoes)
+
+
+def medir_renderizacao(casos):
+    """
+    Mede apenas a montagem e a gravação do HTML, com os resultados já calculados.
+
+    :return: mediana em ms
+    """
+    tempos = []
+    for caso in casos:
+        entrada = caso_para_entrada(caso)
+        relatorio = Relatorio(entrada, montar_materiais(entrada))
+        resultados = relatorio.calcular_resultados(rastreio=True)
+        inicio = time.perf_counter()
+        relatorio.gerar_html('relatorio.html', resultados=resultados)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def medir_vazao(casos, processos):
+    """
+    Mede a vazão de processar_lote.
+
+    :return: casos por segundo
+    """
+    inicio = time.perf_counter()
+    processar_lote(casos, processos=processos)
+    return len(casos) / (time.perf_counter() - inicio)
+
+
+def executar(quantidade=200, semente=0, processos=None, repeticoes=3):
+    """
+    Executa a suíte completa.
+
+    :param quantidade: número de casos sintéticos do lote
+    :param semente: semente do gerador de casos
+    :param processos: número de processos para a medição de vazão em paralelo (padrão: os.cpu_count())
+    :param repeticoes: repetições das medições de latência
+    :return: dicionário com metadados e métricas
+    """
+    processos = processos or os.cpu_count() or 1
+    casos = gerar_casos(quantidade, semente)
+    amostra = casos[:min(20, len(casos))]
+    metricas = {}
+
+    for modulo in MODULOS_IMPORTACAO:
+        tempos = medir_importacao(modulo)
+        if tempos is None:
+            continue
+        metricas[f'importacao.{modulo}_ms'] = _metrica(round(tempos[0], 3), 'ms')
+        metricas[f'inicializacao.{modulo}_ms'] = _metrica(round(tempos[1], 3), 'ms')
+
+    with _ambiente_isolado() as erros:
+        for nome, funcao in PONTOS_ENTRADA.items():
+            funcao(amostra[0])  # aquecimento (importações tardias, caches)
+            mediana, p95 = medir_latencia(funcao, amostra, repeticoes)
+            metricas[f'latencia.{nome}.mediana_ms'] = _metrica(round(mediana, 4), 'ms')
+            metricas[f'latencia.{nome}.p95_ms'] = _metrica(round(p95, 4), 'ms')
+            metricas[f'memoria.{nome}.pico_kib'] = _metrica(round(medir_memoria(funcao, amostra[0]), 1), 'KiB')
+
+        metricas['renderizacao.gerar_html.mediana_ms'] = _metrica(round(medir_renderizacao(amostra), 4), 'ms')
+
+        for n in sorted({1, processos}):
+            metricas[f'vazao.processar_lote.{n}_processos'] = _metrica(
+                round(medir_vazao(casos, n), 2), 'casos/s', maior_melhor=True
+            )
+
+    if erros:
+        raise RuntimeError(f"O caminho da interface reportou erro: {erros[0]}")
+
+    return {
+        'metadados': {
+            'data': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+            'casos': quantidade,
+            'semente': semente,
+            'processos': processos,
+        },
+        'metricas': metricas,
+    }
+
+
+def comparar(atual: dict, referencia: dict, tolerancia: float = 0.25) -> list:
+    """
+    Compara duas execuções e lista as métricas que regrediram além da tolerância.
+
+    Uma métrica da referência pode definir a própria chave 'tolerancia',
+    que substitui a tolerância global.
+
+    :param atual: resultado de executar()
+    :param referencia: resultado de uma execução anterior
+    :param tolerancia: variação relativa admitida (0.25 = 25 %)
+    :return: lista de dicionários com nome, valor de referência, valor atual e variação
+    """
+    regressoes = []
+    for nome, ref in referencia.get('metricas', {}).items():
+        if nome not in atual.get('metricas', {}) or not ref['valor']:
+            continue
+        valor = atual['metricas'][nome]['valor']
+        limite = ref.get('tolerancia', tolerancia)
+        variacao = (valor - ref['valor']) / ref['valor']
+        piorou = variacao < -limite if ref.get('maior_melhor') else variacao > limite
+        if piorou:
+            regressoes.append({
+                'metrica': nome,
+                'referencia': ref['valor'],
+                'atual': valor,
+                'variacao': round(variacao, 4),
+            })
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de desempenho do IBcalc.")
+    parser.add_argument('--casos', type=int, default=200, help="número de casos sintéticos")
+    parser.add_argument('--semente', type=int, default=0, help="semente do gerador de casos")
+    parser.add_argument('--processos', type=int, default=None, help="processos para a vazão em paralelo")
+    parser.add_argument('--repeticoes', type=int, default=3, help="repetições das medições de latência")
+    parser.add_argument('--saida', default='bench_output.json', help="arquivo JSON de resultados")
+    parser.add_argument('--referencia', help="JSON de uma execução anterior para comparação")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="variação relativa admitida")
+    args = parser.parse_args(argv)
+
+    resultado = executar(args.casos, args.semente, args.processos, args.repeticoes)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=4, ensure_ascii=False)
+
+    for nome, metrica in sorted(resultado['metricas'].items()):
+        print(f"{nome:<50} {metrica['valor']:>12} {metrica['unidade']}")
+
+    if args.referencia:
+        with open(args.referencia, 'r', encoding='utf-8') as f:
+            referencia = json.load(f)
+        regressoes = comparar(resultado, referencia, args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO {r['metrica']}: {r['referencia']} → {r['atual']} ({r['variacao']:+.1%})")
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
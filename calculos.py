@@ -1,37 +1,47 @@
 # calculos.py
 
+from caso import Caso
 from relatorio import Relatorio
 from tkinter import messagebox
+from utils import converter_unidades
+
+def campos_da_interface(inputs):
+    """
+    Valores preenchidos na interface: número quando possível, texto caso contrário.
+    Campos vazios são ignorados.
+    """
+    campos = {}
+    for key, entry in inputs.items():
+        valor = entry.get()
+        if valor.strip() != "":
+            try:
+                campos[key] = float(valor.replace(",", "."))
+            except ValueError:
+                campos[key] = valor
+    return campos
 
 def executar_calculo(entrada, materiais, inputs):
+    """
+    Calcula o caso formado pela entrada e pelos valores da interface e gera o relatório.
+
+    A entrada não é alterada: os valores da interface entram em um novo Caso, cada
+    campo na sua seção (caso.SECAO_CAMPO).
+
+    :return: o Caso calculado (None se houve erro)
+    """
     try:
-        for key, entry in inputs.items():
-            valor = entry.get()
-            if valor.strip() != "":
-                try:
-                    valor_float = float(valor.replace(",", "."))
-                    if key.startswith("vento_"):
-                        entrada.cargas[key] = valor_float
-                    elif key in entrada.geometria:
-                        entrada.geometria[key] = valor_float
-                    elif key in entrada.solo:
-                        entrada.solo[key] = valor_float
-                    elif key in entrada.cargas:
-                        entrada.cargas[key] = valor_float
-                    elif key in entrada.dados_tanque:
-                        entrada.dados_tanque[key] = valor_float
-                    else:
-                        entrada.geometria[key] = valor_float
-                except ValueError:
-                    entrada.geometria[key] = valor
+        caso = Caso.de_entrada(entrada).alterado(**campos_da_interface(inputs))
 
-        if 'tensao_adm_kgfcm2' in inputs:
-            sigma_adm = float(inputs['tensao_adm_kgfcm2'].get().replace(",", ".")) * 98.0665
+        if 'tensao_adm_kgfcm2' in inputs and inputs['tensao_adm_kgfcm2'].get().strip() != "":
+            sigma_adm = converter_unidades(float(inputs['tensao_adm_kgfcm2'].get().replace(",", ".")), 'kgf/cm2', 'kN/m2')
             materiais.definir_tensao_admissivel(sigma_adm)
+        else:
+            materiais.calcular_tensao_admissivel(caso.geometria, caso.solo)
 
-        entrada.validar_dados()
-        relatorio = Relatorio(entrada, materiais)
+        caso.validar_dados()
+        relatorio = Relatorio(caso, materiais)
         relatorio.gerar_html()
         messagebox.showinfo("Sucesso", "Cálculo realizado com sucesso. Relatório salvo como 'relatorio.html'.")
+        return caso
     except Exception as e:
         messagebox.showerror("Erro", str(e))
@@ -0,0 +1,235 @@
+# campo_aleatorio.py
+
+"""
+Solo com variabilidade espacial: recalque diferencial no perímetro do anel.
+
+O módulo de elasticidade do solo é um campo aleatório lognormal com média
+Esolo, coeficiente de variação `cov` e correlação markoviana
+ρ(τ) = exp(-2·|τ| / θ), θ = comprimento de correlação (m). São gerados:
+
+  - um campo periódico ao longo do perímetro do anel (comprimento π·D);
+  - um campo bidimensional sob o fundo do tanque.
+
+Os campos são gerados por incorporação circulante (FFT): autovalores da
+matriz de covariância circulante = FFT da primeira linha; cada FFT de ruído
+complexo dá duas realizações independentes (partes real e imaginária). Todas
+as realizações de um lote são geradas e avaliadas de uma vez (arrays
+realizações × estações).
+
+Recalque em cada ponto: o recalque do solo homogêneo (motor_vetorizado)
+multiplicado por E_médio / E_eq, com E_eq = média geométrica de E na janela
+de influência do ponto (Fenton & Griffiths). No perímetro, o ajuste de
+s(θ) = a0 + a·cos θ + b·sin θ separa a inclinação planar do tanque do
+desvio fora do plano (ajuste_cosseno).
+"""
+
+import numpy as np
+
+from motor_vetorizado import avaliar
+
+
+def correlacao_markov(distancia, comprimento_correlacao):
+    """Função de correlação markoviana ρ(τ) = exp(-2·|τ| / θ)."""
+    return np.exp(-2 * np.abs(distancia) / comprimento_correlacao)
+
+
+def _raiz_autovalores(covariancia_linha, eixos):
+    autovalores = np.real(np.fft.fftn(covariancia_linha, axes=eixos))
+    return np.sqrt(np.clip(autovalores, 0.0, None) / covariancia_linha.size)
+
+
+def campo_periodico(realizacoes, pontos, comprimento, comprimento_correlacao, rng, correlacao=correlacao_markov):
+    """
+    Realizações de um campo gaussiano padrão, estacionário e periódico em 1D.
+
+    :param realizacoes: número de realizações
+    :param pontos: pontos igualmente espaçados no período
+    :param comprimento: período (m)
+    :return: array (realizacoes, pontos) com média 0 e variância 1
+    """
+    passo = comprimento / pontos
+    k = np.arange(pontos)
+    distancia = np.minimum(k, pontos - k) * passo
+    raiz = _raiz_autovalores(correlacao(distancia, comprimento_correlacao), (0,))
+    metade = (realizacoes + 1) // 2
+    ruido = rng.standard_normal((metade, pontos)) + 1j * rng.standard_normal((metade, pontos))
+    campo = np.fft.fft(raiz * ruido, axis=-1)
+    return np.concatenate([campo.real, campo.imag])[:realizacoes]
+
+
+def campo_plano(realizacoes, pontos, lado, comprimento_correlacao, rng, correlacao=correlacao_markov):
+    """
+    Realizações de um campo gaussiano padrão em um quadrado lado × lado.
+
+    A incorporação circulante usa um domínio periódico de lado 2·lado, de modo
+    que a covariância entre quaisquer dois pontos do quadrado é exata.
+
+    :return: array (realizacoes, pontos, pontos)
+    """
+    n = 2 * pontos
+    passo = lado / pontos
+    k = np.arange(n)
+    d = np.minimum(k, n - k) * passo
+    distancia = np.hypot(d[:, None], d[None, :])
+    raiz = _raiz_autovalores(correlacao(distancia, comprimento_correlacao), (0, 1))
+    metade = (realizacoes + 1) // 2
+    ruido = rng.standard_normal((metade, n, n)) + 1j * rng.standard_normal((metade, n, n))
+    campo = np.fft.fft2(raiz * ruido)[:, :pontos, :pontos]
+    return np.concatenate([campo.real, campo.imag])[:realizacoes]
+
+
+def _media_movel_circular(valores, janela, eixos):
+    """Média móvel circular (FFT) com janela de `janela` pontos em cada eixo."""
+    nucleo = np.zeros(valores.shape[-len(eixos):])
+    fatias = tuple(np.r_[0:(janela + 1) // 2, -(janela // 2):0] for _ in eixos)
+    nucleo[np.ix_(*fatias)] = 1.0 / janela ** len(eixos)
+    transformada = np.fft.rfftn(valores, axes=eixos) * np.fft.rfftn(nucleo)
+    return np.fft.irfftn(transformada, s=nucleo.shape, axes=eixos)
+
+
+def _media_movel_borda(valores, janela, eixos):
+    """
+    Média móvel com janela de `janela` pontos em cada eixo, para campos não
+    periódicos: fora do domínio repete o valor da borda (sem dar a volta).
+    """
+    for eixo in eixos:
+        n = valores.shape[eixo]
+        largura = [(0, 0)] * valores.ndim
+        largura[eixo] = ((janela - 1) // 2, janela // 2)
+        acumulado = np.cumsum(np.pad(valores, largura, mode='edge'), axis=eixo)
+        acumulado = np.concatenate([np.zeros_like(np.take(acumulado, [0], axis=eixo)), acumulado], axis=eixo)
+        valores = (np.take(acumulado, np.arange(janela, janela + n), axis=eixo)
+                   - np.take(acumulado, np.arange(n), axis=eixo)) / janela
+    return valores
+
+
+def ajuste_cosseno(recalques, angulos=None) -> dict:
+    """
+    Ajuste por mínimos quadrados de s(θ) = a0 + a·cos θ + b·sin θ aos recalques
+    medidos ou calculados em estações do perímetro.
+
+    Vetorizado: o último eixo é o das estações, os demais são lotes (realizações, tanques...).
+
+    :param recalques: array (..., estacoes)
+    :param angulos: ângulo de cada estação (rad); padrão: igualmente espaçadas a partir de 0
+    :return: dicionário com 'a0', 'amplitude' (metade da diferença planar entre pontos
+             diametralmente opostos), 'fase' (rad, direção do maior recalque planar), 'plano'
+             (s ajustado em cada estação) e 'fora_plano' (recalque - plano)
+    """
+    recalques = np.asarray(recalques, dtype=float)
+    estacoes = recalques.shape[-1]
+    if angulos is None:
+        angulos = np.arange(estacoes) * 2 * np.pi / estacoes
+    angulos = np.asarray(angulos, dtype=float)
+    matriz = np.stack([np.ones(estacoes), np.cos(angulos), np.sin(angulos)], axis=-1)
+    pseudo_inversa = np.linalg.pinv(matriz)                       # (3, estacoes)
+    coeficientes = recalques @ pseudo_inversa.T                     # (..., 3)
+    plano = coeficientes @ matriz.T
+    a0, a, b = np.moveaxis(coeficientes, -1, 0)
+    return {
+        'a0': a0,
+        'amplitude': np.hypot(a, b),
+        'fase': np.arctan2(b, a),
+        'plano': plano,
+        'fora_plano': recalques - plano,
+    }
+
+
+def _estatisticas(valores):
+    return {
+        'media': float(np.mean(valores)),
+        'desvio': float(np.std(valores)),
+        'p95': float(np.percentile(valores, 95)),
+        'maximo': float(np.max(valores)),
+    }
+
+
+def recalque_aleatorio(colunas: dict, realizacoes: int = 1000, comprimento_correlacao: float = 10.0,
+                       cov: float = 0.3, estacoes: int = 64, janela_anel: float = None,
+                       pontos_fundo: int = 32, janela_fundo: float = None, semente: int = 0,
+                       tamanho_lote: int = 500, manter_realizacoes: bool = False) -> dict:
+    """
+    Recalques de um tanque sobre solo com módulo de elasticidade aleatório.
+
+    :param colunas: entradas de um tanque com as chaves de motor_vetorizado.CAMPOS_ENTRADA (escalares)
+    :param realizacoes: número de realizações do campo
+    :param comprimento_correlacao: θ (m)
+    :param cov: coeficiente de variação de E
+    :param estacoes: estações no perímetro
+    :param janela_anel: comprimento de influência ao longo do anel (m); padrão: 2 × largura do anel
+    :param pontos_fundo: pontos da grade do fundo em cada direção (0 = não avaliar o fundo)
+    :param janela_fundo: lado da janela de influência sob o fundo (m); padrão: D/4
+    :param semente: semente do gerador
+    :param tamanho_lote: realizações geradas de cada vez (limita a memória)
+    :param manter_realizacoes: se True, inclui os recalques das estações de todas as realizações
+    :return: estatísticas (mm e rad) da inclinação planar, do desvio fora do plano e do recalque diferencial
+    """
+    rng = np.random.default_rng(semente)
+    r = avaliar(colunas)
+    D = float(colunas['diametro'])
+    E = float(colunas['Esolo'])
+    mu = float(colunas['poisson'])
+    largura = float(colunas['lado_a_m']) + float(colunas['lado_b_m'])
+    recalque_anel = float(r['recalque_mm'])
+    recalque_fundo = 2 * float(r['p_total']) * (D / 2) * (1 - mu ** 2) / E * 1000  # centro de área circular flexível
+
+    perimetro = np.pi * D
+    passo = perimetro / estacoes
+    janela_anel = janela_anel or 2 * largura
+    pontos_janela_anel = max(1, int(round(janela_anel / passo)))
+    janela_fundo = janela_fundo or D / 4
+    pontos_janela_fundo = max(1, int(round(janela_fundo / (D / pontos_fundo)))) if pontos_fundo else 1
+    sigma_ln = np.sqrt(np.log1p(cov ** 2))
+
+    if pontos_fundo:
+        coordenadas = (np.arange(pontos_fundo) + 0.5) * D / pontos_fundo - D / 2
+        dentro = np.hypot(coordenadas[:, None], coordenadas[None, :]) <= D / 2
+
+    amplitude, fora_plano, diferencial, distorcao, fundo_desvio, fundo_diferencial = [], [], [], [], [], []
+    todas = []
+    for inicio in range(0, realizacoes, tamanho_lote):
+        n = min(tamanho_lote, realizacoes - inicio)
+
+        # Anel: E_eq = média geométrica na janela → s = s_homogêneo · E / E_eq
+        z = campo_periodico(n, estacoes, perimetro, comprimento_correlacao, rng)
+        ln_e = np.log(E) - sigma_ln ** 2 / 2 + sigma_ln * z
+        ln_e_eq = _media_movel_circular(ln_e, pontos_janela_anel, (-1,))
+        s = recalque_anel * E / np.exp(ln_e_eq)
+        ajuste = ajuste_cosseno(s)
+        u = ajuste['fora_plano']
+        # desvio fora do plano entre estações vizinhas (critério da API 653)
+        S = u - (np.roll(u, 1, axis=-1) + np.roll(u, -1, axis=-1)) / 2
+        amplitude.append(ajuste['amplitude'])
+        fora_plano.append(np.abs(S).max(axis=-1))
+        diferencial.append(s.max(axis=-1) - s.min(axis=-1))
+        distorcao.append(np.abs(np.diff(s, axis=-1, append=s[:, :1])).max(axis=-1) / 1000 / passo)
+        if manter_realizacoes:
+            todas.append(s)
+
+        if pontos_fundo:
+            zf = campo_plano(n, pontos_fundo, D, comprimento_correlacao, rng)
+            ln_ef = np.log(E) - sigma_ln ** 2 / 2 + sigma_ln * zf
+            ln_ef_eq = _media_movel_borda(ln_ef, pontos_janela_fundo, (-2, -1))
+            sf = (recalque_fundo * E / np.exp(ln_ef_eq))[:, dentro]
+            fundo_desvio.append(sf.std(axis=-1))
+            fundo_diferencial.append(sf.max(axis=-1) - sf.min(axis=-1))
+
+    amplitude = np.concatenate(amplitude)
+    resultado = {
+        'realizacoes': realizacoes,
+        'recalque_homogeneo_mm': recalque_anel,
+        'inclinacao_rad': _estatisticas(2 * amplitude / 1000 / D),
+        'amplitude_planar_mm': _estatisticas(amplitude),
+        'fora_plano_mm': _estatisticas(np.concatenate(fora_plano)),
+        'diferencial_perimetro_mm': _estatisticas(np.concatenate(diferencial)),
+        'distorcao_angular_perimetro': _estatisticas(np.concatenate(distorcao)),
+    }
+    if pontos_fundo:
+        resultado['fundo'] = {
+            'recalque_homogeneo_mm': recalque_fundo,
+            'desvio_mm': _estatisticas(np.concatenate(fundo_desvio)),
+            'diferencial_mm': _estatisticas(np.concatenate(fundo_diferencial)),
+        }
+    if manter_realizacoes:
+        resultado['recalques_estacoes_mm'] = np.concatenate(todas)
+    return resultado
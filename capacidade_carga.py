@@ -0,0 +1,188 @@
+# capacidade_carga.py
+
+"""
+Capacidade de carga do solo de fundação (Terzaghi, Meyerhof, Vesic) e
+tensão admissível do anel e do interior do tanque.
+
+    q_ult = c·Nc·sc·dc + q·Nq·sq·dq + 0,5·γ·B·Nγ·sγ·dγ,   q = γ·Df
+    σ_adm = q_ult / FS
+
+Os fatores de capacidade de carga e os coeficientes que dependem de φ nos
+fatores de forma e profundidade são tabelados uma única vez (φ de 0° a 50°,
+passo 0,1°) e interpolados, de modo que o cálculo é vetorizado em todas as
+entradas.
+
+Geometria adotada:
+  - anel: sapata corrida de largura b = b1 + b2, assente a Df = h2 + h3;
+  - interior: sapata circular de diâmetro dT, assente sob o aterro compactado (Df = h1).
+
+Os parâmetros de resistência vêm do solo ('coesao' em kN/m², 'angulo_atrito'
+em graus, 'peso_especifico' em kN/m³); na falta deles, dos valores típicos
+do 'tipo' de solo (PARAMETROS_TIPICOS).
+"""
+
+import math
+
+import numpy as np
+
+FATOR_SEGURANCA = 3.0
+METODOS = ('terzaghi', 'meyerhof', 'vesic')
+
+# Parâmetros típicos de solos compactados: coesão (kN/m²), ângulo de atrito (°), peso específico (kN/m³)
+PARAMETROS_TIPICOS = {
+    'argila compactada': {'coesao': 25.0, 'angulo_atrito': 20.0, 'peso_especifico': 18.0},
+    'areia compactada': {'coesao': 0.0, 'angulo_atrito': 34.0, 'peso_especifico': 19.0},
+    'aterro compactado': {'coesao': 10.0, 'angulo_atrito': 28.0, 'peso_especifico': 18.0},
+    'silte argiloso': {'coesao': 15.0, 'angulo_atrito': 22.0, 'peso_especifico': 17.0},
+}
+
+
+def _tabelas(passo=0.1):
+    phi = np.arange(0.0, 50.0 + passo / 2, passo)
+    r = np.radians(phi)
+    tg = np.tan(r)
+    kp = np.tan(np.pi / 4 + r / 2) ** 2
+
+    # Meyerhof / Vesic (Prandtl-Reissner)
+    Nq = np.exp(np.pi * tg) * kp
+    Nc = np.where(phi > 0, (Nq - 1) / np.where(phi > 0, tg, 1.0), 2 + np.pi)
+
+    # Terzaghi
+    a = np.exp((0.75 * np.pi - r / 2) * tg)
+    Nq_t = a ** 2 / (2 * np.cos(np.pi / 4 + r / 2) ** 2)
+    Nc_t = np.where(phi > 0, (Nq_t - 1) / np.where(phi > 0, tg, 1.0), 1.5 * np.pi + 1)
+    Ng_t = 2 * (Nq_t + 1) * tg / (1 + 0.4 * np.sin(4 * r))  # aproximação de Coduto
+
+    return {
+        'phi': phi,
+        'terzaghi': {'Nc': Nc_t, 'Nq': Nq_t, 'Ng': Ng_t},
+        'meyerhof': {'Nc': Nc, 'Nq': Nq, 'Ng': (Nq - 1) * np.tan(1.4 * r), 'raiz_kp': np.sqrt(kp), 'kp': kp},
+        'vesic': {'Nc': Nc, 'Nq': Nq, 'Ng': 2 * (Nq + 1) * tg, 'tg': tg,
+                  'cd': 2 * tg * (1 - np.sin(r)) ** 2},
+    }
+
+
+TABELAS = _tabelas()
+
+
+def _tabela(metodo, nome, phi):
+    return np.interp(phi, TABELAS['phi'], TABELAS[metodo][nome])
+
+
+def fatores_capacidade(phi, metodo: str = 'vesic') -> dict:
+    """
+    Fatores Nc, Nq e Nγ interpolados das tabelas.
+
+    :param phi: ângulo de atrito (graus), escalar ou array
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método de capacidade de carga desconhecido: {metodo}")
+    phi = np.clip(np.asarray(phi, dtype=float), 0.0, 50.0)
+    return {nome: _tabela(metodo, nome, phi) for nome in ('Nc', 'Nq', 'Ng')}
+
+
+def capacidade_carga(coesao, phi, gamma, B, L, Df, metodo: str = 'vesic',
+                     fator_seguranca: float = FATOR_SEGURANCA) -> dict:
+    """
+    Capacidade de carga de uma sapata (vetorizado em todas as entradas).
+
+    :param coesao: c (kN/m²)
+    :param phi: ângulo de atrito (graus)
+    :param gamma: peso específico do solo (kN/m³)
+    :param B: largura (m) (diâmetro, para sapata circular)
+    :param L: comprimento (m); np.inf para sapata corrida, igual a B para circular/quadrada
+    :param Df: profundidade de assentamento (m)
+    :return: dicionário com q_ult e q_adm (kN/m²) e os fatores utilizados
+    """
+    f = fatores_capacidade(phi, metodo)
+    phi = np.clip(np.asarray(phi, dtype=float), 0.0, 50.0)
+    B = np.asarray(B, dtype=float)
+    Df = np.asarray(Df, dtype=float)
+    B_L = np.where(np.isinf(L), 0.0, B / np.where(np.isinf(L), 1.0, L))
+    D_B = Df / B
+    um = np.ones(np.broadcast(phi, B_L, D_B).shape)
+
+    if metodo == 'terzaghi':
+        # fatores de forma de Terzaghi (1,3 e 0,6 para sapata circular/quadrada), sem fatores de profundidade
+        sc = 1 + 0.3 * B_L
+        sq = um
+        sg = 1 - 0.4 * B_L
+        dc = dq = dg = um
+    elif metodo == 'meyerhof':
+        kp = _tabela('meyerhof', 'kp', phi)
+        raiz_kp = _tabela('meyerhof', 'raiz_kp', phi)
+        sc = 1 + 0.2 * kp * B_L
+        sq = sg = np.where(phi > 10, 1 + 0.1 * kp * B_L, 1.0) * um
+        dc = 1 + 0.2 * raiz_kp * D_B
+        dq = dg = np.where(phi > 10, 1 + 0.1 * raiz_kp * D_B, 1.0) * um
+    else:
+        tg = _tabela('vesic', 'tg', phi)
+        cd = _tabela('vesic', 'cd', phi)
+        sc = 1 + B_L * f['Nq'] / f['Nc']
+        sq = 1 + B_L * tg
+        sg = np.maximum(1 - 0.4 * B_L, 0.6)
+        k = np.where(D_B <= 1, D_B, np.arctan(D_B))
+        dc = 1 + 0.4 * k
+        dq = 1 + cd * k
+        dg = um
+
+    q = gamma * Df
+    q_ult = (coesao * f['Nc'] * sc * dc + q * f['Nq'] * sq * dq + 0.5 * gamma * B * f['Ng'] * sg * dg)
+    return {
+        'q_ult': q_ult,
+        'q_adm': q_ult / fator_seguranca,
+        'Nc': f['Nc'], 'Nq': f['Nq'], 'Ng': f['Ng'],
+        'sc': sc, 'sq': sq, 'sg': sg, 'dc': dc, 'dq': dq, 'dg': dg,
+    }
+
+
+def parametros_solo(solo: dict) -> dict:
+    """
+    Parâmetros de resistência do solo: os informados ou, na falta, os típicos do tipo de solo.
+
+    :raises ValueError: se faltar algum parâmetro e o tipo de solo não for conhecido
+    """
+    tipicos = PARAMETROS_TIPICOS.get(str(solo.get('tipo', '')).strip().lower(), {})
+    parametros = {}
+    for chave in ('coesao', 'angulo_atrito', 'peso_especifico'):
+        valor = solo.get(chave, tipicos.get(chave))
+        if valor is None:
+            raise ValueError(
+                f"Parâmetro '{chave}' do solo não informado e tipo de solo '{solo.get('tipo')}' sem valores típicos."
+            )
+        parametros[chave] = valor
+    return parametros
+
+
+def tensao_admissivel_tanque(geometria: dict, solo: dict, metodo: str = None,
+                             fator_seguranca: float = None) -> dict:
+    """
+    Tensões admissíveis do anel (sapata corrida) e do interior (sapata circular).
+
+    Aceita escalares ou arrays nos valores dos dicionários (ex.: colunas de um ArmazemCasos).
+
+    :param geometria: dicionário com diametro, lado_a_m, lado_b_m, h1, h2, h3
+    :param solo: dicionário com tipo e/ou coesao, angulo_atrito, peso_especifico;
+                 opcionalmente metodo_capacidade e fator_seguranca
+    :return: dicionário com 'anel' e 'interior' (resultados de capacidade_carga) e
+             'tensao_admissivel' (a menor das duas, kN/m²)
+    """
+    metodo = metodo or solo.get('metodo_capacidade', 'vesic')
+    fator_seguranca = fator_seguranca or solo.get('fator_seguranca', FATOR_SEGURANCA)
+    p = parametros_solo(solo)
+    c, phi, gamma = p['coesao'], p['angulo_atrito'], p['peso_especifico']
+
+    largura_anel = np.asarray(geometria.get('lado_a_m', 0.25)) + np.asarray(geometria.get('lado_b_m', 0.25))
+    assentamento_anel = np.asarray(geometria.get('h2', 0.5)) + np.asarray(geometria.get('h3', 0.0))
+    diametro = np.asarray(geometria['diametro'])
+    assentamento_interior = np.asarray(geometria.get('h1', 0.4))
+
+    anel = capacidade_carga(c, phi, gamma, largura_anel, math.inf, assentamento_anel, metodo, fator_seguranca)
+    interior = capacidade_carga(c, phi, gamma, diametro, diametro, assentamento_interior, metodo, fator_seguranca)
+    return {
+        'metodo': metodo,
+        'fator_seguranca': fator_seguranca,
+        'anel': anel,
+        'interior': interior,
+        'tensao_admissivel': np.minimum(anel['q_adm'], interior['q_adm']),
+    }
@@ -72,6 +72,15 @@ class Cargas:
 
         self._fv_cache = carga_vento
         self._q_cache = q
-        self.dados.cargas['pressao_vento'] = q
 
         return carga_vento
+
+    def calcular_pressao_dinamica(self):
+        """
+        Pressão dinâmica do vento q (kN/m²), calculada junto com a carga de vento.
+
+        :return: pressão dinâmica (float)
+        """
+        if self._q_cache is None:
+            self.calcular_vento()
+        return self._q_cache
@@ -0,0 +1,204 @@
+# caso.py
+
+"""
+Caso de cálculo imutável, com hash do conteúdo.
+
+Caso é um retrato normalizado e congelado de uma entrada (mesmas seções de
+EntradaDados: geometria, cargas, dados_tanque e solo). O motor lê um Caso
+como lê um EntradaDados, mas não consegue alterá-lo. Por isso o mesmo caso
+pode ser calculado por várias threads ao mesmo tempo, servir de chave de
+cache e ser compartilhado entre tarefas sem cópias.
+
+Normalização:
+  - escalares numpy viram números do Python; listas viram tuplas;
+  - 'dens_fluido' é copiado para 'densidade_fluido', como em EntradaDados.definir_dados;
+  - grandezas calculadas pelo motor ('pressao_vento') são descartadas.
+
+O hash (SHA-256 do JSON canônico, com inteiros escritos como float) não
+depende da ordem das chaves nem de 12 × 12.0, e é o mesmo em todos os
+processos.
+"""
+
+from collections.abc import Mapping
+import hashlib
+import json
+import numbers
+
+from dados_entrada import EntradaDados
+
+SECOES = ('geometria', 'cargas', 'dados_tanque', 'solo')
+
+# Seção de cada campo da interface gráfica (a mesma organização do arquivo JSON de entrada)
+SECAO_CAMPO = {
+    'fck': 'geometria', 'gamma': 'geometria', 'E_conc': 'geometria', 'fyk': 'geometria', 'E_aco': 'geometria',
+    'altura': 'geometria', 'diametro': 'geometria', 'diametro_base': 'geometria', 'altura_base': 'geometria',
+    'lado_a_m': 'geometria', 'lado_b_m': 'geometria', 'h1': 'geometria', 'h2': 'geometria', 'h3': 'geometria',
+    'tipo': 'solo', 'tensao_adm_kgfcm2': 'solo', 'k_reac': 'solo', 'Esolo': 'solo', 'poisson': 'solo',
+    'peso_tanque_vazio': 'dados_tanque', 'densidade_fluido': 'dados_tanque',
+    'pressao_interna': 'cargas',
+    'vento_v0': 'cargas', 'vento_s1': 'cargas', 'vento_s2': 'cargas', 'vento_s3': 'cargas',
+}
+
+# Grandezas de saída que versões anteriores gravavam na entrada
+CAMPOS_CALCULADOS = {'cargas': ('pressao_vento',)}
+
+
+def _normalizar(valor):
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, numbers.Real):
+        return valor.item() if hasattr(valor, 'item') else valor
+    if isinstance(valor, Mapping):
+        return SecaoCongelada(valor)
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    if hasattr(valor, 'tolist'):  # arrays numpy
+        return _normalizar(valor.tolist())
+    raise TypeError(f"Valor sem representação imutável na entrada: {valor!r}")
+
+
+def _canonico(valor, numeros_float=False):
+    if isinstance(valor, SecaoCongelada):
+        return {chave: _canonico(v, numeros_float) for chave, v in valor.items()}
+    if isinstance(valor, tuple):
+        return [_canonico(v, numeros_float) for v in valor]
+    if numeros_float and isinstance(valor, int) and not isinstance(valor, bool):
+        return float(valor)
+    return valor
+
+
+class SecaoCongelada(Mapping):
+    """
+    Dicionário somente leitura e hashable (uma seção do caso).
+    """
+    __slots__ = ('_dados', '_hash')
+
+    def __init__(self, dados=()):
+        object.__setattr__(self, '_dados', {str(chave): _normalizar(valor) for chave, valor in dict(dados).items()})
+        object.__setattr__(self, '_hash', None)
+
+    def __getitem__(self, chave):
+        return self._dados[chave]
+
+    def __iter__(self):
+        return iter(self._dados)
+
+    def __len__(self):
+        return len(self._dados)
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(frozenset(self._dados.items())))
+        return self._hash
+
+    def __eq__(self, outro):
+        if isinstance(outro, Mapping):
+            return self._dados == dict(outro.items())
+        return NotImplemented
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("SecaoCongelada é imutável.")
+
+    def __reduce__(self):
+        return SecaoCongelada, (self._dados,)
+
+    def __repr__(self):
+        return f"SecaoCongelada({self._dados!r})"
+
+    def para_dict(self) -> dict:
+        """Cópia em dicionário comum (alterável)."""
+        return _canonico(self)
+
+
+class Caso:
+    """
+    Entrada imutável de um cálculo.
+
+    Tem os mesmos atributos de EntradaDados (geometria, cargas, dados_tanque e solo,
+    como SecaoCongelada) e pode ser passado ao motor no lugar dele.
+    """
+    __slots__ = SECOES + ('_hash', '_hash_conteudo')
+
+    def __init__(self, geometria=(), cargas=(), dados_tanque=(), solo=()):
+        dados_tanque = dict(dados_tanque)
+        if 'dens_fluido' in dados_tanque and 'densidade_fluido' not in dados_tanque:
+            dados_tanque['densidade_fluido'] = dados_tanque['dens_fluido']
+        secoes = {'geometria': dict(geometria), 'cargas': dict(cargas), 'dados_tanque': dados_tanque,
+                  'solo': dict(solo)}
+        for secao, campos in CAMPOS_CALCULADOS.items():
+            for campo in campos:
+                secoes[secao].pop(campo, None)
+        for secao in SECOES:
+            object.__setattr__(self, secao, SecaoCongelada(secoes[secao]))
+        object.__setattr__(self, '_hash', None)
+        object.__setattr__(self, '_hash_conteudo', None)
+
+    # ------------------------------------------------------------------ construção
+
+    @classmethod
+    def de_dados(cls, dados: dict) -> 'Caso':
+        """
+        Caso a partir de um dicionário no formato do arquivo JSON de entrada.
+        """
+        if isinstance(dados, Caso):
+            return dados
+        return cls(**{secao: dados.get(secao, {}) for secao in SECOES})
+
+    @classmethod
+    def de_entrada(cls, entrada: EntradaDados) -> 'Caso':
+        """
+        Retrato de um EntradaDados (que pode continuar sendo editado sem afetar o caso).
+        """
+        return cls(**{secao: getattr(entrada, secao) for secao in SECOES})
+
+    def alterado(self, **campos) -> 'Caso':
+        """
+        Novo caso com campos substituídos, cada um na sua seção (SECAO_CAMPO; campos
+        desconhecidos vão para geometria).
+        """
+        secoes = self.para_dados()
+        for campo, valor in campos.items():
+            secoes[SECAO_CAMPO.get(campo, 'geometria')][campo] = valor
+        return Caso(**secoes)
+
+    def para_dados(self) -> dict:
+        """Dicionário (alterável) no formato do arquivo JSON de entrada."""
+        return {secao: getattr(self, secao).para_dict() for secao in SECOES}
+
+    def para_entrada(self) -> EntradaDados:
+        """EntradaDados alterável com o conteúdo do caso."""
+        entrada = EntradaDados()
+        entrada.definir_dados(self.para_dados())
+        return entrada
+
+    validar_dados = EntradaDados.validar_dados
+
+    # ------------------------------------------------------------------ identidade
+
+    @property
+    def hash(self) -> str:
+        """SHA-256 do conteúdo normalizado (estável entre execuções e processos)."""
+        if self._hash_conteudo is None:
+            conteudo = {secao: _canonico(getattr(self, secao), numeros_float=True) for secao in SECOES}
+            texto = json.dumps(conteudo, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+            object.__setattr__(self, '_hash_conteudo', hashlib.sha256(texto.encode('utf-8')).hexdigest())
+        return self._hash_conteudo
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(tuple(getattr(self, secao) for secao in SECOES)))
+        return self._hash
+
+    def __eq__(self, outro):
+        if isinstance(outro, Caso):
+            return all(getattr(self, secao) == getattr(outro, secao) for secao in SECOES)
+        return NotImplemented
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Caso é imutável; use alterado() para obter um novo caso.")
+
+    def __reduce__(self):
+        return Caso, tuple(getattr(self, secao) for secao in SECOES)
+
+    def __repr__(self):
+        return f"Caso({self.hash[:12]})"
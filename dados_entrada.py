@@ -12,17 +12,25 @@ class EntradaDados:
         if arquivo:
             with open(arquivo, 'r') as f:
                 dados = json.load(f)
-                self.geometria = dados.get('geometria', {})
-                self.cargas = dados.get('cargas', {})
-                self.dados_tanque = dados.get('dados_tanque', {})
-                if 'dens_fluido' in self.dados_tanque and 'densidade_fluido' not in self.dados_tanque:
-                    self.dados_tanque['densidade_fluido'] = self.dados_tanque['dens_fluido']
-                self.solo = dados.get('solo', {})
+                self.definir_dados(dados)
         else:
             self.geometria['altura'] = float(input("Altura do tanque (m): "))
             self.geometria['diametro'] = float(input("Diâmetro do tanque (m): "))
             self.solo['tipo'] = input("Tipo de solo: ")
 
+    def definir_dados(self, dados: Dict):
+        """
+        Preenche a entrada a partir de um dicionário no mesmo formato do arquivo JSON.
+
+        :param dados: dicionário com as seções geometria, cargas, dados_tanque e solo
+        """
+        self.geometria = dict(dados.get('geometria', {}))
+        self.cargas = dict(dados.get('cargas', {}))
+        self.dados_tanque = dict(dados.get('dados_tanque', {}))
+        if 'dens_fluido' in self.dados_tanque and 'densidade_fluido' not in self.dados_tanque:
+            self.dados_tanque['densidade_fluido'] = self.dados_tanque['dens_fluido']
+        self.solo = dict(dados.get('solo', {}))
+
     def validar_dados(self):
         if not self.geometria or not self.solo:
             raise ValueError("Dados de geometria e solo são obrigatórios.")
@@ -3,6 +3,7 @@
 from analise_estrutural import AnaliseEstrutural
 from dados_entrada import EntradaDados
 from materiais import Materiais
+from utils import converter_unidades
 
 class DimensionamentoArmaduras:
     """
@@ -31,7 +32,7 @@ class DimensionamentoArmaduras:
 
         # Área da seção da base
         area_secao = 3.1416 * (diametro_base / 2) ** 2  # m²
-        area_secao_cm2 = area_secao * 10000  # cm²
+        area_secao_cm2 = converter_unidades(area_secao, 'm2', 'cm2')
 
         # Armadura mínima segundo NBR 6118 (0,15% da seção)
         taxa_minima = 0.0015
@@ -1,112 +1,128 @@
 # dimensionamento_base.py
 
+from functools import cached_property
+
 from analise_estrutural import AnaliseEstrutural
 from dados_entrada import EntradaDados
+from grafo_formulas import calcular, expressao_adiada, TextoAdiado, K0, RHO_MIN, RHO_T
 from materiais import Materiais
-import math
+from motor_vetorizado import colunas_de_entrada
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Grandezas de grafo_formulas apresentadas pelos métodos, calculadas juntas uma vez por instância
+GRANDEZAS = (
+    'esforco_vertical', 'area_minima_base', 'diametro_base_sugerido',
+    'p1', 'p2', 'p3', 'p_total', 'phi', 'p4', 'p5', 'p6', 'b_calc',
+    'b', 'Ø', 'WA', 'Mvf', 'p7', 'p8', 'P_anel',
+    'Pg', 'ps1', 'E1', 'Pf', 'Mvt', 'area_base', 'termo_Mvt', 'numerador_apoio', 'Ta',
+    'resistencia_arrancamento', 'atende_arrancamento',
+    'sigma_cmax', 'fcd', 'atende_pressao_apoio_adm', 'atende_pressao_apoio_fcd',
+    'termo1', 'termo2', 'MT', 'MF', 'qi', 'V',
+    'h0', 'H', 'ps2', 'ps3', 'E2', 'Tc', 'As_tracao',
+    'fcd_Nm2', 'fyd_Nm2', 'd', 'Md', 'y_d', 'y', 'rho', 'As', 'As_min',
+)
+
+
+def _comparacao(p_total, sigma_adm):
+    return f"p = {p_total} kN/m² {'<=' if p_total <= sigma_adm else '>'} τ_adm = {sigma_adm} kN/m²"
+
 
 class DimensionamentoBase:
     """
     Classe responsável pelo dimensionamento da base do tanque (diâmetro, altura, área de apoio, etc.)
+
+    As fórmulas são as de grafo_formulas: todas as grandezas são calculadas uma única
+    vez por instância (na primeira consulta) e os métodos apenas as apresentam,
+    arredondadas. Os dados de entrada não devem ser alterados depois disso.
     """
     def __init__(self, analise_estrutural: AnaliseEstrutural, dados_entrada: EntradaDados, materiais: Materiais):
         self.analise = analise_estrutural
         self.dados = dados_entrada
         self.materiais = materiais
 
+    @cached_property
+    def _valores_grafo(self):
+        """
+        Entradas do grafo de fórmulas, com os mesmos valores padrão dos métodos.
+        """
+        valores = colunas_de_entrada(self.dados, self.materiais)
+        valores['altura_liquido'] = valores['altura']
+        valores['densidade_liquido'] = valores['densidade_fluido']
+        return valores
+
+    @cached_property
+    def _grafo(self):
+        """Entradas e grandezas de GRANDEZAS (não deve ser alterado: as linhas de memorial o referenciam)."""
+        valores = dict(self._valores_grafo)
+        valores.update(calcular(GRANDEZAS, valores))
+        return valores
+
+    def _verificar_secao(self):
+        g = self._grafo
+        if g['d'] <= 0 or g['b'] <= 0:
+            raise ValueError("Dimensões inválidas para cálculo da linha neutra.")
+
     def dimensionar(self):
-        esforcos = self.analise.calcular_esforcos()
-        esforco_vertical = esforcos['esforco_total_vertical']  # kN
-        tensao_admissivel = self.materiais.solo.get('tensao_admissivel', 0)  # kN/m²
+        g = self._grafo
+        tensao_admissivel = g['tensao_admissivel']  # kN/m²
 
         if tensao_admissivel <= 0:
             raise ValueError("Tensão admissível do solo deve ser maior que zero.")
 
-        area_minima_base = esforco_vertical / tensao_admissivel  # m²
-        diametro_sugerido = (4 * area_minima_base / 3.1416) ** 0.5  # base circular
-
         return {
-            'esforco_total_vertical': esforco_vertical,
+            'esforco_total_vertical': g['esforco_vertical'],
             'tensao_admissivel': tensao_admissivel,
-            'area_minima_base_m2': area_minima_base,
-            'diametro_base_sugerido_m': diametro_sugerido
+            'area_minima_base_m2': g['area_minima_base'],
+            'diametro_base_sugerido_m': g['diametro_base_sugerido']
         }
 
-    def verificar_tensao_solo_compactado(self):
-        hT = self.dados.geometria.get('altura', 0)
-        h1 = self.dados.geometria.get('h1', 0.4)
-        h2 = self.dados.geometria.get('h2', 0.5)
-        h3 = self.dados.geometria.get('h3', 0.0)
-
-        rhoT = 18.0
-        rhoL = self.dados.dados_tanque.get('densidade_fluido', 9.96)
-        rhoh = 16.0
+    def verificar_tensao_solo_compactado(self, rastreio=False):
+        """
+        Pressão total sob o fundo comparada com a tensão admissível do solo.
 
+        :param rastreio: se True, inclui as linhas de memorial (p1_expressao, p2_expressao,
+                         p3_expressao e comparacao), montadas só quando exibidas
+        :return: dicionário com os resultados da verificação (apenas dados simples sem rastreio)
+        """
+        g = self._grafo
         sigma_adm = self.materiais.solo.get('tensao_admissivel', 0)
+        p_total = round(g['p_total'], 2)
 
-        p1 = round(rhoT * h1, 2)
-        p2 = round(rhoL * hT, 2)
-        p3 = round(rhoh * (h2 + h3), 2)
-
-        p_total = round(p1 + p2 - p3, 2)
-
-        return {
+        resultado = {
             'formula': 'p = p1 + p2 - p3',
-            'p1_expressao': f"p1 = ρT · h = {rhoT} · {h1} = {p1} kN/m²",
-            'p2_expressao': f"p2 = ρL · hT = {rhoL} · {hT} = {p2} kN/m²",
-            'p3_expressao': f"p3 = ρh · (h2 + h3) = {rhoh} · ({h2} + {h3}) = {p3} kN/m²",
             'p_total': p_total,
             'tensao_admissivel_kN_m2': sigma_adm,
-            'comparacao': f"p = {p_total} kN/m² {'<=' if p_total <= sigma_adm else '>'} τ_adm = {sigma_adm} kN/m²",
             'verificacao': "ok!" if p_total <= sigma_adm else "NÃO ATENDE"
         }
+        if rastreio:
+            resultado.update({
+                'p1_expressao': expressao_adiada('p1', g),
+                'p2_expressao': expressao_adiada('p2', g),
+                'p3_expressao': expressao_adiada('p3', g),
+                'comparacao': TextoAdiado(_comparacao, p_total, sigma_adm),
+            })
+        return resultado
 
     def calcular_espessura_anel(self):
-        PTV = (
-            self.dados.dados_tanque.get('peso_tanque_vazio')
-            or self.dados.dados_tanque.get('PTV')
-            or self.dados.geometria.get('peso_tanque_vazio')
-        )
-        if not PTV:
-             PTV = self.dados.dados_tanque.get('PTV')
-        if not PTV:
-            PTV = self.dados.geometria.get('peso_tanque_vazio')
-        if not PTV:
-           raise ValueError("Peso do tanque vazio (PTV) não encontrado nos dados.")
-       
-        dT = self.dados.geometria.get('diametro', 0)
-        h = self.dados.geometria.get('altura_base', 0.9)
-        hT = self.dados.geometria.get('altura', 0)
-
-        rhoT = 18.0
-        rhoh = 16.0
-        rhoL = self.dados.dados_tanque.get('densidade_fluido', 9.96)
-        rhoConc = self.materiais.concreto.get('gamma', 25)
-
-        h1 = self.dados.geometria.get('h1', 0.4)
-        h2 = self.dados.geometria.get('h2', 0.5)
-        h3 = self.dados.geometria.get('h3', 0.0)
-
-        phi = PTV / (math.pi * dT) if dT > 0 else 0
-        p1 = rhoT * h1
-        p2 = rhoL * hT
-        p4 = rhoL * hT / 2
-        p5 = rhoConc * h
-        p6 = p1 + p2 - p4 - p5
-        b_calc = phi / p6 if phi > 0 else 0
+        g = self._grafo
+        if not g['peso_tanque_vazio']:
+            raise ValueError("Peso do tanque vazio (PTV) não encontrado nos dados.")
 
         return {
-            "phi_kN_m": round(phi,3),
-            "p1_kN_m2": round(p1, 2),
-            "p2_kN_m2": round(p2, 2),
-            "p4_kN_m2": round(p4, 2),
-            "p5_kN_m2": round(p5, 2),
-            "p6_kN_m2": round(p6, 2),
-            "b_calc_m": round(b_calc, 3)
+            "phi_kN_m": round(g['phi'], 3),
+            "p1_kN_m2": round(g['p1'], 2),
+            "p2_kN_m2": round(g['p2'], 2),
+            "p4_kN_m2": round(g['p4'], 2),
+            "p5_kN_m2": round(g['p5'], 2),
+            "p6_kN_m2": round(g['p6'], 2),
+            "b_calc_m": round(g['b_calc'], 3)
         }
 
     def calcular_resistencia_anel(self):
-        ØB = self.dados.geometria.get('diametro_base', 0)
+        g = self._grafo
+        ØB = g['diametro_base']
         if ØB <= 1:
             return {
                 "ØB_m": ØB,
@@ -115,46 +131,21 @@ class DimensionamentoBase:
                 "mensagem": "ØB deve ser maior que 1 metro para cálculo ser válido."
             }
 
-        Ø = ØB - 1
-        WA = (math.pi / 32) * ((ØB ** 4 - Ø ** 4) / ØB)
-
         return {
             "ØB_m": round(ØB, 3),
-            "Ø_m": round(Ø, 3),
-            "WA_m3": round(WA, 6)
+            "Ø_m": round(g['Ø'], 3),
+            "WA_m3": round(g['WA'], 6)
         }
 
     def calcular_tensao_sobre_anel(self):
-        resultados_anel = self.calcular_espessura_anel()
-        resultados_wa = self.calcular_resistencia_anel()
-
-        phi = resultados_anel["phi_kN_m"]
-        p4 = resultados_anel["p4_kN_m2"]
-        p5 = resultados_anel["p5_kN_m2"]
-
-        base1 = self.dados.geometria.get("lado_a_m", 0)
-        base2 = self.dados.geometria.get("lado_b_m", 0)
-        WA = resultados_wa["WA_m3"]
-
-        fv = self.analise.cargas.calcular_vento()
-        hT = self.dados.geometria.get("altura", 0)
-        h1 = self.dados.geometria.get("h1", 0)
-        h2 = self.dados.geometria.get("h2", 0)
-        h3 = self.dados.geometria.get("h3", 0)
-        mvf = ((hT + h1) / 2 + h2 + h3) * fv
-
-        denominador = base1 + base2
-        p7 = phi / denominador if denominador > 0 else 0
-        p8 = mvf / WA if WA > 0 else 0
-        P_total = p4 + p5 + p7 + p8
-
+        g = self._grafo
         return {
-            "p7_kN_m2": round(p7, 2),
-            "p8_kN_m2": round(p8, 2),
-            "p_total_kN_m2": round(P_total, 2)
+            "p7_kN_m2": round(g['p7'], 2),
+            "p8_kN_m2": round(g['p8'], 2),
+            "p_total_kN_m2": round(g['P_anel'], 2)
         }
+
     def verificar_arrancamento_concreto(self):
-        resultados_anel = self.calcular_espessura_anel()
         """
         Verifica a segurança ao arrancamento do concreto da base do tanque.
 
@@ -170,180 +161,102 @@ class DimensionamentoBase:
 
         :return: dicionário com todos os termos e resultado da verificação
         """
-        import math
-
-        # Parâmetros
-        gamma_concreto = self.materiais.concreto.get('gamma', 25)  # kN/m³
-        rhoT = 18.0  # peso específico do solo compactado (kN/m³)
-        k0 = 0.5     # coeficiente de empuxo em repouso
-        angulo = math.radians(35)  # convertendo para radianos
-
-        # Geometria
-        base1 = self.dados.geometria.get("lado_a_m", 0)
-        base2 = self.dados.geometria.get("lado_b_m", 0)
-        h = self.dados.geometria.get("altura_base", 0)
-        dT = self.dados.geometria.get("diametro", 0)
-        hT = self.dados.geometria.get("altura", 0)
-
-        # Cargas
-        PTV = self.dados.dados_tanque.get('peso_tanque_vazio', 0)
-        Fv = self.analise.cargas.calcular_vento()
-
-        # Cálculos
-        Pg = gamma_concreto * (base1 + base2) * h
-        ps1 = rhoT * k0 * h
-        E1 = ps1 * h / 2
-        Pf = E1 * math.tan(angulo)
-        phi = resultados_anel["phi_kN_m"]
-        Mvt = ((hT / 2) * Fv) / (math.pi * dT**2 / 4)
-        Ta = phi - Mvt  if dT > 0 else 0
-        resistencia_total = Pg + Pf + phi
-        atende = resistencia_total >= Ta
-
+        g = self._grafo
         return {
-            'Pg': round(Pg, 2),
-            'ps1': round(ps1, 2),
-            'E1': round(E1, 2),
-            'Pf': round(Pf, 2),
-            'ϕ': round(phi, 2),
-            'Mvt': round(Mvt, 2),
-            'Ta': round(Ta, 2),
-            'resistencia_total': round(resistencia_total, 2),
-            'verificacao': "OK" if atende else "NÃO ATENDE"
+            'Pg': round(g['Pg'], 2),
+            'ps1': round(g['ps1'], 2),
+            'E1': round(g['E1'], 2),
+            'Pf': round(g['Pf'], 2),
+            'ϕ': round(g['phi'], 2),
+            'Mvt': round(g['termo_Mvt'], 2),
+            'Ta': round(g['Ta'], 2),
+            'resistencia_total': round(g['resistencia_arrancamento'], 2),
+            'verificacao': "OK" if g['atende_arrancamento'] else "NÃO ATENDE"
         }
-   
-    def verificar_pressao_maxima_apoio(self):
-        import math
 
-        resultados_anel = self.calcular_espessura_anel()
-        phi = resultados_anel["phi_kN_m"]
-
-        dT = self.dados.geometria.get('diametro', 0)
-        base_1 = self.dados.geometria.get('lado_a_m', 0.25)  # largura efetiva de apoio (Base 1)
-        hT = self.dados.geometria.get('altura', 0)
-
-        Fv = self.analise.cargas.calcular_vento()
-
-        Mvt = (hT / 2) * Fv
-
-        area_base = (math.pi * dT ** 2) / 4 if dT > 0 else 0
+    def verificar_pressao_maxima_apoio(self):
+        g = self._grafo
+        base_1 = g['lado_a_m']  # largura efetiva de apoio (Base 1)
 
-        if area_base == 0 or base_1 == 0:
+        if g['diametro'] <= 0 or base_1 == 0:
             raise ValueError("Área da base ou largura efetiva (Base 1) não podem ser zero.")
-        
-        print(f"[DEBUG] base_1 (lado_a_m) usado na verificação da pressão máxima de apoio: {base_1} m")
-
-        termo_Mvt = Mvt / area_base
 
-        sigma_cmax = (phi + termo_Mvt) / base_1
-        sigma_adm = self.materiais.solo.get('tensao_admissivel', 0)  # kN/m²
-        fck = self.materiais.concreto.get('fck', 30)
-        fcd = (fck / 1.4) * 1000
+        logger.debug("base_1 (lado_a_m) usado na verificação da pressão máxima de apoio: %s m", base_1)
 
-        atende_adm = sigma_cmax <= sigma_adm
-        atende_fcd = sigma_cmax <= fcd
-        
         return {
-            'phi_kN_m': round(phi, 3),
-            'Mvt_kNm': round(Mvt, 2),
-            'area_base_m2': round(area_base, 3),
-            'termo_Mvt_kN_m': round(termo_Mvt, 2),
-            'numerador_kN_m': round(phi + termo_Mvt, 2),
+            'phi_kN_m': round(g['phi'], 3),
+            'Mvt_kNm': round(g['Mvt'], 2),
+            'area_base_m2': round(g['area_base'], 3),
+            'termo_Mvt_kN_m': round(g['termo_Mvt'], 2),
+            'numerador_kN_m': round(g['numerador_apoio'], 2),
             'largura_efetiva_apoio_m': round(base_1, 3),
-            'tensao_maxima_kN_m2': round(sigma_cmax, 2),
-            'tensao_admissivel_kN_m2': round(sigma_adm, 2),
-            'fcd_kN_m2': round(fcd, 2),
-            'verificacao_adm': "OK" if atende_adm else "NÃO ATENDE",
-            'verificacao_fcd': "OK" if atende_fcd else "NÃO ATENDE"
+            'tensao_maxima_kN_m2': round(g['sigma_cmax'], 2),
+            'tensao_admissivel_kN_m2': round(g['tensao_admissivel'], 2),
+            'fcd_kN_m2': round(g['fcd'], 2),
+            'verificacao_adm': "OK" if g['atende_pressao_apoio_adm'] else "NÃO ATENDE",
+            'verificacao_fcd': "OK" if g['atende_pressao_apoio_fcd'] else "NÃO ATENDE"
         }
 
     def calcular_momento_torsor(self):
-         """
-         Calcula o Momento Torsor por metro de perímetro da base do tanque.
-
-         Fórmula:
-             MT = ρL · hT · b2 · ((b/2) - (b2/2)) - φ · ((b/2) - b1)
-
-         Retorna:
-             dicionário com cada termo e o valor final de MT.
-         """
-         resultados_anel = self.calcular_espessura_anel()
-         phi = resultados_anel.get("phi_kN_m", 0)
-
-         rhoL = self.dados.dados_tanque.get('densidade_fluido', 0)
-         hT = self.dados.geometria.get('altura', 0)
-         b1 = self.dados.geometria.get('lado_a_m', 0)
-         b2 = self.dados.geometria.get('lado_b_m', 0)
-         b = b1 + b2
-
-         termo1 = rhoL * hT * b2 * ((b / 2) - (b2 / 2)) if b > 0 and b2 > 0 else 0
-         termo2 = phi * ((b / 2) - b1) if b > 0 and b1 > 0 else 0
-
-         MT = termo1 - termo2
-
-         return {
-             "rhoL_kN_m3": rhoL,
-             "hT_m": hT,
-             "b_m": round(b, 3),
-             "b1_m": b1,
-             "b2_m": b2,
-             "termo1": round(termo1, 3),
-             "termo2": round(termo2, 3),
-             "MT_kN_m_por_m": round(MT, 3)
-         }
-
-    def calcular_momento_fletor(self):
         """
-         Calcula o Momento Fletor na base por metro de perímetro.
-
-    Fórmula:
-        MF = MT * (Ø + b) / 2
+        Calcula o Momento Torsor por metro de perímetro da base do tanque.
 
-    Onde:
-        MT = Momento Torsor (kN·m/m)
-        Ø  = Ø_m (m) → diâmetro interno útil da base (ØB - 1)
-        b  = base1 + base2 (m)
+        Fórmula:
+            MT = ρL · hT · b2 · ((b/2) - (b2/2)) - φ · ((b/2) - b1)
 
-    :return: dicionário com MT, Ø, b e MF
-    """
-        resultado_mt = self.calcular_momento_torsor()
-        resultado_anel = self.calcular_resistencia_anel()
+        Retorna:
+            dicionário com cada termo e o valor final de MT.
+        """
+        g = self._grafo
+        return {
+            "rhoL_kN_m3": g['densidade_liquido'],
+            "hT_m": g['altura'],
+            "b_m": round(g['b'], 3),
+            "b1_m": g['lado_a_m'],
+            "b2_m": g['lado_b_m'],
+            "termo1": round(g['termo1'], 3),
+            "termo2": round(g['termo2'], 3),
+            "MT_kN_m_por_m": round(g['MT'], 3)
+        }
 
-        MT = resultado_mt.get("MT_kN_m_por_m", 0)
-        Ø = resultado_anel.get("Ø_m", 0)
+    def calcular_momento_fletor(self):
+        """
+        Calcula o Momento Fletor na base por metro de perímetro.
 
-        b1 = self.dados.geometria.get('lado_a_m', 0)
-        b2 = self.dados.geometria.get('lado_b_m', 0)
-        b = b1 + b2
+        Fórmula:
+            MF = MT * (Ø + b) / 2
 
-        MF = MT * ((Ø + b) / 2)
+        Onde:
+            MT = Momento Torsor (kN·m/m)
+            Ø  = Ø_m (m) → diâmetro interno útil da base (ØB - 1)
+            b  = base1 + base2 (m)
 
+        :return: dicionário com MT, Ø, b e MF
+        """
+        g = self._grafo
         return {
-         "MT_kN_m_por_m": round(MT, 3),
-         "b1_m": round(b1, 3),
-         "b2_m": round(b2, 3),
-         "b_total_m": round(b, 3),
-         "Ø_m": round(Ø, 3),
-         "MF_kN_m_por_m": round(MF, 3)
-         }
+            "MT_kN_m_por_m": round(g['MT'], 3),
+            "b1_m": round(g['lado_a_m'], 3),
+            "b2_m": round(g['lado_b_m'], 3),
+            "b_total_m": round(g['b'], 3),
+            "Ø_m": round(g['Ø'], 3),
+            "MF_kN_m_por_m": round(g['MF'], 3)
+        }
 
     def calcular_esforco_cortante_perimetro(self):
         """
-            Calcula o esforço cortante por metro de perímetro da base do tanque.
+        Calcula o esforço cortante por metro de perímetro da base do tanque.
 
-            Fórmulas:
-            qi = PTV / [(π ⋅ (Ø + b2)) ⋅ b2]
-            V = qi ⋅ b2
+        Fórmulas:
+        qi = PTV / [(π ⋅ (Ø + b2)) ⋅ b2]
+        V = qi ⋅ b2
 
-            :return: dicionário com qi e V
-         """
-        ØB = self.dados.geometria.get('diametro_base', 0)
-        b2 = self.dados.geometria.get('lado_b_m', 0)
-        PTV = (
-            self.dados.dados_tanque.get('peso_tanque_vazio')
-            or self.dados.dados_tanque.get('PTV')
-            or self.dados.geometria.get('peso_tanque_vazio')
-        )
+        :return: dicionário com qi e V
+        """
+        g = self._grafo
+        PTV = g['peso_tanque_vazio']
+        ØB = g['diametro_base']
+        b2 = g['lado_b_m']
 
         if not PTV:
             return {"mensagem": "Peso do tanque vazio não informado."}
@@ -351,254 +264,139 @@ class DimensionamentoBase:
         if ØB <= 1 or b2 <= 0:
             return {"mensagem": "Valores insuficientes para cálculo de esforço cortante."}
 
-        Ø = ØB - 1  # diâmetro útil
-        denom = math.pi * (Ø + b2) * b2
-        qi = PTV / denom if denom > 0 else 0
-        V = qi * b2
-
         return {
             "PTV_kN": PTV,
             "ØB_m": round(ØB, 3),
-            "Ø_m": round(Ø, 3),
+            "Ø_m": round(g['Ø'], 3),
             "b2_m": round(b2, 3),
-            "qi_kN_m2": round(qi, 3),
-            "V_kN_m": round(V, 3)
+            "qi_kN_m2": round(g['qi'], 3),
+            "V_kN_m": round(g['V'], 3)
         }
+
     def calcular_tracao_anel(self):
         """
         Calcula a altura h0 de tração no anel.
         Fórmula: h0 = p2 / ρL
-       """
-        resultados = self.calcular_espessura_anel()
-        p2 = resultados.get('p2_kN_m2', 0)
-        rhoL = self.dados.dados_tanque.get('densidade_fluido', 9.96)
-
-        h0 = p2 / rhoL if rhoL > 0 else 0
-
+        """
+        g = self._grafo
         return {
-        'p2_kN_m2': p2,
-        'rhoL_kN_m3': rhoL,
-        'h0_m': round(h0, 3)
+            'p2_kN_m2': round(g['p2'], 2),
+            'rhoL_kN_m3': g['densidade_liquido'],
+            'h0_m': round(g['h0'], 3)
         }
 
     def calcular_ps2(self):
         """
-         Calcula o empuxo horizontal ps₂ = k₀ · ρT · h₀
-         Sendo h₀ = p₂ / ρL = altura líquida considerada.
+        Calcula o empuxo horizontal ps₂ = k₀ · ρT · h₀
+        Sendo h₀ = p₂ / ρL = altura líquida considerada.
         """
-        k0 = 0.5  # já utilizado no programa
-        rhoT = 18.0  # peso específico do solo compactado (kN/m³)
-        rhoL = self.dados.dados_tanque.get('densidade_fluido', 0)
-        hT = self.dados.geometria.get('altura', 0)
-        p2 = rhoL * hT
-        h0 = p2 / rhoL if rhoL > 0 else 0  # cálculo direto como solicitado
-        ps2 = k0 * rhoT * h0
-
+        g = self._grafo
         return {
-         "k0": k0,
-         "rhoT_kN_m3": rhoT,
-         "rhoL_kN_m3": rhoL,
-         "p2_kN_m2": p2,
-         "h0_m": h0,
-         "ps2_kN_m2": round(ps2, 2)
+            "k0": K0,
+            "rhoT_kN_m3": RHO_T,
+            "rhoL_kN_m3": g['densidade_liquido'],
+            "p2_kN_m2": g['p2'],
+            "h0_m": g['h0'],
+            "ps2_kN_m2": round(g['ps2'], 2)
         }
-        
+
     def calcular_altura_total_H(self):
         """
         Calcula a altura total H = h + h₀
         h  = altura da base
         h₀ = altura de tração (calculada via p₂ / ρL)
         """
-        h = self.dados.geometria.get('altura_base', 0)
-        h0_dict = self.calcular_tracao_anel()
-        h0 = h0_dict.get('h0_m', 0)
-
-        H = h + h0
-
+        g = self._grafo
         return {
-            'h_base_m': h,
-            'h0_m': h0,
-            'H_m': round(H, 3)
+            'h_base_m': g['altura_base'],
+            'h0_m': round(g['h0'], 3),
+            'H_m': round(g['H'], 3)
         }
+
     def calcular_ps3(self):
         """
         Calcula o empuxo horizontal ps₃ = k₀ · ρT · H
         """
-        k0 = 0.5  # coeficiente de empuxo em repouso
-        rhoT = 18.0  # peso específico do solo compactado (kN/m³)
-        H_dict = self.calcular_altura_total_H()
-        H = H_dict.get('H_m', 0)
-
-        ps3 = k0 * rhoT * H
-
+        g = self._grafo
         return {
-         "k0": k0,
-         "rhoT_kN_m3": rhoT,
-         "H_m": H,
-         "ps3_kN_m2": round(ps3, 2)
+            "k0": K0,
+            "rhoT_kN_m3": RHO_T,
+            "H_m": round(g['H'], 3),
+            "ps3_kN_m2": round(g['ps3'], 2)
         }
 
     def calcular_E2(self):
         """
         Calcula E2 = (ps2 + ps3) * h / 2
         """
-        ps2_dict = self.calcular_ps2()
-        ps3_dict = self.calcular_ps3()
-        h = self.dados.geometria.get('altura_base', 0)
-
-        ps2 = ps2_dict.get('ps2_kN_m2', 0)
-        ps3 = ps3_dict.get('ps3_kN_m2', 0)
-
-        E2 = (ps2 + ps3) * h / 2
-
+        g = self._grafo
         return {
-            "ps2_kN_m2": ps2,
-            "ps3_kN_m2": ps3,
-            "h_base_m": h,
-            "E2_kN": round(E2, 2)
+            "ps2_kN_m2": round(g['ps2'], 2),
+            "ps3_kN_m2": round(g['ps3'], 2),
+            "h_base_m": g['altura_base'],
+            "E2_kN": round(g['E2'], 2)
         }
-              
+
     def calcular_torcao_conjugada(self):
         """
         Calcula o esforço de torção conjugada (Tc) na base do anel:
         Tc = E2 * (Ø + b)/2
         """
-        Ø_resultado = self.calcular_resistencia_anel()
-        Ø = Ø_resultado.get("Ø_m", 0)
-
-        b1 = self.dados.geometria.get("lado_a_m", 0)
-        b2 = self.dados.geometria.get("lado_b_m", 0)
-        b = b1 + b2
-
-    # E2 = (ps2 + ps3) * h / 2
-        ps2 = self.calcular_ps2().get("ps2_kN_m2", 0)
-        ps3 = self.calcular_ps3().get("ps3_kN_m2", 0)
-        h = self.dados.geometria.get("altura_base", 0)
-
-        E2 = (ps2 + ps3) * h / 2
-        Tc = E2 * (Ø + b) / 2
-
+        g = self._grafo
         return {
-        "ps2_kN_m2": ps2,
-        "ps3_kN_m2": ps3,
-        "h_m": h,
-        "E2_kN_m": round(E2, 2),
-        "Ø_m": round(Ø, 3),
-        "b_m": round(b, 3),
-        "Tc_kN_m": round(Tc, 2)
+            "ps2_kN_m2": round(g['ps2'], 2),
+            "ps3_kN_m2": round(g['ps3'], 2),
+            "h_m": g['altura_base'],
+            "E2_kN_m": round(g['E2'], 2),
+            "Ø_m": round(g['Ø'], 3),
+            "b_m": round(g['b'], 3),
+            "Tc_kN_m": round(g['Tc'], 2)
         }
-                        
-          
-    def calcular_armadura_tracao_lateral(self):
-        resultados_anel = self.calcular_espessura_anel()
-
-        rhoT = 18.0
-        k0 = 0.5
-        h = self.dados.geometria.get('altura_base', 0)
-        hT = self.dados.geometria.get('altura', 0)
-        ØB = self.dados.geometria.get('diametro_base', 0)
-        Ø = ØB - 1 if ØB > 1 else 0
-        b1 = self.dados.geometria.get('lado_a_m', 0)
-        b2 = self.dados.geometria.get('lado_b_m', 0)
-        b = b1 + b2
-
-    # Altura líquida h0 = p2 / rhoL
-        rhoL = self.dados.dados_tanque.get('densidade_fluido', 9.96)
-        p2 = rhoL * hT
-        h0 = p2 / rhoL if rhoL > 0 else 0
-        H = h + h0
-
-        ps2 = k0 * rhoT * h0
-        ps3 = k0 * rhoT * H
-        E2 = (ps2 + ps3) * h / 2
-        Tc = E2 * (Ø + b) / 2
-
-        fyk = self.materiais.aco.get('fyk', 250)  # MPa
-        gamma_s = 1.4
-        sigma_ac = fyk / gamma_s  # MPa
-        As = (Tc * gamma_s) / (fyk / 10)  # convertendo kN → N → cm²
 
+    def calcular_armadura_tracao_lateral(self):
+        g = self._grafo
         return {
-        'ps2_kN_m2': round(ps2, 2),
-        'ps3_kN_m2': round(ps3, 2),
-        'E2_kN_m': round(E2, 2),
-        'Tc_kN': round(Tc, 2),
-        'sigma_aco_MPa': round(fyk, 2),
-        'As_tracao_cm2': round(As, 2)
-         }
+            'ps2_kN_m2': round(g['ps2'], 2),
+            'ps3_kN_m2': round(g['ps3'], 2),
+            'E2_kN_m': round(g['E2'], 2),
+            'Tc_kN': round(g['Tc'], 2),
+            'sigma_aco_MPa': round(g['fyk'], 2),
+            'As_tracao_cm2': round(g['As_tracao'], 2)
+        }
 
     def calcular_linha_neutra(self):
         """
-         Calcula a profundidade da linha neutra (y) para seção retangular.
-         Equação implícita: (Md / (0.85 * fcd * bw * d^2)) = (y/d) * (1 - 0.5 * y/d)
-         Usa método iterativo para encontrar y/d, limitado a máximo de 0.45.
+        Calcula a profundidade da linha neutra (y) para seção retangular.
+        Equação implícita: (Md / (0.85 * fcd * bw * d^2)) = (y/d) * (1 - 0.5 * y/d)
+        Resolve y/d pela raiz menor da equação do 2º grau, limitada a máximo de 0.45.
         """
-        resultado_mf = self.calcular_momento_fletor()
-        Md = resultado_mf.get("MF_kN_m_por_m", 0) * 1000  # kN.m/m → N.m/m
-
-        fck = self.materiais.concreto.get("fck", 30)  # MPa
-        # fck é fornecido em MPa (N/mm²). Para utilizar na equação em N/m² é
-        # necessário multiplicar por 1e6.
-        fcd = (fck / 1.4) * 1e6  # MPa → N/m²
-
-        b1 = self.dados.geometria.get("lado_a_m", 0)
-        b2 = self.dados.geometria.get("lado_b_m", 0)
-        bw = b1 + b2
-
-        h = self.dados.geometria.get("altura_base", 0)
-        d = h - 0.04  # cobrimento de 4 cm
-
-        if d <= 0 or bw <= 0:
-            raise ValueError("Dimensões inválidas para cálculo da linha neutra.")
-
-        lado_esquerdo = Md / (0.85 * fcd * bw * d**2)
-
-        from scipy.optimize import fsolve
-
-        def func(r):
-            return r * (1 - 0.5 * r) - lado_esquerdo
-
-        r_sol = fsolve(func, 0.4)[0]
-        r_sol = min(r_sol, 0.45)  # Limita ao Domínio 3 da NBR 6118
-
-        y = r_sol * d
-
+        self._verificar_secao()
+        g = self._grafo
         return {
-            "Md_kNm_m": round(Md / 1000, 3),
-            "fcd_kN_m2": round(fcd, 2),
-            "bw_m": round(bw, 3),
-            "d_m": round(d, 3),
-            "y_m": round(y, 4),
-            "y_d_ratio": round(r_sol, 4)
+            "Md_kNm_m": round(g['Md'], 3),
+            "fcd_kN_m2": round(g['fcd_Nm2'], 2),
+            "bw_m": round(g['b'], 3),
+            "d_m": round(g['d'], 3),
+            "y_m": round(g['y'], 4),
+            "y_d_ratio": round(g['y_d'], 4)
         }
-        
+
     def calcular_taxa_armadura_rho(self):
         """
         Calcula a taxa de armadura (ρ) a partir da razão y/d:
         ρ = (y/d) ⋅ (0,85 ⋅ fcd) / fyd
         """
-        dados_linha_neutra = self.calcular_linha_neutra()
-        y_d = dados_linha_neutra.get('y_d_ratio', 0)
-
-        fck = self.materiais.concreto.get('fck', 30)  # MPa
-        # Conversão correta de MPa para N/m²
-        fcd = (fck / 1.4) * 1e6
-
-        fyk = self.materiais.aco.get('fyk', 500)  # MPa
-        # Conversão de MPa para N/m²
-        fyd = (fyk / 1.15) * 1e6
-
-        if fyd == 0:
+        self._verificar_secao()
+        g = self._grafo
+        if g['fyd_Nm2'] == 0:
             raise ValueError("fyd não pode ser zero.")
 
-        rho = (y_d * 0.85 * fcd) / fyd
-
         return {
-         "y_d": round(y_d, 4),
-         "fcd_kN_m2": round(fcd, 2),
-         "fyd_kN_m2": round(fyd, 2),
-         "rho_taxa_armadura": round(rho, 5)
-         }
+            "y_d": round(g['y_d'], 4),
+            "fcd_kN_m2": round(g['fcd_Nm2'], 2),
+            "fyd_kN_m2": round(g['fyd_Nm2'], 2),
+            "rho_taxa_armadura": round(g['rho'], 5)
+        }
 
     def calcular_area_aco_via_taxa_armadura(self):
         """
@@ -606,42 +404,23 @@ class DimensionamentoBase:
         As = ρ ⋅ bw ⋅ d
         """
         dados_taxa = self.calcular_taxa_armadura_rho()
-        rho = dados_taxa.get("rho_taxa_armadura", 0)  # adimensional
-
-        b1 = self.dados.geometria.get("lado_a_m", 0)
-        b2 = self.dados.geometria.get("lado_b_m", 0)
-        bw = b1 + b2  # largura da seção (m)
-
-        h = self.dados.geometria.get("altura_base", 0)
-        d = h - 0.04  # cobrimento de 4 cm
-
-        As = rho * bw * d  # área de aço (m²)
-        As_cm2 = As * 10000  # m² → cm²
-
+        g = self._grafo
         return {
-            "rho": round(rho, 5),
-            "bw_m": round(bw, 3),
-            "d_m": round(d, 3),
-            "As_cm2": round(As_cm2, 2)
+            "rho": dados_taxa["rho_taxa_armadura"],
+            "bw_m": round(g['b'], 3),
+            "d_m": round(g['d'], 3),
+            "As_cm2": round(g['As'], 2)
         }
-        
+
     def calcular_armadura_minima(self):
         """
         Calcula a armadura mínima conforme NBR 6118:
         As_min = 0.0015 ⋅ b_w ⋅ d
         """
-        b1 = self.dados.geometria.get("lado_a_m", 0)
-        b2 = self.dados.geometria.get("lado_b_m", 0)
-        bw = b1 + b2
-        h = self.dados.geometria.get("altura_base", 0)
-        d = h - 0.04  # cobrimento
-
-        rho_min = 0.0015
-        As_min = rho_min * bw * d * 10000  # m² → cm²
-
+        g = self._grafo
         return {
-         "rho_min": rho_min,
-         "bw_m": round(bw, 3),
-         "d_m": round(d, 3),
-         "As_min_cm2": round(As_min, 2)
+            "rho_min": RHO_MIN,
+            "bw_m": round(g['b'], 3),
+            "d_m": round(g['d'], 3),
+            "As_min_cm2": round(g['As_min'], 2)
         }
@@ -0,0 +1,311 @@
+# elementos_finitos.py
+
+"""
+Modelo axissimétrico de elementos finitos: anel de concreto, aterro
+compactado e solo de fundação como um único contínuo (elasticidade linear).
+
+Geometria adotada (r radial a partir do eixo do tanque, z vertical, z = 0 no
+topo do anel e do aterro sob o fundo):
+  - anel: R - b2 <= r <= ØB/2 (ou R + b1, se ØB não for informado), -h <= z <= 0,
+    com R = dT/2, b1 = lado_a_m (externo), b2 = lado_b_m (interno) e h = altura_base;
+  - aterro compactado: sob o fundo (r < R - b2) até z = -h1 e, por fora do anel,
+    até z = -(h2 + h3) (as mesmas profundidades de capacidade_carga);
+  - solo: o restante, até a profundidade e o raio externo do modelo.
+Contorno: u_r = 0 no eixo e no raio externo; u_r = u_z = 0 na base.
+
+A malha é estruturada (retângulos), refinada junto ao anel e à superfície e
+gradualmente mais grossa para fora. Elementos bilineares de 4 nós com
+integração 2 × 2, montados de forma vetorizada em uma matriz esparsa. A
+matriz é fatorada uma única vez (LU esparsa, SuperLU) e a fatoração é
+reutilizada para todos os casos de carga, resolvidos juntos como colunas do
+segundo membro.
+
+Casos de carga básicos (combinações por superposição):
+  - 'peso_proprio': peso do anel (γc) e do aterro (ρT);
+  - 'tanque_vazio': φ = PTV / (π·dT) aplicado em r = R;
+  - 'produto': p2 = ρL·hL sobre o fundo (r < R).
+O vento não é axissimétrico e não entra no modelo.
+
+Requer scipy (scipy.sparse); o restante do programa não depende dele.
+"""
+
+import math
+
+import numpy as np
+
+from grafo_formulas import calcular, RHO_T
+
+# Propriedades padrão (E em kN/m²)
+POISSON_CONCRETO = 0.2
+POISSON_ATERRO = 0.3
+MODULO_CONCRETO = 30672.46e3
+
+CASOS_BASICOS = ('peso_proprio', 'tanque_vazio', 'produto')
+COMBINACOES_PADRAO = {'operacao': {'peso_proprio': 1.0, 'tanque_vazio': 1.0, 'produto': 1.0}}
+
+# Gauss 2 × 2 no quadrado de referência
+_GAUSS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=float) / math.sqrt(3)
+_CANTOS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=float)
+
+ANEL, ATERRO, SOLO = 0, 1, 2
+
+
+def _scipy():
+    try:
+        import scipy.sparse
+        import scipy.sparse.linalg
+    except ImportError:
+        raise ImportError("O modelo de elementos finitos requer o pacote scipy (pip install scipy).")
+    return scipy.sparse, scipy.sparse.linalg
+
+
+def _graduar(quebras, tamanho_minimo, crescimento, zona_fina):
+    """
+    Coordenadas dos nós em um eixo: passam por todas as quebras, com elementos de
+    tamanho_minimo na zona fina e crescendo (razão ~crescimento) com a distância a ela.
+    """
+    a, b = zona_fina
+    nos = [quebras[0]]
+    for inicio, fim in zip(quebras[:-1], quebras[1:]):
+        if fim - inicio <= 1e-9:
+            continue
+        x = np.linspace(inicio, fim, 400)
+        distancia = np.maximum(np.maximum(a - x, x - b), 0.0)
+        densidade = 1.0 / (tamanho_minimo + (crescimento - 1) * distancia)
+        acumulado = np.concatenate([[0.0], np.cumsum((densidade[1:] + densidade[:-1]) / 2 * np.diff(x))])
+        n = max(1, int(math.ceil(acumulado[-1] - 1e-9)))
+        nos.extend(np.interp(np.linspace(0, acumulado[-1], n + 1)[1:], acumulado, x))
+    return np.array(nos)
+
+
+def _matriz_constitutiva(E, nu):
+    """Matrizes D axissimétricas (ne, 4, 4) para [σr, σz, σθ, τrz]."""
+    c = E / ((1 + nu) * (1 - 2 * nu))
+    D = np.zeros(np.shape(E) + (4, 4))
+    for i in range(3):
+        for j in range(3):
+            D[..., i, j] = c * np.where(i == j, 1 - nu, nu)
+    D[..., 3, 3] = c * (1 - 2 * nu) / 2
+    return D
+
+
+class ModeloAxissimetrico:
+    """
+    Malha, rigidez fatorada e solução de casos de carga do conjunto anel + aterro + solo.
+    """
+    def __init__(self, colunas: dict, E_aterro: float = None, E_concreto: float = MODULO_CONCRETO,
+                 tamanho_minimo: float = None, crescimento: float = 1.3, raio_externo: float = None,
+                 profundidade: float = None):
+        """
+        :param colunas: entradas de um tanque (chaves de motor_vetorizado.CAMPOS_ENTRADA, escalares)
+        :param E_aterro: módulo do aterro compactado (padrão: Esolo)
+        :param E_concreto: módulo do concreto do anel (kN/m²)
+        :param tamanho_minimo: lado dos elementos junto ao anel (padrão: menor entre b e h, / 4)
+        :param crescimento: razão de crescimento dos elementos para longe do anel
+        :param raio_externo: raio do modelo (padrão: 3·R)
+        :param profundidade: profundidade do modelo (padrão: 2·dT)
+        """
+        self.colunas = {chave: float(valor) for chave, valor in colunas.items()}
+        c = self.colunas
+        R = c['diametro'] / 2
+        b1, b2, h = c['lado_a_m'], c['lado_b_m'], c['altura_base']
+        externo = c['diametro_base'] / 2 if c.get('diametro_base', 0) > R else R + b1
+        self.raio, self.anel = R, (R - b2, externo)
+        self.h1, self.h_externo, self.altura_base = c['h1'], c['h2'] + c['h3'], h
+
+        tamanho_minimo = tamanho_minimo or min(externo - (R - b2), h) / 4
+        raio_externo = raio_externo or 3 * R
+        profundidade = profundidade or 2 * c['diametro']
+        self.r = _graduar(sorted({0.0, R - b2, R, externo, raio_externo}), tamanho_minimo, crescimento,
+                          (R - b2, externo))
+        fundo = max(h, self.h1, self.h_externo)
+        self.y = _graduar(sorted({0.0, self.h1, self.h_externo, h, profundidade}), tamanho_minimo, crescimento,
+                          (0.0, fundo))
+
+        nr, ny = len(self.r) - 1, len(self.y) - 1
+        self.nos = np.stack(np.meshgrid(self.r, -self.y, indexing='xy'), axis=-1).reshape(-1, 2)
+        i, j = np.meshgrid(np.arange(nr), np.arange(ny), indexing='xy')
+        i, j = i.ravel(), j.ravel()
+        no = lambda ii, jj: jj * (nr + 1) + ii
+        # ordem anti-horária em (r, z): j + 1 é mais profundo
+        self.elementos = np.stack([no(i, j + 1), no(i + 1, j + 1), no(i + 1, j), no(i, j)], axis=1)
+        self.centro_r = (self.r[i] + self.r[i + 1]) / 2
+        self.centro_y = (self.y[j] + self.y[j + 1]) / 2
+        self.lado_r = self.r[i + 1] - self.r[i]
+        self.lado_z = self.y[j + 1] - self.y[j]
+
+        no_anel = (self.centro_r > self.anel[0]) & (self.centro_r < self.anel[1]) & (self.centro_y < h)
+        no_aterro = ~no_anel & np.where(self.centro_r < R, self.centro_y < self.h1, self.centro_y < self.h_externo)
+        self.regiao = np.where(no_anel, ANEL, np.where(no_aterro, ATERRO, SOLO))
+        E = np.array([E_concreto, E_aterro or c['Esolo'], c['Esolo']])
+        nu = np.array([POISSON_CONCRETO, POISSON_ATERRO, c['poisson']])
+        self.E, self.nu = E[self.regiao], nu[self.regiao]
+        self.peso_especifico = np.array([c['gamma_concreto'], RHO_T, 0.0])[self.regiao]
+
+        self._rigidez()
+
+    # ------------------------------------------------------------------ montagem
+
+    def _derivadas(self, xi, eta):
+        """Funções de forma (4,) e derivadas em r e z (ne, 4) em um ponto de Gauss."""
+        N = (1 + xi * _CANTOS[:, 0]) * (1 + eta * _CANTOS[:, 1]) / 4
+        dN_dr = _CANTOS[:, 0] * (1 + eta * _CANTOS[:, 1]) / 4 * (2 / self.lado_r[:, None])
+        dN_dz = _CANTOS[:, 1] * (1 + xi * _CANTOS[:, 0]) / 4 * (2 / self.lado_z[:, None])
+        return N, dN_dr, dN_dz
+
+    def _matriz_B(self, xi, eta):
+        N, dN_dr, dN_dz = self._derivadas(xi, eta)
+        r = self.centro_r + xi * self.lado_r / 2
+        B = np.zeros((len(r), 4, 8))
+        B[:, 0, 0::2] = dN_dr
+        B[:, 1, 1::2] = dN_dz
+        B[:, 2, 0::2] = N[None, :] / r[:, None]
+        B[:, 3, 0::2] = dN_dz
+        B[:, 3, 1::2] = dN_dr
+        return B, N, r
+
+    def _rigidez(self):
+        sparse, linalg = _scipy()
+        D = _matriz_constitutiva(self.E, self.nu)
+        area = self.lado_r * self.lado_z / 4  # det J
+        K = np.zeros((len(self.elementos), 8, 8))
+        for xi, eta in _GAUSS:
+            B, _, r = self._matriz_B(xi, eta)
+            K += np.einsum('eki,ekl,elj->eij', B, D, B) * (2 * np.pi * r * area)[:, None, None]
+
+        self.graus = np.stack([2 * self.elementos, 2 * self.elementos + 1], axis=-1).reshape(-1, 8)
+        linhas = np.repeat(self.graus, 8, axis=1).ravel()
+        colunas = np.tile(self.graus, (1, 8)).ravel()
+        n = 2 * len(self.nos)
+        self.K = sparse.coo_matrix((K.ravel(), (linhas, colunas)), shape=(n, n)).tocsc()
+
+        r, z = self.nos[:, 0], self.nos[:, 1]
+        fixos = np.concatenate([
+            2 * np.nonzero(np.isclose(r, 0.0) | np.isclose(r, self.r[-1]))[0],
+            2 * np.nonzero(np.isclose(z, -self.y[-1]))[0] + 1,
+        ])
+        self.livres = np.setdiff1d(np.arange(n), fixos)
+        self._fatoracao = linalg.splu(self.K[self.livres][:, self.livres].tocsc())
+
+    # ------------------------------------------------------------------ cargas
+
+    def _carga_superficie(self, pressao, r_max):
+        """Pressão vertical (kN/m², para baixo) em z = 0, 0 <= r <= r_max: forças nodais consistentes."""
+        F = np.zeros(2 * len(self.nos))
+        topo = np.nonzero(self.r <= r_max + 1e-9)[0]
+        for a, b in zip(topo[:-1], topo[1:]):
+            r1, r2 = self.r[a], self.r[b]
+            L = r2 - r1
+            F[2 * a + 1] -= 2 * np.pi * pressao * L * (2 * r1 + r2) / 6
+            F[2 * b + 1] -= 2 * np.pi * pressao * L * (r1 + 2 * r2) / 6
+        return F
+
+    def _carga_linha(self, carga, raio):
+        """Carga vertical por metro de perímetro (kN/m) no círculo de raio `raio`, em z = 0."""
+        F = np.zeros(2 * len(self.nos))
+        no = int(np.argmin(np.abs(self.r - raio)))
+        F[2 * no + 1] -= carga * 2 * np.pi * self.r[no]
+        return F
+
+    def _carga_peso_proprio(self):
+        F = np.zeros(2 * len(self.nos))
+        area = self.lado_r * self.lado_z / 4
+        for xi, eta in _GAUSS:
+            N, _, _ = self._derivadas(xi, eta)
+            r = self.centro_r + xi * self.lado_r / 2
+            forca = -self.peso_especifico * 2 * np.pi * r * area
+            np.add.at(F, 2 * self.elementos + 1, forca[:, None] * N[None, :])
+        return F
+
+    def cargas_basicas(self) -> dict:
+        """Vetores de força dos casos de carga básicos (CASOS_BASICOS)."""
+        valores = dict(self.colunas)
+        valores.setdefault('altura_liquido', valores['altura'])
+        valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+        formulas = calcular(('phi', 'p2'), valores)
+        return {
+            'peso_proprio': self._carga_peso_proprio(),
+            'tanque_vazio': self._carga_linha(formulas['phi'], self.raio),
+            'produto': self._carga_superficie(formulas['p2'], self.raio),
+        }
+
+    # ------------------------------------------------------------------ solução
+
+    def resolver(self, cargas: dict) -> dict:
+        """
+        Deslocamentos de vários casos de carga com a mesma fatoração.
+
+        :param cargas: nome → vetor de forças nodais (2 · nós)
+        :return: nome → deslocamentos (nós, 2) [u_r, u_z] em m
+        """
+        nomes = list(cargas)
+        F = np.stack([cargas[nome] for nome in nomes], axis=1)
+        U = np.zeros_like(F)
+        U[self.livres] = self._fatoracao.solve(np.ascontiguousarray(F[self.livres]))
+        return {nome: U[:, k].reshape(-1, 2) for k, nome in enumerate(nomes)}
+
+    def tensoes(self, deslocamentos) -> np.ndarray:
+        """Tensões no centro dos elementos (ne, 4): [σr, σz, σθ, τrz] em kN/m² (tração positiva)."""
+        B, _, _ = self._matriz_B(0.0, 0.0)
+        u = deslocamentos.ravel()[self.graus]
+        deformacoes = np.einsum('ekj,ej->ek', B, u)
+        return np.einsum('ekl,el->ek', _matriz_constitutiva(self.E, self.nu), deformacoes)
+
+    def resumo(self, deslocamentos) -> dict:
+        """Grandezas para comparação com as fórmulas simplificadas."""
+        sigma = self.tensoes(deslocamentos)
+        superficie = np.isclose(self.nos[:, 1], 0.0)
+        r_sup = self.nos[superficie, 0]
+        w_sup = -deslocamentos[superficie, 1] * 1000
+        sobre_anel = (r_sup >= self.anel[0] - 1e-9) & (r_sup <= self.anel[1] + 1e-9)
+
+        # primeira camada de elementos de solo abaixo do anel e abaixo do aterro interno
+        primeira_abaixo = lambda mascara, cota: mascara & np.isclose(self.centro_y - self.lado_z / 2, cota)
+        sob_anel = primeira_abaixo((self.centro_r > self.anel[0]) & (self.centro_r < self.anel[1]), self.altura_base)
+        sob_aterro = primeira_abaixo(self.centro_r < self.anel[0], self.h1)
+
+        def media(mascara):
+            peso = self.centro_r[mascara] * self.lado_r[mascara]
+            return float(np.sum(-sigma[mascara, 1] * peso) / np.sum(peso)) if mascara.any() else float('nan')
+
+        return {
+            'recalque_centro_mm': float(w_sup[np.argmin(r_sup)]),
+            'recalque_anel_mm': float(w_sup[sobre_anel].mean()),
+            'recalque_diferencial_mm': float(w_sup[np.argmin(r_sup)] - w_sup[sobre_anel].mean()),
+            'tensao_solo_sob_anel_kN_m2': media(sob_anel),
+            'tensao_sob_aterro_kN_m2': media(sob_aterro),
+            'perfil_superficie': {'r_m': r_sup, 'recalque_mm': w_sup},
+        }
+
+
+def analisar(colunas: dict, combinacoes: dict = None, **opcoes) -> dict:
+    """
+    Monta o modelo, resolve os casos básicos com uma fatoração e combina.
+
+    :param colunas: entradas de um tanque (chaves de motor_vetorizado.CAMPOS_ENTRADA, escalares)
+    :param combinacoes: nome → {caso básico: fator} (padrão: COMBINACOES_PADRAO)
+    :param opcoes: parâmetros de ModeloAxissimetrico (malha e propriedades)
+    :return: dicionário com 'modelo', 'deslocamentos' e 'resumo' por caso/combinação, e
+             'formulas' (valores das fórmulas simplificadas correspondentes, sem vento)
+    """
+    modelo = ModeloAxissimetrico(colunas, **opcoes)
+    deslocamentos = modelo.resolver(modelo.cargas_basicas())
+    for nome, fatores in (combinacoes or COMBINACOES_PADRAO).items():
+        deslocamentos[nome] = sum(fator * deslocamentos[caso] for caso, fator in fatores.items())
+
+    valores = dict(modelo.colunas)
+    valores.setdefault('altura_liquido', valores['altura'])
+    valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+    f = calcular(('p1', 'p2', 'p4', 'p5', 'p7', 'recalque_mm'), valores)
+    return {
+        'modelo': modelo,
+        'nos': len(modelo.nos),
+        'elementos': len(modelo.elementos),
+        'deslocamentos': deslocamentos,
+        'resumo': {nome: modelo.resumo(u) for nome, u in deslocamentos.items()},
+        'formulas': {
+            'tensao_solo_sob_anel_kN_m2': f['p4'] + f['p5'] + f['p7'],
+            'tensao_sob_aterro_kN_m2': f['p1'] + f['p2'],
+            'recalque_mm': f['recalque_mm'],
+        },
+    }
@@ -0,0 +1,204 @@
+# envelope_capacidade.py
+
+"""
+Envelope de capacidade: valor limite de uma entrada para uma base fixa.
+
+Para uma das entradas 'altura', 'densidade_fluido', 'vento_v0' ou
+'peso_tanque_vazio', e para cada verificação de VERIFICACOES, procura o
+menor valor da entrada (dentro de uma faixa) em que a utilização atinge 1,
+mantidas as demais entradas. O limite do tanque é o menor entre as
+verificações, e a verificação correspondente é a governante.
+
+A procura é vetorizada em todos os tanques: uma varredura grossa da faixa
+isola o primeiro cruzamento de cada verificação e o método de Brent
+(interpolação quadrática inversa / secante / bissecção, com intervalo
+sempre garantido) refina todos os limites ao mesmo tempo. As utilizações
+vêm dos núcleos compilados de grafo_formulas, com apenas as grandezas
+necessárias.
+"""
+
+import numpy as np
+
+from grafo_formulas import compilar, VERIFICACOES
+
+# Entradas que podem ser procuradas, com a faixa padrão de procura
+VARIAVEIS = {
+    'altura': (0.5, 60.0),              # m (altura do costado e do líquido)
+    'densidade_fluido': (0.1, 30.0),    # kN/m³
+    'vento_v0': (0.0, 100.0),           # m/s
+    'peso_tanque_vazio': (0.0, 1.0e5),  # kN
+}
+
+
+def brent_vetorizado(funcao, a, b, fa=None, fb=None, xtol=1e-6, rtol=1e-10, maxiter=100):
+    """
+    Raízes de funcao(x) = 0 em [a, b] para vários problemas independentes ao mesmo tempo
+    (algoritmo de Brent, na forma usada por scipy.optimize.brentq).
+
+    :param funcao: recebe um array x (n,) e devolve f(x) (n,), elemento a elemento
+    :param a, b: extremos dos intervalos (n,), com f(a)·f(b) <= 0
+    :return: array (n,) com as raízes (nan onde o intervalo não contém mudança de sinal)
+    """
+    xpre = np.array(a, dtype=float)
+    xcur = np.array(b, dtype=float)
+    fpre = funcao(xpre) if fa is None else np.array(fa, dtype=float)
+    fcur = funcao(xcur) if fb is None else np.array(fb, dtype=float)
+    valido = fpre * fcur <= 0
+    xblk = np.zeros_like(xpre)
+    fblk = np.zeros_like(xpre)
+    spre = np.zeros_like(xpre)
+    scur = np.zeros_like(xpre)
+    raiz = np.where(fpre == 0, xpre, xcur)
+    ativo = valido & (fpre != 0) & (fcur != 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(maxiter):
+            if not ativo.any():
+                break
+            troca = ativo & (fpre * fcur < 0)
+            xblk = np.where(troca, xpre, xblk)
+            fblk = np.where(troca, fpre, fblk)
+            spre = np.where(troca, xcur - xpre, spre)
+            scur = np.where(troca, xcur - xpre, scur)
+
+            inverte = ativo & (np.abs(fblk) < np.abs(fcur))
+            xpre, xcur, xblk = (np.where(inverte, xcur, xpre), np.where(inverte, xblk, xcur),
+                                np.where(inverte, xcur, xblk))
+            fpre, fcur, fblk = (np.where(inverte, fcur, fpre), np.where(inverte, fblk, fcur),
+                                np.where(inverte, fcur, fblk))
+
+            delta = (xtol + rtol * np.abs(xcur)) / 2
+            sbis = (xblk - xcur) / 2
+            convergiu = ativo & ((fcur == 0) | (np.abs(sbis) < delta))
+            raiz = np.where(convergiu, xcur, raiz)
+            ativo = ativo & ~convergiu
+            if not ativo.any():
+                break
+
+            interpola = ativo & (np.abs(spre) > delta) & (np.abs(fcur) < np.abs(fpre))
+            secante = -fcur * (xcur - xpre) / (fcur - fpre)
+            dpre = (fpre - fcur) / (xpre - xcur)
+            dblk = (fblk - fcur) / (xblk - xcur)
+            quadratica = -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre))
+            stry = np.where(xpre == xblk, secante, quadratica)
+            aceita = interpola & (2 * np.abs(stry) < np.minimum(np.abs(spre), 3 * np.abs(sbis) - delta))
+            spre = np.where(ativo, np.where(aceita, scur, sbis), spre)
+            scur = np.where(ativo, np.where(aceita, stry, sbis), scur)
+
+            xpre = np.where(ativo, xcur, xpre)
+            fpre = np.where(ativo, fcur, fpre)
+            passo = np.where(np.abs(scur) > delta, scur, np.where(sbis > 0, delta, -delta))
+            xcur = np.where(ativo, xcur + passo, xcur)
+            fcur = np.where(ativo, funcao(xcur), fcur)
+
+    raiz = np.where(ativo, xcur, raiz)
+    return np.where(valido, raiz, np.nan)
+
+
+def _expandir(colunas, variavel, valores):
+    """Colunas com a variável substituída; as demais ganham eixos para broadcasting."""
+    extras = valores.ndim - 1
+    expandidas = {
+        chave: (np.asarray(valor, dtype=float).reshape(np.shape(valor) + (1,) * extras) if np.ndim(valor) else valor)
+        for chave, valor in colunas.items()
+    }
+    expandidas[variavel] = valores
+    expandidas['altura_liquido'] = expandidas['altura']
+    expandidas['densidade_liquido'] = expandidas['densidade_fluido']
+    return expandidas
+
+
+def envelope_colunas(colunas: dict, variavel: str, faixa=None, pontos: int = 64, xtol: float = 1e-6) -> dict:
+    """
+    Valor limite de `variavel` para cada verificação, em vários tanques.
+
+    :param colunas: entradas com as chaves de motor_vetorizado.CAMPOS_ENTRADA (escalares ou arrays 1D)
+    :param variavel: uma das chaves de VARIAVEIS
+    :param faixa: (mínimo, máximo) da procura; padrão: VARIAVEIS[variavel]
+    :param pontos: pontos da varredura grossa que isola o primeiro cruzamento
+    :param xtol: tolerância absoluta do limite
+    :return: dicionário com 'atual', 'limites' (verificação → array; inf se não é atingido na
+             faixa), 'falha_no_minimo' (verificação → bool; já não atende no mínimo da faixa),
+             'limite' (o menor), 'governante' (nome da verificação) e 'margem' (limite / atual)
+    """
+    if variavel not in VARIAVEIS:
+        raise ValueError(f"Variável sem procura de limite: {variavel}. Use uma de {list(VARIAVEIS)}.")
+    minimo, maximo = faixa or VARIAVEIS[variavel]
+    n = max([np.size(valor) for valor in colunas.values()])
+    colunas = {chave: (np.broadcast_to(valor, (n,)) if np.ndim(valor) else valor) for chave, valor in colunas.items()}
+    nomes = list(VERIFICACOES)
+    saidas = tuple(f'utilizacao_{nome}' for nome in nomes)
+
+    # Varredura grossa: (tanques, pontos)
+    grade = np.broadcast_to(np.linspace(minimo, maximo, pontos), (n, pontos))
+    utilizacoes = compilar(saidas, 'numpy').calcular(_expandir(colunas, variavel, grade))
+
+    limites, falha_no_minimo = {}, {}
+    for nome, saida in zip(nomes, saidas):
+        excesso = np.broadcast_to(utilizacoes[saida], (n, pontos)) - 1
+        falha = excesso > 0                       # nan conta como "atende"
+        primeira = np.argmax(falha, axis=1)
+        alguma = falha.any(axis=1)
+        no_minimo = alguma & (primeira == 0)
+        limite = np.full(n, np.inf)
+        limite[no_minimo] = minimo
+
+        refinar = alguma & ~no_minimo
+        if refinar.any():
+            indices = np.nonzero(refinar)[0]
+            k = primeira[indices]
+            sub = {chave: (valor[indices] if np.ndim(valor) else valor) for chave, valor in colunas.items()}
+            nucleo = compilar((saida,), 'numpy')
+
+            def funcao(x):
+                return np.broadcast_to(nucleo.calcular(_expandir(sub, variavel, x))[saida], x.shape) - 1
+
+            limite[indices] = brent_vetorizado(
+                funcao, grade[indices, k - 1], grade[indices, k],
+                excesso[indices, k - 1], excesso[indices, k], xtol=xtol
+            )
+        limites[nome] = limite
+        falha_no_minimo[nome] = no_minimo
+
+    matriz = np.stack([limites[nome] for nome in nomes])
+    governante = np.array(nomes, dtype=object)[np.argmin(matriz, axis=0)]
+    limite = matriz.min(axis=0)
+    governante = np.where(np.isinf(limite), None, governante)
+    atual = np.broadcast_to(np.asarray(colunas[variavel], dtype=float), (n,))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margem = limite / atual
+
+    return {
+        'variavel': variavel,
+        'faixa': (minimo, maximo),
+        'atual': atual,
+        'limites': limites,
+        'falha_no_minimo': falha_no_minimo,
+        'limite': limite,
+        'governante': governante,
+        'margem': margem,
+    }
+
+
+def envelope(entrada, materiais, variaveis=tuple(VARIAVEIS), **opcoes) -> dict:
+    """
+    Envelope de capacidade de um tanque descrito por EntradaDados/Materiais.
+
+    :param variaveis: entradas a procurar (padrão: todas de VARIAVEIS)
+    :param opcoes: demais parâmetros de envelope_colunas (faixa, pontos, xtol)
+    :return: variável → {'atual', 'limite', 'governante', 'margem', 'limites': {verificação: valor}}
+    """
+    from motor_vetorizado import colunas_de_entrada
+
+    colunas = colunas_de_entrada(entrada, materiais)
+    resultado = {}
+    for variavel in variaveis:
+        r = envelope_colunas(colunas, variavel, **opcoes)
+        resultado[variavel] = {
+            'atual': float(r['atual'][0]),
+            'limite': float(r['limite'][0]),
+            'governante': r['governante'][0],
+            'margem': float(r['margem'][0]),
+            'limites': {nome: float(valor[0]) for nome, valor in r['limites'].items()},
+        }
+    return resultado
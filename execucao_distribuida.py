@@ -0,0 +1,457 @@
+# execucao_distribuida.py
+
+"""
+Execução de varreduras grandes em vários nós.
+
+O conjunto de casos é um ArmazemCasos em disco, dividido em blocos. Um
+coordenador distribui os blocos por uma fila TCP leve (uma linha JSON por
+mensagem) e cada nó de trabalho:
+
+  - copia as colunas do armazém uma única vez para um bloco de memória
+    compartilhada (multiprocessing.shared_memory); os processos do nó leem as
+    colunas dessa memória por fatias, sem copiar nem serializar casos;
+  - pede ao coordenador tantos blocos quantos processos livres tiver;
+  - grava os resultados de cada bloco diretamente no diretório de saída
+    (gravador_resultados.gravar_bloco) e devolve ao coordenador apenas o
+    resumo do bloco.
+
+O coordenador é o único que escreve o manifesto do diretório de saída
+(GravadorResultados), de modo que uma execução interrompida é retomada pelos
+checkpoints (com o mesmo tamanho de bloco, registrado no manifesto). Blocos que falham são reenviados até `tentativas` vezes; blocos
+de um nó que se desconecta voltam para a fila; quando a fila esvazia, um nó
+ocioso recebe uma cópia do bloco em andamento mais antigo de outro nó (roubo
+de trabalho dos retardatários) e vale o primeiro resultado.
+
+Supõe-se que o armazém e o diretório de saída estejam em um sistema de
+arquivos visível por todos os nós. Para testar em uma única máquina,
+executar_local() sobe o coordenador e vários nós como processos locais.
+
+Uso:
+    python execucao_distribuida.py coordenador --armazem casos/ --saida resultados/ --porta 8766
+    python execucao_distribuida.py no --host 10.0.0.1 --porta 8766 --processos 8
+"""
+
+import argparse
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import importlib
+import json
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+
+import numpy as np
+
+from armazem_casos import ArmazemCasos
+from gravador_resultados import GravadorResultados, gravar_bloco, resumir_bloco
+from motor_vetorizado import CAMPOS_ENTRADA
+
+FUNCAO_PADRAO = 'motor_vetorizado:avaliar'
+
+
+def _resolver_funcao(referencia: str):
+    """'modulo:nome' → função."""
+    modulo, nome = referencia.split(':')
+    return getattr(importlib.import_module(modulo), nome)
+
+
+# ---------------------------------------------------------------------- memória compartilhada
+
+class ColunasCompartilhadas:
+    """
+    Colunas de entrada de um armazém em um único bloco de memória compartilhada
+    (matriz campos × casos, float64).
+    """
+    def __init__(self, memoria, quantidade, dono):
+        self.memoria = memoria
+        self.quantidade = quantidade
+        self.dono = dono
+        self.matriz = np.ndarray((len(CAMPOS_ENTRADA), quantidade), dtype=np.float64, buffer=memoria.buf)
+
+    @classmethod
+    def de_armazem(cls, armazem: ArmazemCasos, tamanho_copia: int = 1 << 20) -> 'ColunasCompartilhadas':
+        from multiprocessing import shared_memory
+
+        quantidade = len(armazem)
+        memoria = shared_memory.SharedMemory(create=True, size=max(1, len(CAMPOS_ENTRADA) * quantidade * 8))
+        compartilhadas = cls(memoria, quantidade, dono=True)
+        for linha, nome in enumerate(CAMPOS_ENTRADA):
+            origem = armazem.coluna(nome)
+            for inicio in range(0, quantidade, tamanho_copia):
+                compartilhadas.matriz[linha, inicio:inicio + tamanho_copia] = origem[inicio:inicio + tamanho_copia]
+        return compartilhadas
+
+    @classmethod
+    def anexar(cls, descritor) -> 'ColunasCompartilhadas':
+        from multiprocessing import shared_memory
+
+        # Os processos do pool compartilham o resource_tracker do nó, que é o dono do bloco
+        nome, quantidade = descritor
+        return cls(shared_memory.SharedMemory(name=nome), quantidade, dono=False)
+
+    @property
+    def descritor(self):
+        return self.memoria.name, self.quantidade
+
+    def colunas(self, inicio: int, fim: int) -> dict:
+        """Colunas dos casos [inicio, fim), como vistas da memória compartilhada."""
+        return {nome: self.matriz[linha, inicio:fim] for linha, nome in enumerate(CAMPOS_ENTRADA)}
+
+    def fechar(self):
+        self.matriz = None
+        self.memoria.close()
+        if self.dono:
+            self.memoria.unlink()
+
+
+_COMPARTILHADAS = None
+_FUNCAO = None
+
+
+def _iniciar_processo(descritor, funcao):
+    global _COMPARTILHADAS, _FUNCAO
+    _COMPARTILHADAS = ColunasCompartilhadas.anexar(descritor)
+    _FUNCAO = _resolver_funcao(funcao)
+
+
+def _calcular_bloco(indice, inicio, fim, saida, formato, colunas):
+    """Executado nos processos do nó: calcula um bloco, grava e devolve o resumo."""
+    resultados = _FUNCAO(_COMPARTILHADAS.colunas(inicio, fim))
+    gravadas = gravar_bloco(saida, indice, resultados, formato, colunas)
+    return resumir_bloco(gravadas, inicio)
+
+
+# ---------------------------------------------------------------------- coordenador
+
+class Coordenador:
+    """
+    Fila de blocos com retentativas, roubo de trabalho e agregação dos resumos.
+    """
+    def __init__(self, armazem: str, saida: str, tamanho_bloco: int = 100000, host: str = '127.0.0.1',
+                 porta: int = 8766, formato: str = 'npy', colunas=None, funcao: str = FUNCAO_PADRAO,
+                 tentativas: int = 3, prazo: float = 600.0):
+        """
+        :param armazem: diretório do ArmazemCasos
+        :param saida: diretório de resultados (GravadorResultados)
+        :param tamanho_bloco: casos por bloco
+        :param colunas: resultados a gravar (padrão: todos)
+        :param funcao: 'modulo:nome' da função colunas → resultados executada nos nós
+        :param tentativas: número máximo de execuções de um bloco que falha
+        :param prazo: segundos após os quais um bloco em andamento é considerado perdido
+        """
+        self.armazem = armazem
+        self.gravador = GravadorResultados(saida, formato, colunas)
+        self.gravador.verificar_tamanho_bloco(tamanho_bloco)
+        self.tamanho_bloco = tamanho_bloco
+        self.host = host
+        self.porta = porta
+        self.colunas = colunas
+        self.funcao = funcao
+        self.tentativas = tentativas
+        self.prazo = prazo
+
+        quantidade = len(ArmazemCasos.abrir(armazem))
+        self.blocos = {
+            indice: (inicio, min(inicio + tamanho_bloco, quantidade))
+            for indice, inicio in enumerate(range(0, quantidade, tamanho_bloco))
+        }
+        self.fila = deque(i for i in self.blocos if not self.gravador.concluido(i))
+        self.em_andamento = {}   # indice → {no: instante}
+        self.falhas = {}         # indice → número de falhas
+        self.perdidos = {}       # indice → última mensagem de erro (esgotou as tentativas)
+        self.nos = {}
+        self.conexoes = 0
+        self.concluido = asyncio.Event()
+        self._servidor = None
+        if not self.fila:
+            self.concluido.set()
+
+    # ---------------------------------------------------------------- estado
+
+    def estado(self) -> dict:
+        return {
+            'blocos': len(self.blocos),
+            'concluidos': len(self.gravador.blocos_concluidos),
+            'na_fila': len(self.fila),
+            'em_andamento': len(self.em_andamento),
+            'perdidos': self.perdidos,
+            'nos': dict(self.nos),
+        }
+
+    def _verificar_fim(self):
+        if not self.fila and not self.em_andamento:
+            self.concluido.set()
+
+    def _devolver(self, indice):
+        if indice not in self.em_andamento and not self.gravador.concluido(indice) and indice not in self.perdidos:
+            self.fila.appendleft(indice)
+
+    def _distribuir(self, no, quantidade):
+        agora = time.monotonic()
+        # blocos perdidos por prazo voltam para a fila
+        for indice, concessoes in list(self.em_andamento.items()):
+            for outro, instante in list(concessoes.items()):
+                if agora - instante > self.prazo:
+                    del concessoes[outro]
+            if not concessoes:
+                del self.em_andamento[indice]
+                self._devolver(indice)
+
+        entregues = []
+        while self.fila and len(entregues) < quantidade:
+            indice = self.fila.popleft()
+            if self.gravador.concluido(indice):
+                continue
+            self.em_andamento[indice] = {no: agora}
+            entregues.append(indice)
+
+        if not entregues:
+            # roubo de trabalho: cópia do bloco mais antigo em andamento em outro nó
+            candidatos = sorted(
+                (min(concessoes.values()), indice) for indice, concessoes in self.em_andamento.items()
+                if len(concessoes) == 1 and no not in concessoes
+            )
+            for _, indice in candidatos[:quantidade]:
+                self.em_andamento[indice][no] = agora
+                self.nos[no]['roubados'] += 1
+                entregues.append(indice)
+        return [[indice, *self.blocos[indice]] for indice in entregues]
+
+    # ---------------------------------------------------------------- mensagens
+
+    def _tratar(self, no, mensagem):
+        tipo = mensagem.get('tipo')
+        if tipo == 'registrar':
+            return {
+                'tipo': 'configuracao', 'armazem': self.armazem, 'saida': self.gravador.diretorio,
+                'formato': self.gravador.formato, 'colunas': self.colunas, 'funcao': self.funcao,
+            }
+        if tipo == 'pedir':
+            blocos = self._distribuir(no, int(mensagem.get('quantidade', 1)))
+            if blocos:
+                return {'tipo': 'blocos', 'blocos': blocos}
+            if self.concluido.is_set():
+                return {'tipo': 'fim'}
+            return {'tipo': 'aguardar', 'segundos': 0.2}
+        if tipo == 'resultado':
+            indice = int(mensagem['indice'])
+            inicio, fim = self.blocos[indice]
+            self.em_andamento.pop(indice, None)
+            if not self.gravador.concluido(indice):
+                self.gravador.registrar(indice, inicio, fim, mensagem['resumo'])
+                self.nos[no]['blocos'] += 1
+            self._verificar_fim()
+            return {'tipo': 'ok'}
+        if tipo == 'falha':
+            indice = int(mensagem['indice'])
+            concessoes = self.em_andamento.get(indice, {})
+            concessoes.pop(no, None)
+            if not concessoes:
+                self.em_andamento.pop(indice, None)
+                self.falhas[indice] = self.falhas.get(indice, 0) + 1
+                if self.falhas[indice] >= self.tentativas:
+                    self.perdidos[indice] = mensagem.get('erro', '')
+                else:
+                    self._devolver(indice)
+            self._verificar_fim()
+            return {'tipo': 'ok'}
+        if tipo == 'estado':
+            return {'tipo': 'estado', **self.estado()}
+        return {'tipo': 'erro', 'mensagem': f"Mensagem desconhecida: {tipo}"}
+
+    async def _atender(self, leitor, escritor):
+        no = None
+        self.conexoes += 1
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                mensagem = json.loads(linha)
+                if no is None:
+                    no = mensagem.get('no') or uuid.uuid4().hex[:8]
+                    self.nos.setdefault(no, {'blocos': 0, 'roubados': 0})
+                resposta = self._tratar(no, mensagem)
+                escritor.write(json.dumps(resposta).encode('utf-8') + b'\n')
+                await escritor.drain()
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            # blocos do nó desconectado voltam para a fila
+            for indice, concessoes in list(self.em_andamento.items()):
+                if concessoes.pop(no, None) is not None and not concessoes:
+                    del self.em_andamento[indice]
+                    self._devolver(indice)
+            self._verificar_fim()
+            self.conexoes -= 1
+            escritor.close()
+
+    async def iniciar(self):
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def executar(self, espera_nos: float = 30.0) -> dict:
+        """
+        Atende os nós até todos os blocos estarem concluídos (ou perdidos).
+
+        :param espera_nos: segundos de espera, após o fim, para os nós receberem 'fim' e desconectarem
+        :return: resumo do GravadorResultados, com os blocos perdidos em 'perdidos'
+        """
+        if self._servidor is None:
+            await self.iniciar()
+        await self.concluido.wait()
+        limite = time.monotonic() + espera_nos
+        while self.conexoes and time.monotonic() < limite:
+            await asyncio.sleep(0.05)
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        return dict(self.gravador.resumo(), perdidos=self.perdidos, nos=self.nos)
+
+
+# ---------------------------------------------------------------------- nó de trabalho
+
+class NoTrabalho:
+    """
+    Nó de trabalho: memória compartilhada com as colunas e um pool de processos.
+    """
+    def __init__(self, host: str = '127.0.0.1', porta: int = 8766, processos: int = None, nome: str = None):
+        self.host = host
+        self.porta = porta
+        self.processos = processos or os.cpu_count() or 1
+        self.nome = nome or f'{socket.gethostname()}-{os.getpid()}'
+
+    def _enviar(self, arquivo, mensagem):
+        arquivo.write(json.dumps(dict(mensagem, no=self.nome)).encode('utf-8') + b'\n')
+        arquivo.flush()
+        linha = arquivo.readline()
+        if not linha:
+            raise ConnectionError("Conexão encerrada pelo coordenador.")
+        return json.loads(linha)
+
+    def executar(self) -> int:
+        """
+        Processa blocos até o coordenador indicar o fim.
+
+        :return: número de blocos calculados por este nó
+        """
+        with socket.create_connection((self.host, self.porta)) as conexao, conexao.makefile('rwb') as arquivo:
+            configuracao = self._enviar(arquivo, {'tipo': 'registrar'})
+            armazem = ArmazemCasos.abrir(configuracao['armazem'])
+            compartilhadas = ColunasCompartilhadas.de_armazem(armazem)
+            calculados = 0
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=self.processos, initializer=_iniciar_processo,
+                    initargs=(compartilhadas.descritor, configuracao['funcao']),
+                ) as executor:
+                    pendentes = {}
+                    terminou = False
+                    while True:
+                        livres = self.processos - len(pendentes)
+                        if livres > 0 and not terminou:
+                            resposta = self._enviar(arquivo, {'tipo': 'pedir', 'quantidade': livres})
+                            if resposta['tipo'] == 'blocos':
+                                for indice, inicio, fim in resposta['blocos']:
+                                    futuro = executor.submit(
+                                        _calcular_bloco, indice, inicio, fim, configuracao['saida'],
+                                        configuracao['formato'], configuracao['colunas']
+                                    )
+                                    pendentes[futuro] = indice
+                            elif resposta['tipo'] == 'fim':
+                                terminou = True
+                            elif not pendentes:
+                                time.sleep(resposta.get('segundos', 0.2))
+                                continue
+                        if not pendentes:
+                            if terminou:
+                                break
+                            continue
+
+                        feitos, _ = wait(pendentes, timeout=0.5, return_when=FIRST_COMPLETED)
+                        for futuro in feitos:
+                            indice = pendentes.pop(futuro)
+                            try:
+                                resumo = futuro.result()
+                            except Exception as e:
+                                self._enviar(arquivo, {'tipo': 'falha', 'indice': indice, 'erro': repr(e)})
+                            else:
+                                self._enviar(arquivo, {'tipo': 'resultado', 'indice': indice, 'resumo': resumo})
+                                calculados += 1
+            finally:
+                compartilhadas.fechar()
+        return calculados
+
+
+def _executar_no(host, porta, processos, nome):
+    NoTrabalho(host, porta, processos, nome).executar()
+
+
+def executar_local(armazem: str, saida: str, nos: int = 2, processos_por_no: int = 2,
+                   tamanho_bloco: int = 100000, **opcoes) -> dict:
+    """
+    Executa uma varredura com o coordenador e `nos` nós na máquina local
+    (cada nó em um processo próprio, com seu pool de `processos_por_no`).
+
+    :param opcoes: demais parâmetros de Coordenador (formato, colunas, funcao, tentativas, prazo)
+    :return: resumo do Coordenador.executar()
+    """
+    async def principal():
+        coordenador = Coordenador(armazem, saida, tamanho_bloco, porta=0, **opcoes)
+        if coordenador.concluido.is_set():
+            # todos os blocos já concluídos em execução anterior: nenhum nó é necessário
+            return await coordenador.executar(espera_nos=0)
+        await coordenador.iniciar()
+        contexto = multiprocessing.get_context('spawn')
+        processos = [
+            contexto.Process(target=_executar_no, args=('127.0.0.1', coordenador.porta, processos_por_no, f'no{i}'))
+            for i in range(nos)
+        ]
+        for processo in processos:
+            processo.start()
+        resumo = await coordenador.executar()
+        await asyncio.get_running_loop().run_in_executor(None, lambda: [p.join() for p in processos])
+        return resumo
+
+    return asyncio.run(principal())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Execução distribuída de varreduras de casos.")
+    subparsers = parser.add_subparsers(dest='papel', required=True)
+
+    coord = subparsers.add_parser('coordenador', help="distribui os blocos e agrega os resultados")
+    coord.add_argument('--armazem', required=True, help="diretório do ArmazemCasos")
+    coord.add_argument('--saida', required=True, help="diretório de resultados")
+    coord.add_argument('--host', default='0.0.0.0')
+    coord.add_argument('--porta', type=int, default=8766)
+    coord.add_argument('--tamanho-bloco', type=int, default=100000)
+    coord.add_argument('--formato', choices=('npy', 'npz'), default='npy')
+    coord.add_argument('--colunas', nargs='*', help="resultados a gravar (padrão: todos)")
+    coord.add_argument('--funcao', default=FUNCAO_PADRAO, help="modulo:nome da função de cálculo")
+    coord.add_argument('--tentativas', type=int, default=3)
+
+    no = subparsers.add_parser('no', help="nó de trabalho")
+    no.add_argument('--host', default='127.0.0.1')
+    no.add_argument('--porta', type=int, default=8766)
+    no.add_argument('--processos', type=int, default=None)
+    no.add_argument('--nome', default=None)
+
+    args = parser.parse_args(argv)
+    if args.papel == 'coordenador':
+        coordenador = Coordenador(
+            args.armazem, args.saida, args.tamanho_bloco, args.host, args.porta, args.formato,
+            args.colunas, args.funcao, args.tentativas
+        )
+        resumo = asyncio.run(coordenador.executar())
+        print(json.dumps({'casos': resumo['casos'], 'verificacoes': resumo['verificacoes'],
+                          'perdidos': resumo['perdidos'], 'nos': resumo['nos']}, indent=2, ensure_ascii=False))
+    else:
+        calculados = NoTrabalho(args.host, args.porta, args.processos, args.nome).executar()
+        print(f"{calculados} blocos calculados.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# fronteira_adaptativa.py
+
+"""
+Fronteira entre projetos que atendem e que não atendem, por refinamento adaptativo.
+
+Em vez de uma grade uniforme fina, começa por uma grade grossa sobre 2 a 4
+variáveis de projeto e subdivide (em 2^d subcélulas) apenas as células em
+que alguma verificação de VERIFICACOES muda de "OK" para "NÃO ATENDE" entre
+os vértices. O processo se repete até o passo da grade fina, de modo que só
+a vizinhança da fronteira é avaliada na resolução pedida.
+
+Os pontos ficam em uma rede inteira (a grade fina); cada ponto é avaliado
+uma única vez e todos os pontos novos de um nível são calculados de uma vez
+pelo núcleo numpy de grafo_formulas, apenas com as utilizações.
+
+Limitação inerente: uma região que entra e sai de uma célula da grade
+inicial sem mudar o estado de nenhum vértice não é detectada; a grade
+inicial deve ser fina o bastante para as variações esperadas.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from grafo_formulas import compilar, VERIFICACOES
+
+_SAIDAS = tuple(f'{prefixo}_{nome}' for nome in VERIFICACOES for prefixo in ('utilizacao', 'atende'))
+
+
+def _avaliar(base, nomes, coordenadas):
+    """Atende e utilização (m, verificações) nos pontos (m, d) em coordenadas físicas."""
+    valores = dict(base)
+    for j, nome in enumerate(nomes):
+        valores[nome] = coordenadas[:, j]
+    valores.setdefault('altura_liquido', valores['altura'])
+    valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+    r = compilar(_SAIDAS, 'numpy').calcular(valores)
+    m = len(coordenadas)
+    atende = np.stack([np.broadcast_to(r[f'atende_{nome}'], (m,)) for nome in VERIFICACOES], axis=1)
+    utilizacao = np.stack([np.broadcast_to(r[f'utilizacao_{nome}'], (m,)) for nome in VERIFICACOES], axis=1)
+    return atende.astype(bool), utilizacao
+
+
+def fronteira_adaptativa(base: dict, variaveis: dict, resolucao=None, niveis: int = 5,
+                         pontos_iniciais: int = 9) -> dict:
+    """
+    Mapeia a fronteira de viabilidade no espaço das variáveis de projeto.
+
+    :param base: entradas fixas (chaves de motor_vetorizado.CAMPOS_ENTRADA, escalares)
+    :param variaveis: nome da entrada → (mínimo, máximo)
+    :param resolucao: lado máximo das células da fronteira, por variável (dicionário) ou
+                      igual para todas; se informado, define o número de níveis
+    :param niveis: subdivisões sucessivas da grade inicial (se resolucao não for informada)
+    :param pontos_iniciais: pontos da grade inicial em cada variável
+    :return: dicionário com:
+             - 'pontos' (m, d), 'atende' (m,), 'verificacoes' {nome: atende (m,)} e
+               'utilizacao_maxima' (m,) dos pontos avaliados;
+             - 'fronteira': 'centros' (c, d) e 'governante' (c,) das células da grade fina
+               em que a viabilidade muda, com a verificação que muda nelas (a de maior
+               utilização, se mais de uma);
+             - 'resolucao' (lado das células finas por variável), 'avaliacoes' e
+               'avaliacoes_grade_uniforme' (pontos da grade fina equivalente)
+    """
+    nomes = list(variaveis)
+    d = len(nomes)
+    minimos = np.array([float(variaveis[nome][0]) for nome in nomes])
+    maximos = np.array([float(variaveis[nome][1]) for nome in nomes])
+    if resolucao is not None:
+        alvo = np.array([resolucao[nome] if isinstance(resolucao, dict) else resolucao for nome in nomes], dtype=float)
+        passos = (maximos - minimos) / (pontos_iniciais - 1) / alvo
+        niveis = max(0, int(math.ceil(math.log2(max(passos.max(), 1.0)))))
+    passo = 2 ** niveis
+    forma_fina = np.full(d, (pontos_iniciais - 1) * passo + 1)
+    escala = (maximos - minimos) / (forma_fina - 1)
+    cantos = np.array(list(itertools.product((0, 1), repeat=d)), dtype=np.int64)
+
+    indices = np.empty(0, dtype=np.int64)          # índices (ordenados) dos pontos avaliados
+    atende = np.empty((0, len(VERIFICACOES)), dtype=bool)
+    utilizacao = np.empty((0, len(VERIFICACOES)))
+
+    def consultar(pontos):
+        nonlocal indices, atende, utilizacao
+        chaves = np.ravel_multi_index(pontos.T, forma_fina)
+        novos = np.setdiff1d(chaves, indices)
+        if novos.size:
+            coordenadas = minimos + np.stack(np.unravel_index(novos, forma_fina), axis=1) * escala
+            a, u = _avaliar(base, nomes, coordenadas)
+            indices = np.concatenate([indices, novos])
+            ordem = np.argsort(indices, kind='stable')
+            indices = indices[ordem]
+            atende = np.concatenate([atende, a])[ordem]
+            utilizacao = np.concatenate([utilizacao, u])[ordem]
+        posicao = np.searchsorted(indices, chaves)
+        return atende[posicao], utilizacao[posicao]
+
+    # células da grade inicial (vértice inferior)
+    celulas = np.stack(np.meshgrid(*[np.arange(0, pontos_iniciais - 1) * passo] * d, indexing='ij'),
+                       axis=-1).reshape(-1, d)
+    while len(celulas):
+        vertices = (celulas[:, None, :] + passo * cantos[None, :, :]).reshape(-1, d)
+        a, u = consultar(vertices)
+        a = a.reshape(len(celulas), len(cantos), -1)
+        mudam = a.any(axis=1) & ~a.all(axis=1)      # (células, verificações)
+        if passo == 1:
+            break
+        mistas = celulas[mudam.any(axis=1)]
+        passo //= 2
+        celulas = (mistas[:, None, :] + passo * cantos[None, :, :]).reshape(-1, d)
+
+    # fronteira de viabilidade na grade fina (nenhuma célula se todo o domínio atende ou não atende)
+    if len(celulas):
+        viavel = a.all(axis=2)
+        na_fronteira = viavel.any(axis=1) & ~viavel.all(axis=1)
+        u = u.reshape(len(celulas), len(cantos), -1)[na_fronteira]
+        candidatas = np.where(mudam[na_fronteira][:, None, :], np.nan_to_num(u, nan=-np.inf), -np.inf)
+        governante = np.array(list(VERIFICACOES), dtype=object)[candidatas.max(axis=1).argmax(axis=1)]
+        celulas = celulas[na_fronteira]
+    else:
+        governante = np.empty(0, dtype=object)
+
+    pontos = minimos + np.stack(np.unravel_index(indices, forma_fina), axis=1) * escala
+    return {
+        'variaveis': nomes,
+        'pontos': pontos,
+        'atende': atende.all(axis=1),
+        'verificacoes': {nome: atende[:, k] for k, nome in enumerate(VERIFICACOES)},
+        'utilizacao_maxima': np.nan_to_num(utilizacao, nan=-np.inf).max(axis=1),
+        'fronteira': {
+            'centros': minimos + (celulas + 0.5) * escala,
+            'governante': governante,
+        },
+        'resolucao': dict(zip(nomes, escala)),
+        'avaliacoes': int(indices.size),
+        'avaliacoes_grade_uniforme': int(np.prod(forma_fina)),
+    }
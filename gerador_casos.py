@@ -0,0 +1,112 @@
+# gerador_casos.py
+
+import math
+import random
+
+from dados_entrada import EntradaDados
+
+# Faixas de variação em torno do caso de referência (dados_MC-31PE-6251.json)
+FAIXAS = {
+    'diametro': (6.0, 40.0),             # m
+    'relacao_altura_diametro': (0.4, 1.6),
+    'altura': (6.0, 20.0),               # m
+    'folga_base': (0.20, 0.35),          # m, (diametro_base - diametro) / 2
+    'altura_base': (0.6, 1.2),           # m
+    'lado': (0.20, 0.50),                # m
+    'h1': (0.3, 0.6),                    # m
+    'h2': (0.4, 0.7),                    # m
+    'h3': (0.0, 0.2),                    # m
+    'peso_por_area': (0.6, 0.9),         # kN/m² de chapa (costado, fundo e teto)
+    'densidade_fluido': (7.5, 10.5),     # kN/m³
+    'tensao_adm_kgfcm2': (1.0, 3.0),
+    'k_reac': (5000.0, 40000.0),         # kN/m³
+    'Esolo': (10000.0, 60000.0),         # kN/m²
+    'poisson': (0.25, 0.45),
+    'vento_v0': (30.0, 50.0),            # m/s (isopletas da NBR 6123)
+    'vento_s1': (0.9, 1.1),
+    'vento_s2': (0.80, 1.05),
+    'vento_s3': (0.95, 1.10),
+}
+
+TIPOS_SOLO = ('argila compactada', 'areia compactada', 'aterro compactado', 'silte argiloso')
+
+
+def gerar_caso(rng: random.Random) -> dict:
+    """
+    Gera um caso sintético no mesmo formato do arquivo JSON de entrada.
+
+    :param rng: gerador de números aleatórios (random.Random)
+    :return: dicionário com geometria, solo, cargas e dados_tanque
+    """
+    def sortear(chave, casas=3):
+        minimo, maximo = FAIXAS[chave]
+        return round(rng.uniform(minimo, maximo), casas)
+
+    diametro = sortear('diametro')
+    altura_min, altura_max = FAIXAS['altura']
+    altura = diametro * sortear('relacao_altura_diametro')
+    altura = round(min(max(altura, altura_min), altura_max), 3)
+    diametro_base = round(diametro + 2 * sortear('folga_base'), 3)
+
+    area_chapas = math.pi * diametro * altura + math.pi * diametro ** 2 / 2
+    ptv = round(sortear('peso_por_area') * area_chapas, 1)
+
+    tipo = rng.choice(TIPOS_SOLO)
+    vento = {chave: sortear(chave, 2) for chave in ('vento_v0', 'vento_s1', 'vento_s2', 'vento_s3')}
+
+    geometria = {
+        'altura': altura,
+        'diametro': diametro,
+        'diametro_base': diametro_base,
+        'altura_base': sortear('altura_base', 2),
+        'lado_a_m': sortear('lado', 2),
+        'lado_b_m': sortear('lado', 2),
+        'h1': sortear('h1', 2),
+        'h2': sortear('h2', 2),
+        'h3': sortear('h3', 2),
+        'fck': 30.0,
+        'gamma': 25.0,
+        'E_conc': 30672.46,
+        'fyk': 500.0,
+        'E_aco': 200000.0,
+        'tipo': tipo,
+        'peso_tanque_vazio': ptv,
+    }
+    geometria.update(vento)
+
+    return {
+        'geometria': geometria,
+        'solo': {
+            'tipo': tipo,
+            'tensao_adm_kgfcm2': sortear('tensao_adm_kgfcm2', 2),
+            'k_reac': sortear('k_reac', 0),
+            'Esolo': sortear('Esolo', 0),
+            'poisson': sortear('poisson', 2),
+        },
+        'cargas': dict(vento, pressao_interna=0.0),
+        'dados_tanque': {
+            'PTV': ptv,
+            'dens_fluido': sortear('densidade_fluido', 2),
+        },
+    }
+
+
+def gerar_casos(quantidade: int, semente: int = 0) -> list:
+    """
+    Gera uma população reprodutível de casos sintéticos de tanques.
+
+    :param quantidade: número de casos
+    :param semente: semente do gerador; a mesma semente gera os mesmos casos
+    :return: lista de dicionários no formato do arquivo JSON de entrada
+    """
+    rng = random.Random(semente)
+    return [gerar_caso(rng) for _ in range(quantidade)]
+
+
+def caso_para_entrada(caso: dict) -> EntradaDados:
+    """
+    Converte um caso gerado em uma instância de EntradaDados.
+    """
+    entrada = EntradaDados()
+    entrada.definir_dados(caso)
+    return entrada
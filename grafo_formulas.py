@@ -0,0 +1,476 @@
+# grafo_formulas.py
+
+"""
+Grafo declarativo das fórmulas do dimensionamento da base do tanque.
+
+Cada grandeza (p1…p8, ϕ, WA, MT, MF, E2, Tc, y/d, ρ, As…) é definida uma
+única vez como uma expressão Python sobre as entradas (CAMPOS_ENTRADA de
+motor_vetorizado, mais 'altura_liquido' e 'densidade_liquido'), as
+constantes e as demais grandezas. A partir do grafo:
+
+  - compilar(saidas) gera uma função em linha reta, só com variáveis locais,
+    que calcula exatamente as grandezas necessárias para as saídas pedidas
+    (em ordem topológica, cada uma uma única vez). As funções geradas ficam em
+    cache por conjunto de saídas. Há dois modos: 'escalar' (floats, com as
+    condições avaliadas de forma preguiçosa) e 'numpy' (arrays, com broadcasting);
+  - expressao(nome, valores) escreve a linha de memorial "p1 = ρT · h = 18.0 · 0.4 = 7.2 kN/m²".
+
+Funções disponíveis nas expressões: onde(condição, a, b), div(a, b) (a/b, ou 0
+quando b == 0), raiz(x), minimo(a, b) e maximo(a, b).
+"""
+
+import ast
+from functools import lru_cache
+import math
+import re
+
+import numpy as np
+
+RHO_T = 18.0   # peso específico do solo compactado (kN/m³)
+RHO_H = 16.0   # kN/m³
+K0 = 0.5       # coeficiente de empuxo em repouso
+CA = 0.5       # coeficiente de arrasto
+TAN_35 = math.tan(math.radians(35))
+RHO_MIN = 0.0015  # taxa de armadura mínima (NBR 6118)
+
+CONSTANTES = {
+    'RHO_T': RHO_T,
+    'RHO_H': RHO_H,
+    'K0': K0,
+    'CA': CA,
+    'TAN_35': TAN_35,
+    'RHO_MIN': RHO_MIN,
+    'PI_APROX': 3.1416,
+    'pi': math.pi,
+    'inf': math.inf,
+    'nan': math.nan,
+}
+
+ENTRADAS = (
+    'altura', 'diametro', 'diametro_base', 'altura_base', 'lado_a_m', 'lado_b_m',
+    'h1', 'h2', 'h3', 'densidade_fluido', 'peso_tanque_vazio',
+    'vento_v0', 'vento_s1', 'vento_s2', 'vento_s3',
+    'tensao_admissivel', 'Esolo', 'poisson', 'fck', 'fyk', 'gamma_concreto',
+    'altura_liquido', 'densidade_liquido',
+)
+
+# Símbolos usados no memorial
+SIMBOLOS = {
+    'RHO_T': 'ρT', 'RHO_H': 'ρh', 'K0': 'k0', 'CA': 'Ca', 'TAN_35': 'tan(35°)', 'PI_APROX': 'π', 'pi': 'π', 'RHO_MIN': 'ρmin',
+    'altura': 'hT', 'diametro': 'dT', 'diametro_base': 'ØB', 'altura_base': 'h',
+    'lado_a_m': 'b1', 'lado_b_m': 'b2', 'densidade_fluido': 'ρL', 'peso_tanque_vazio': 'PTV',
+    'vento_v0': 'V0', 'vento_s1': 'S1', 'vento_s2': 'S2', 'vento_s3': 'S3',
+    'tensao_admissivel': 'τ_adm', 'Esolo': 'E', 'poisson': 'ν', 'gamma_concreto': 'γc',
+    'altura_liquido': 'hT', 'densidade_liquido': 'ρL',
+    'phi': 'ϕ', 'q_vento': 'q', 'p_total': 'p', 'y_d': 'y/d',
+}
+
+# Verificações com critério de aceitação: nome → (solicitação, resistência); atende se solicitação <= resistência
+VERIFICACOES = {
+    'tensao_solo': ('p_total', 'tensao_admissivel'),
+    'arrancamento': ('Ta', 'resistencia_arrancamento'),
+    'pressao_apoio_adm': ('sigma_cmax', 'tensao_admissivel'),
+    'pressao_apoio_fcd': ('sigma_cmax', 'fcd'),
+}
+
+
+class Formula:
+    """
+    Uma grandeza do grafo.
+
+    :param nome: identificador da grandeza
+    :param expressao: expressão Python sobre entradas, constantes e grandezas anteriores
+    :param unidade: unidade exibida no memorial
+    :param casas: casas decimais do valor exibido no memorial (None = sem arredondar)
+    :param simbolos: símbolos específicos desta fórmula no memorial (ex.: {'h1': 'h'})
+    """
+    def __init__(self, nome, expressao, unidade='', casas=None, simbolos=None):
+        self.nome = nome
+        self.expressao = expressao
+        self.unidade = unidade
+        self.casas = casas
+        self.simbolos = simbolos or {}
+        self.arvore = ast.parse(expressao, mode='eval').body
+        self.referencias = tuple(dict.fromkeys(
+            no.id for no in ast.walk(self.arvore) if isinstance(no, ast.Name)
+        ))
+
+
+def _formulas():
+    f = Formula
+    lista = [
+        f('b', 'lado_a_m + lado_b_m', 'm'),
+
+        # Cargas: vento (NBR 6123), peso próprio e fluido
+        f('Vk', 'vento_v0 * vento_s1 * vento_s2 * vento_s3', 'm/s'),
+        f('q_vento', 'Vk ** 2 / 16 * 0.00980665', 'kN/m²'),
+        f('Fv', 'CA * q_vento * diametro * altura', 'kN'),
+        f('Mvf', '((altura + h1) / 2 + h2 + h3) * Fv', 'kN·m'),
+        f('Mvt', 'altura / 2 * Fv', 'kN·m'),
+        f('area_tanque', 'PI_APROX * (diametro / 2) ** 2', 'm²'),
+        f('peso_proprio', 'area_tanque * altura * gamma_concreto', 'kN'),
+        f('carga_fluido', 'area_tanque * altura_liquido * densidade_liquido', 'kN'),
+        f('esforco_vertical', 'peso_proprio + carga_fluido', 'kN'),
+
+        # Estabilidade e dimensionar()
+        f('fator_seguranca', 'onde(Mvt != 0, div(peso_proprio * diametro / 2, Mvt), inf)'),
+        f('area_minima_base', 'esforco_vertical / tensao_admissivel', 'm²'),
+        f('diametro_base_sugerido', '(4 * area_minima_base / PI_APROX) ** 0.5', 'm'),
+
+        # Tensão no solo compactado
+        f('p1', 'RHO_T * h1', 'kN/m²', 2, {'h1': 'h'}),
+        f('p2', 'densidade_liquido * altura_liquido', 'kN/m²', 2),
+        f('p3', 'RHO_H * (h2 + h3)', 'kN/m²', 2),
+        f('p_total', 'p1 + p2 - p3', 'kN/m²', 2),
+
+        # Espessura do anel
+        f('phi', 'onde(diametro > 0, div(peso_tanque_vazio, pi * diametro), 0.0)', 'kN/m', 3),
+        f('p4', 'p2 / 2', 'kN/m²', 2),
+        f('p5', 'gamma_concreto * altura_base', 'kN/m²', 2),
+        f('p6', 'p1 + p2 - p4 - p5', 'kN/m²', 2),
+        f('b_calc', 'onde(phi > 0, phi / p6, 0.0)', 'm', 3),
+
+        # Resistência e tensões sobre o anel
+        f('valido', 'diametro_base > 1'),
+        f('Ø', 'onde(valido, diametro_base - 1, 0.0)', 'm', 3),
+        f('WA', 'onde(valido, pi / 32 * ((diametro_base ** 4 - Ø ** 4) / diametro_base), 0.0)', 'm³', 6),
+        f('p7', 'onde(b > 0, div(phi, b), 0.0)', 'kN/m²', 2),
+        f('p8', 'onde(WA > 0, div(Mvf, WA), 0.0)', 'kN/m²', 2),
+        f('P_anel', 'p4 + p5 + p7 + p8', 'kN/m²', 2),
+
+        # Arrancamento
+        f('Pg', 'gamma_concreto * b * altura_base', 'kN/m', 2),
+        f('ps1', 'RHO_T * K0 * altura_base', 'kN/m²', 2),
+        f('E1', 'ps1 * altura_base / 2', 'kN/m', 2),
+        f('Pf', 'E1 * TAN_35', 'kN/m', 2),
+        f('area_base', 'pi * diametro ** 2 / 4', 'm²'),
+        f('termo_Mvt', 'div(Mvt, area_base)', 'kN/m'),
+        f('Ta', 'onde(diametro > 0, phi - termo_Mvt, 0.0)', 'kN/m', 2),
+        f('resistencia_arrancamento', 'Pg + Pf + phi', 'kN/m', 2),
+
+        # Pressão máxima de apoio
+        f('numerador_apoio', 'phi + termo_Mvt', 'kN/m', 2),
+        f('sigma_cmax', 'numerador_apoio / lado_a_m', 'kN/m²', 2),
+        f('fcd', 'fck / 1.4 * 1000', 'kN/m²', 2),
+
+        # Esforços solicitantes
+        f('termo1', 'onde((b > 0) & (lado_b_m > 0), densidade_liquido * altura_liquido * lado_b_m * (b / 2 - lado_b_m / 2), 0.0)', 'kN·m/m'),
+        f('termo2', 'onde((b > 0) & (lado_a_m > 0), phi * (b / 2 - lado_a_m), 0.0)', 'kN·m/m'),
+        f('MT', 'termo1 - termo2', 'kN·m/m', 3),
+        f('MF', 'MT * (Ø + b) / 2', 'kN·m', 3),
+        f('qi', 'onde(valido & (lado_b_m > 0), div(peso_tanque_vazio, pi * (Ø + lado_b_m) * lado_b_m), nan)', 'kN/m²', 3),
+        f('V', 'qi * lado_b_m', 'kN/m', 3),
+
+        # Tração no anel, empuxos e armadura de tração lateral
+        f('h0', 'onde(densidade_liquido > 0, altura_liquido, 0.0)', 'm', 2),
+        f('H', 'altura_base + h0', 'm', 2),
+        f('ps2', 'K0 * RHO_T * h0', 'kN/m²', 2),
+        f('ps3', 'K0 * RHO_T * H', 'kN/m²', 2),
+        f('E2', '(ps2 + ps3) * altura_base / 2', 'kN/m', 2),
+        f('Tc', 'E2 * (Ø + b) / 2', 'kN', 2),
+        f('As_tracao', 'Tc * 1.4 / (fyk / 10)', 'cm²', 2),
+
+        # Linha neutra, taxa e área de armadura de flexão
+        f('fcd_Nm2', 'fck / 1.4 * 1e6', 'N/m²'),
+        f('fyd_Nm2', 'fyk / 1.15 * 1e6', 'N/m²'),
+        f('d', 'altura_base - 0.04', 'm', 2),
+        f('Md', 'MF', 'kN·m', 3),
+        f('lado_esquerdo', 'div(Md * 1000, 0.85 * fcd_Nm2 * b * d ** 2)'),
+        f('discriminante', '1 - 2 * lado_esquerdo'),
+        f('y_d', 'onde((d > 0) & (b > 0), minimo(onde(discriminante >= 0, 1 - raiz(maximo(discriminante, 0.0)), 0.45), 0.45), nan)', '', 4),
+        f('y', 'y_d * d', 'm', 4),
+        f('rho', 'y_d * 0.85 * fcd_Nm2 / fyd_Nm2', '', 6),
+        f('As', 'rho * b * d * 10000', 'cm²', 2),
+        f('As_min', 'RHO_MIN * b * d * 10000', 'cm²', 2),
+
+        # Recalque imediato
+        f('B', 'minimo(lado_a_m, lado_b_m)', 'm'),
+        f('L', 'maximo(lado_a_m, lado_b_m)', 'm'),
+        f('tensao_media', 'esforco_vertical / area_minima_base', 'kN/m²'),
+        f('recalque_mm', '(1 - poisson ** 2) / Esolo * (tensao_media * (B * L) ** 0.5) / 1.10 * 1000', 'mm', 2),
+    ]
+    for nome, (solicitacao, resistencia) in VERIFICACOES.items():
+        lista.append(f(f'utilizacao_{nome}', f'{solicitacao} / {resistencia}', '', 3))
+        lista.append(f(f'atende_{nome}', f'{solicitacao} <= {resistencia}'))
+    return lista
+
+
+GRAFO = {formula.nome: formula for formula in _formulas()}
+
+FUNCOES = ('onde', 'div', 'raiz', 'minimo', 'maximo')
+
+
+def _validar_grafo():
+    definidos = set(ENTRADAS) | set(CONSTANTES) | set(FUNCOES)
+    for formula in GRAFO.values():
+        desconhecidos = [nome for nome in formula.referencias if nome not in definidos]
+        if desconhecidos:
+            raise ValueError(f"Fórmula '{formula.nome}' referencia nomes não definidos antes dela: {desconhecidos}")
+        definidos.add(formula.nome)
+
+
+_validar_grafo()
+
+
+def dependencias(saidas, fixas=()) -> list:
+    """
+    Grandezas do grafo necessárias para calcular as saídas, em ordem topológica.
+
+    :param fixas: grandezas informadas como entradas (nem elas nem suas dependências são calculadas)
+    """
+    necessarias = set()
+    pendentes = [nome for nome in saidas if nome in GRAFO and nome not in fixas]
+    while pendentes:
+        nome = pendentes.pop()
+        if nome in necessarias or nome in fixas:
+            continue
+        necessarias.add(nome)
+        pendentes.extend(ref for ref in GRAFO[nome].referencias if ref in GRAFO)
+    return [nome for nome in GRAFO if nome in necessarias]
+
+
+class _ParaEscalar(ast.NodeTransformer):
+    """onde/div viram expressões condicionais (só o ramo escolhido é avaliado); constantes viram literais."""
+    def visit_Name(self, no):
+        if no.id in CONSTANTES:
+            return ast.copy_location(ast.Constant(CONSTANTES[no.id]), no)
+        return no
+
+    def visit_Call(self, no):
+        self.generic_visit(no)
+        nome = no.func.id
+        if nome == 'onde':
+            condicao, a, b = no.args
+            return ast.copy_location(ast.IfExp(test=condicao, body=a, orelse=b), no)
+        if nome == 'div':
+            a, b = no.args
+            return ast.copy_location(ast.IfExp(
+                test=ast.Compare(left=b, ops=[ast.NotEq()], comparators=[ast.Constant(0)]),
+                body=ast.BinOp(left=a, op=ast.Div(), right=b),
+                orelse=ast.Constant(0.0),
+            ), no)
+        if nome == 'raiz':
+            # x ** 0,5 (e não math.sqrt) preserva os números duais da análise de sensibilidade
+            return ast.copy_location(ast.BinOp(left=no.args[0], op=ast.Pow(), right=ast.Constant(0.5)), no)
+        no.func = ast.Name(id={'minimo': 'min', 'maximo': 'max'}[nome], ctx=ast.Load())
+        return no
+
+
+class _ParaNumpy(ast.NodeTransformer):
+    """Funções do grafo viram funções do NumPy; constantes viram literais."""
+    def visit_Name(self, no):
+        if no.id in CONSTANTES:
+            return ast.copy_location(ast.Constant(CONSTANTES[no.id]), no)
+        return no
+
+    def visit_Call(self, no):
+        self.generic_visit(no)
+        no.func = ast.Name(id='_' + no.func.id, ctx=ast.Load())
+        return no
+
+
+def _div_numpy(a, b):
+    return np.where(b != 0, a / np.where(b != 0, b, 1.0), 0.0)
+
+
+_AMBIENTES = {
+    'escalar': {'inf': math.inf, 'nan': math.nan},
+    'numpy': {
+        '_onde': np.where, '_div': _div_numpy, '_raiz': np.sqrt,
+        '_minimo': np.minimum, '_maximo': np.maximum,
+        '_asarray': np.asarray, '_errstate': np.errstate,
+    },
+}
+
+
+class Nucleo:
+    """
+    Função gerada para um conjunto de saídas.
+
+    Atributos: funcao (a função gerada, argumentos = entradas, retorno = tupla
+    das saídas), entradas, saidas e fonte (código gerado).
+    """
+    def __init__(self, funcao, entradas, saidas, fonte):
+        self.funcao = funcao
+        self.entradas = entradas
+        self.saidas = saidas
+        self.fonte = fonte
+
+    def __call__(self, *args, **kwargs):
+        return self.funcao(*args, **kwargs)
+
+    def calcular(self, valores: dict) -> dict:
+        """
+        Calcula as saídas a partir de um dicionário com (pelo menos) as entradas necessárias.
+        """
+        return dict(zip(self.saidas, self.funcao(*[valores[nome] for nome in self.entradas])))
+
+
+def compilar(saidas, modo: str = 'escalar', fixas=()) -> Nucleo:
+    """
+    Gera (ou recupera do cache) a função que calcula as saídas pedidas.
+
+    :param saidas: nomes das grandezas do grafo (entradas também são aceitas e repassadas)
+    :param modo: 'escalar' ou 'numpy'
+    :param fixas: grandezas do grafo tratadas como entradas: o valor informado substitui a
+                  fórmula (ex.: ('Mvt', 'Mvf') para verificar o anel com outro momento)
+    :return: Nucleo
+    """
+    return _compilar(tuple(saidas), modo, tuple(fixas))
+
+
+@lru_cache(maxsize=256)
+def _compilar(saidas, modo, fixas=()):
+    if modo not in _AMBIENTES:
+        raise ValueError(f"Modo de compilação desconhecido: {modo}")
+    desconhecidas = [nome for nome in saidas + fixas if nome not in GRAFO and nome not in ENTRADAS]
+    if desconhecidas:
+        raise KeyError(f"Grandezas não definidas no grafo: {desconhecidas}")
+
+    ordem = dependencias(saidas, fixas)
+    usadas = {ref for nome in ordem for ref in GRAFO[nome].referencias} | set(saidas)
+    entradas = tuple(nome for nome in ENTRADAS if nome in usadas) + tuple(
+        nome for nome in GRAFO if nome in fixas and nome in usadas)
+    transformador = _ParaEscalar() if modo == 'escalar' else _ParaNumpy()
+
+    linhas = [f"def nucleo({', '.join(entradas)}):"]
+    recuo = '    '
+    if modo == 'numpy':
+        linhas += [f"{recuo}{nome} = _asarray({nome}, dtype=float)" for nome in entradas]
+        linhas.append(f"{recuo}with _errstate(divide='ignore', invalid='ignore'):")
+        recuo = '        '
+    for nome in ordem:
+        arvore = transformador.visit(ast.parse(GRAFO[nome].expressao, mode='eval').body)
+        linhas.append(f"{recuo}{nome} = {ast.unparse(arvore)}")
+    linhas.append(f"{recuo}return ({', '.join(saidas)},)")
+    fonte = '\n'.join(linhas) + '\n'
+
+    ambiente = dict(_AMBIENTES[modo])
+    exec(compile(fonte, f'<grafo_formulas:{modo}:{",".join(saidas)}>', 'exec'), ambiente)
+    return Nucleo(ambiente['nucleo'], entradas, saidas, fonte)
+
+
+def calcular(saidas, valores: dict, modo: str = 'escalar') -> dict:
+    """
+    Atalho para compilar(saidas, modo).calcular(valores).
+    """
+    return compilar(saidas, modo).calcular(valores)
+
+
+class _ParaTexto(ast.NodeTransformer):
+    """Prepara a árvore para o memorial: div(a, b) → a / b e onde(c, a, b) → a."""
+    def visit_Call(self, no):
+        self.generic_visit(no)
+        if no.func.id == 'div':
+            return ast.BinOp(left=no.args[0], op=ast.Div(), right=no.args[1])
+        if no.func.id == 'onde':
+            return no.args[1]
+        return no
+
+
+_SOBRESCRITOS = {'2': '²', '3': '³', '4': '⁴'}
+
+
+def _texto(expressao, substituir) -> str:
+    """Escreve a expressão com · e expoentes sobrescritos, trocando cada nome por substituir(nome)."""
+    arvore = ast.parse(expressao, mode='eval').body
+    nomes = {}
+
+    class _Marcar(ast.NodeTransformer):
+        def visit_Name(self, no):
+            if no.id in FUNCOES:
+                return no
+            marcador = f"_n{len(nomes)}_"
+            nomes[marcador] = no.id
+            return ast.Name(id=marcador, ctx=ast.Load())
+
+    texto = ast.unparse(_Marcar().visit(_ParaTexto().visit(arvore)))
+    texto = texto.replace(' * ', ' · ').replace('raiz(', '√(').replace('minimo(', 'min(').replace('maximo(', 'max(')
+    texto = re.sub(r' \*\* (\d)\b', lambda m: _SOBRESCRITOS.get(m.group(1), '^' + m.group(1)), texto)
+    texto = texto.replace(' ** ', '^')
+    return re.sub(r'_n\d+_', lambda m: substituir(nomes[m.group(0)]), texto)
+
+
+def expressao(nome: str, valores: dict, simbolo: str = None) -> str:
+    """
+    Linha de memorial de uma grandeza: "p1 = ρT · h = 18.0 · 0.4 = 7.2 kN/m²".
+
+    Nas fórmulas com onde(...) é exibido o ramo principal. Grandezas referenciadas que
+    não estiverem em `valores` são calculadas a partir das entradas.
+
+    :param nome: grandeza do grafo
+    :param valores: valores das entradas (e, opcionalmente, das grandezas já calculadas)
+    :param simbolo: símbolo da grandeza (padrão: o do grafo ou o próprio nome)
+    """
+    formula = GRAFO[nome]
+    faltantes = [ref for ref in formula.referencias + (nome,)
+                 if ref in GRAFO and ref not in valores]
+    if faltantes:
+        valores = {**valores, **calcular(tuple(faltantes), valores)}
+
+    def simbolo_de(ref):
+        return formula.simbolos.get(ref) or SIMBOLOS.get(ref, ref)
+
+    def valor_de(ref):
+        # entradas como informadas; grandezas com as casas do memorial; demais com 6 algarismos
+        if ref in CONSTANTES:
+            texto = str(CONSTANTES[ref])
+            return texto if len(texto) <= 8 else f"{CONSTANTES[ref]:.6g}"
+        valor = valores[ref]
+        if ref in GRAFO:
+            if GRAFO[ref].casas is not None:
+                return str(round(valor, GRAFO[ref].casas))
+            return f"{valor:.6g}"
+        return str(valor)
+
+    resultado = valores[nome]
+    if formula.casas is not None:
+        resultado = round(resultado, formula.casas)
+    linha = (f"{simbolo or SIMBOLOS.get(nome, nome)} = {_texto(formula.expressao, simbolo_de)} = "
+             f"{_texto(formula.expressao, valor_de)} = {resultado}")
+    return f"{linha} {formula.unidade}" if formula.unidade else linha
+
+
+class TextoAdiado:
+    """
+    Texto de memorial montado apenas quando é exibido.
+
+    Guarda a função de montagem e os operandos; str(), format() e f-strings montam
+    o texto (uma única vez). Em cálculos em lote, em que o memorial não é lido,
+    nenhuma formatação é feita.
+    """
+    __slots__ = ('_funcao', '_argumentos', '_texto')
+
+    def __init__(self, funcao, *argumentos):
+        self._funcao = funcao
+        self._argumentos = argumentos
+        self._texto = None
+
+    def __str__(self):
+        if self._texto is None:
+            self._texto = self._funcao(*self._argumentos)
+            self._funcao = self._argumentos = None
+        return self._texto
+
+    def __format__(self, especificacao):
+        return format(str(self), especificacao)
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, outro):
+        if isinstance(outro, (str, TextoAdiado)):
+            return str(self) == str(outro)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+def expressao_adiada(nome: str, valores: dict, simbolo: str = None) -> TextoAdiado:
+    """
+    Como expressao(), mas só monta a linha de memorial quando ela for exibida.
+
+    `valores` é guardado por referência: não deve ser alterado depois.
+    """
+    return TextoAdiado(expressao, nome, valores, simbolo)
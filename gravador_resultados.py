@@ -0,0 +1,300 @@
+# gravador_resultados.py
+
+"""
+Gravação incremental (fora da memória) dos resultados de lotes grandes.
+
+Os resultados são gravados por bloco de casos, em colunas:
+  - formato 'npy': um diretório por bloco com um .npy por coluna (leitura mapeada em memória);
+  - formato 'npz': um arquivo comprimido por bloco.
+
+Cada bloco é gravado em um nome temporário e renomeado ao final; em seguida
+o manifesto (manifesto.json) é reescrito de forma atômica com a lista de
+blocos concluídos e o resumo acumulado. Se a execução for interrompida, um
+novo GravadorResultados no mesmo diretório retoma a partir do manifesto e
+os blocos já concluídos não são recalculados.
+
+O resumo é atualizado a cada bloco: para cada coluna numérica, mínimo,
+máximo, média e o caso (índice global) onde ocorrem o mínimo e o máximo;
+para cada verificação, a maior utilização (caso governante) e o número de
+casos que não atendem.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+VERSAO = 1
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+
+def _nome_bloco(indice, formato):
+    return f'bloco_{indice:06d}' + ('.npz' if formato == 'npz' else '')
+
+
+def _descartar(caminho):
+    if os.path.isdir(caminho):
+        shutil.rmtree(caminho, ignore_errors=True)
+    elif os.path.exists(caminho):
+        os.remove(caminho)
+
+
+def gravar_bloco(diretorio: str, indice: int, resultados: dict, formato: str = 'npy', colunas=None) -> dict:
+    """
+    Grava os arquivos de um bloco (sem tocar no manifesto).
+
+    O bloco é gravado com nome temporário e renomeado; se outro processo já tiver
+    gravado o mesmo bloco, a cópia é descartada.
+
+    :return: colunas gravadas (nome → array 1D)
+    """
+    tamanho = max((np.size(v) for v in resultados.values()), default=0)
+    nomes = colunas or list(resultados)
+    colunas = {nome: np.broadcast_to(np.asarray(resultados[nome]), (tamanho,)) for nome in nomes}
+
+    destino = os.path.join(diretorio, _nome_bloco(indice, formato))
+    temporario = f'{destino}.{os.getpid()}.tmp'
+    if formato == 'npz':
+        with open(temporario, 'wb') as f:
+            np.savez_compressed(f, **colunas)
+    else:
+        shutil.rmtree(temporario, ignore_errors=True)
+        os.makedirs(temporario)
+        for nome, valores in colunas.items():
+            np.save(os.path.join(temporario, f'{nome}.npy'), np.ascontiguousarray(valores))
+    if os.path.exists(destino):
+        # bloco já concluído (por outro processo ou em execução anterior): mantém o existente
+        _descartar(temporario)
+        return colunas
+    try:
+        os.replace(temporario, destino)
+    except OSError:
+        # outro processo gravou o mesmo bloco ao mesmo tempo
+        _descartar(temporario)
+    return colunas
+
+
+def resumir_bloco(colunas: dict, inicio: int) -> dict:
+    """
+    Resumo de um bloco: mínimo, máximo, soma e quantidade por coluna numérica
+    (com o índice global do caso) e reprovações por verificação.
+    """
+    resumo = {}
+    for nome, valores in colunas.items():
+        valores = np.asarray(valores)
+        if valores.size == 0 or valores.dtype.kind not in 'fiu':
+            continue
+        validos = np.where(np.isfinite(valores), valores, np.nan) if valores.dtype.kind == 'f' else valores
+        if np.all(np.isnan(validos)):
+            continue
+        i_min, i_max = int(np.nanargmin(validos)), int(np.nanargmax(validos))
+        quantidade = int(np.count_nonzero(~np.isnan(validos)))
+        soma = float(np.nansum(validos))
+        resumo[nome] = {
+            'minimo': float(validos[i_min]), 'caso_minimo': int(inicio) + i_min,
+            'maximo': float(validos[i_max]), 'caso_maximo': int(inicio) + i_max,
+            'soma': soma, 'quantidade': quantidade, 'media': soma / quantidade,
+        }
+
+    verificacoes = {}
+    for nome, valores in colunas.items():
+        if not nome.startswith('atende_'):
+            continue
+        verificacao = nome[len('atende_'):]
+        valores = np.asarray(valores)
+        estado = {'reprovados': int(np.count_nonzero(~valores.astype(bool))), 'avaliados': int(valores.size)}
+        utilizacao = resumo.get(f'utilizacao_{verificacao}')
+        if utilizacao is not None:
+            estado['utilizacao_maxima'] = utilizacao['maximo']
+            estado['caso_governante'] = utilizacao['caso_maximo']
+        verificacoes[verificacao] = estado
+    return {'colunas': resumo, 'verificacoes': verificacoes}
+
+
+def combinar_resumos(a: dict, b: dict) -> dict:
+    """
+    Combina dois resumos de resumir_bloco (de blocos disjuntos).
+    """
+    colunas = {nome: dict(valor) for nome, valor in a['colunas'].items()}
+    for nome, novo in b['colunas'].items():
+        atual = colunas.get(nome)
+        if atual is None:
+            colunas[nome] = dict(novo)
+            continue
+        if novo['minimo'] < atual['minimo']:
+            atual['minimo'], atual['caso_minimo'] = novo['minimo'], novo['caso_minimo']
+        if novo['maximo'] > atual['maximo']:
+            atual['maximo'], atual['caso_maximo'] = novo['maximo'], novo['caso_maximo']
+        atual['soma'] += novo['soma']
+        atual['quantidade'] += novo['quantidade']
+        atual['media'] = atual['soma'] / atual['quantidade']
+
+    verificacoes = {nome: dict(valor) for nome, valor in a['verificacoes'].items()}
+    for nome, novo in b['verificacoes'].items():
+        atual = verificacoes.setdefault(nome, {'reprovados': 0, 'avaliados': 0})
+        atual['reprovados'] += novo['reprovados']
+        atual['avaliados'] += novo['avaliados']
+        if 'utilizacao_maxima' in novo and novo['utilizacao_maxima'] > atual.get('utilizacao_maxima', -np.inf):
+            atual['utilizacao_maxima'] = novo['utilizacao_maxima']
+            atual['caso_governante'] = novo['caso_governante']
+    return {'colunas': colunas, 'verificacoes': verificacoes}
+
+
+class GravadorResultados:
+    """
+    Destino de resultados em blocos com checkpoint e resumo incremental.
+    """
+    def __init__(self, diretorio: str, formato: str = 'npy', colunas=None):
+        """
+        :param diretorio: diretório de saída (criado se não existir; retomado se já tiver manifesto)
+        :param formato: 'npy' (colunas mapeáveis em memória) ou 'npz' (comprimido)
+        :param colunas: nomes das colunas a gravar (padrão: todas as recebidas)
+        """
+        if formato not in ('npy', 'npz'):
+            raise ValueError(f"Formato de gravação desconhecido: {formato}")
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+
+        caminho = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                self.manifesto = json.load(f)
+            if self.manifesto.get('formato') != formato:
+                raise ValueError(
+                    f"O diretório já contém resultados no formato '{self.manifesto.get('formato')}'."
+                )
+        else:
+            self.manifesto = {
+                'versao': VERSAO,
+                'formato': formato,
+                'colunas': list(colunas) if colunas else None,
+                'blocos': {},
+                'resumo': {},
+                'verificacoes': {},
+            }
+        self.formato = formato
+
+    # ------------------------------------------------------------------ estado
+
+    @property
+    def blocos_concluidos(self) -> set:
+        return {int(indice) for indice in self.manifesto['blocos']}
+
+    def concluido(self, indice: int) -> bool:
+        return str(indice) in self.manifesto['blocos']
+
+    @property
+    def casos_gravados(self) -> int:
+        return sum(b['fim'] - b['inicio'] for b in self.manifesto['blocos'].values())
+
+    def verificar_tamanho_bloco(self, tamanho_bloco: int):
+        """
+        Registra o tamanho de bloco da execução ou, ao retomar, confirma que é o mesmo
+        (os índices dos blocos concluídos só valem para o tamanho com que foram gravados).
+        """
+        if self.manifesto.setdefault('tamanho_bloco', tamanho_bloco) != tamanho_bloco:
+            raise ValueError(
+                f"Execução iniciada com blocos de {self.manifesto['tamanho_bloco']} casos; use o mesmo tamanho ao retomar."
+            )
+
+    def _gravar_manifesto(self):
+        caminho = os.path.join(self.diretorio, ARQUIVO_MANIFESTO)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto, f, ensure_ascii=False, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+
+    # ------------------------------------------------------------------ gravação
+
+    def gravar(self, indice: int, inicio: int, resultados: dict):
+        """
+        Grava um bloco de resultados e registra o checkpoint.
+
+        :param indice: número do bloco (identifica o checkpoint)
+        :param inicio: índice global do primeiro caso do bloco
+        :param resultados: nome → array (1D com um valor por caso, ou escalar a repetir)
+        """
+        if self.concluido(indice):
+            return
+        if self.manifesto['colunas'] is None:
+            self.manifesto['colunas'] = list(resultados)
+        colunas = gravar_bloco(self.diretorio, indice, resultados, self.formato, self.manifesto['colunas'])
+        tamanho = len(next(iter(colunas.values()))) if colunas else 0
+        self.registrar(indice, inicio, inicio + tamanho, resumir_bloco(colunas, inicio))
+
+    def registrar(self, indice: int, inicio: int, fim: int, resumo: dict):
+        """
+        Registra no manifesto um bloco já gravado por gravar_bloco (por exemplo, em
+        outro processo) e acumula o seu resumo.
+        """
+        if self.concluido(indice):
+            return
+        combinado = combinar_resumos(
+            {'colunas': self.manifesto['resumo'], 'verificacoes': self.manifesto['verificacoes']}, resumo
+        )
+        self.manifesto['resumo'] = combinado['colunas']
+        self.manifesto['verificacoes'] = combinado['verificacoes']
+        self.manifesto['blocos'][str(indice)] = {
+            'arquivo': _nome_bloco(indice, self.formato), 'inicio': int(inicio), 'fim': int(fim),
+        }
+        self._gravar_manifesto()
+
+    # ------------------------------------------------------------------ leitura
+
+    def resumo(self) -> dict:
+        """Resumo acumulado: {'colunas': {...}, 'verificacoes': {...}, 'casos': n}."""
+        return {
+            'colunas': self.manifesto['resumo'],
+            'verificacoes': self.manifesto['verificacoes'],
+            'casos': self.casos_gravados,
+        }
+
+    def blocos(self, colunas=None):
+        """
+        Percorre os blocos concluídos em ordem de caso: (inicio, {nome: array}).
+
+        No formato 'npy' as colunas são mapeadas em memória.
+        """
+        nomes = colunas or self.manifesto['colunas'] or []
+        for info in sorted(self.manifesto['blocos'].values(), key=lambda b: b['inicio']):
+            caminho = os.path.join(self.diretorio, info['arquivo'])
+            if self.formato == 'npz':
+                with np.load(caminho) as arquivo:
+                    yield info['inicio'], {nome: arquivo[nome] for nome in nomes}
+            else:
+                yield info['inicio'], {
+                    nome: np.load(os.path.join(caminho, f'{nome}.npy'), mmap_mode='r') for nome in nomes
+                }
+
+    def coluna(self, nome: str) -> np.ndarray:
+        """Uma coluna inteira, em ordem de caso (carregada em memória)."""
+        partes = [valores[nome] for _, valores in self.blocos([nome])]
+        return np.concatenate(partes) if partes else np.array([])
+
+    # ------------------------------------------------------------------ execução
+
+    def executar(self, armazem, tamanho_bloco: int = 100000, funcao=None, colunas=None):
+        """
+        Avalia um ArmazemCasos bloco a bloco, gravando os resultados; blocos já
+        concluídos (execução anterior interrompida) são pulados.
+
+        :param armazem: ArmazemCasos
+        :param tamanho_bloco: casos por bloco (deve ser o mesmo ao retomar)
+        :param funcao: função colunas → resultados (padrão: motor_vetorizado.avaliar)
+        :param colunas: resultados a gravar (padrão: todos)
+        :return: resumo()
+        """
+        if funcao is None:
+            from motor_vetorizado import avaliar as funcao
+        self.verificar_tamanho_bloco(tamanho_bloco)
+        for indice, bloco in enumerate(armazem.blocos(tamanho_bloco)):
+            if self.concluido(indice):
+                continue
+            resultados = funcao(bloco.colunas())
+            if colunas:
+                resultados = {nome: resultados[nome] for nome in colunas}
+            self.gravar(indice, indice * tamanho_bloco, resultados)
+        return self.resumo()
@@ -0,0 +1,193 @@
+# levantamento_recalque.py
+
+"""
+Processamento em lote de levantamentos topográficos do perímetro de tanques.
+
+Cada levantamento traz, para um tanque, as cotas (m) de 8 a 36 estações ao
+redor do costado e, opcionalmente, as cotas de referência (levantamento
+inicial ou de projeto) e o ângulo de cada estação. O recalque de uma estação
+é cota_referencia - cota; sem referência, é -cota (recalque relativo: o
+recalque médio fica indefinido, mas a inclinação e o desvio fora do plano
+não dependem da constante).
+
+Análise (API 653, Anexo B):
+  - ajuste de s(θ) = a0 + a·cos θ + b·sin θ (campo_aleatorio.ajuste_cosseno),
+    feito de uma vez para todos os tanques com a mesma disposição de estações;
+  - desvio fora do plano U = s - plano e deflexão de cada estação em relação
+    às vizinhas, S_i = U_i - (U_{i-1} + U_{i+1}) / 2 (interpolação linear
+    pelo ângulo se as estações não forem igualmente espaçadas);
+  - limite S_adm = 11 · L² · Y / (2 · E · H), L = comprimento de arco entre
+    estações, Y = escoamento do costado, E = módulo do aço, H = altura do
+    costado (a expressão é homogênea: com L e H em m, S_adm em m).
+
+O recalque médio medido é comparado com o recalque imediato previsto
+(Recalque.calcular_recalque, pela fórmula recalque_mm de grafo_formulas,
+calculada para todos os tanques de uma vez).
+
+Formato dos arquivos (CSV, separador ',' ou ';' — com ';' a vírgula decimal
+é aceita), uma linha por estação:
+    tanque, estacao, cota [, cota_referencia] [, angulo]
+com cotas em m e ângulo em graus.
+"""
+
+import csv
+
+import numpy as np
+
+from campo_aleatorio import ajuste_cosseno
+from grafo_formulas import compilar
+
+ESCOAMENTO_COSTADO_MPA = 250.0
+MODULO_ACO_MPA = 200000.0
+
+
+def _numero(texto, decimal_virgula):
+    texto = texto.strip()
+    if not texto:
+        return np.nan
+    return float(texto.replace(',', '.') if decimal_virgula else texto)
+
+
+def ler_levantamentos(caminhos) -> dict:
+    """
+    Lê um ou mais arquivos de levantamento.
+
+    :param caminhos: caminho ou lista de caminhos de arquivos CSV
+    :return: tanque → {'estacoes', 'cotas', 'referencia' (ou None), 'angulos' (rad, ou None)},
+             com as estações em ordem crescente
+    """
+    if isinstance(caminhos, str):
+        caminhos = [caminhos]
+    linhas = {}
+    for caminho in caminhos:
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            amostra = f.read(4096)
+            f.seek(0)
+            separador = ';' if amostra.count(';') > amostra.count(',') else ','
+            leitor = csv.DictReader(f, delimiter=separador)
+            faltantes = {'tanque', 'estacao', 'cota'} - set(leitor.fieldnames or ())
+            if faltantes:
+                raise ValueError(f"{caminho}: colunas ausentes no levantamento: {sorted(faltantes)}")
+            for linha in leitor:
+                estacao = int(linha['estacao'])
+                linhas.setdefault(linha['tanque'].strip(), {})[estacao] = tuple(
+                    _numero(linha.get(campo) or '', separador == ';')
+                    for campo in ('cota', 'cota_referencia', 'angulo')
+                )
+
+    levantamentos = {}
+    for tanque, estacoes in linhas.items():
+        ordem = sorted(estacoes)
+        cota, referencia, angulo = np.array([estacoes[e] for e in ordem]).T
+        levantamentos[tanque] = {
+            'estacoes': np.array(ordem),
+            'cotas': cota,
+            'referencia': None if np.isnan(referencia).all() else referencia,
+            'angulos': None if np.isnan(angulo).all() else np.radians(angulo),
+        }
+    return levantamentos
+
+
+def _deflexao(fora_plano, angulos):
+    """S_i = U_i menos a interpolação linear (pelo ângulo) entre as estações vizinhas."""
+    anterior = np.roll(angulos, 1)
+    posterior = np.roll(angulos, -1)
+    antes = np.mod(angulos - anterior, 2 * np.pi)
+    depois = np.mod(posterior - angulos, 2 * np.pi)
+    peso = depois / (antes + depois)
+    vizinhas = peso * np.roll(fora_plano, 1, axis=-1) + (1 - peso) * np.roll(fora_plano, -1, axis=-1)
+    return fora_plano - vizinhas, (antes + depois) / 2
+
+
+def processar_levantamentos(levantamentos: dict, casos: dict, escoamento_costado: float = ESCOAMENTO_COSTADO_MPA,
+                            modulo_aco: float = MODULO_ACO_MPA) -> dict:
+    """
+    Analisa os levantamentos de todos os tanques.
+
+    :param levantamentos: resultado de ler_levantamentos (tanque → dados das estações)
+    :param casos: tanque → caso no formato do arquivo JSON de entrada (ou Caso), para
+                  diâmetro, altura do costado e recalque previsto
+    :param escoamento_costado: tensão de escoamento do aço do costado (MPa)
+    :param modulo_aco: módulo de elasticidade do aço (MPa)
+    :return: dicionário com 'tanques' (ordem dos arrays) e, por tanque, arrays com
+             estacoes, recalque_medio_mm (nan sem referência), recalque_previsto_mm,
+             razao_medido_previsto, inclinacao_rad, direcao_rad (do maior recalque planar),
+             deflexao_max_mm, limite_deflexao_mm (na estação crítica), utilizacao
+             (max |S| / S_adm), estacao_critica e atende; e 'por_estacao' (tanque → arrays
+             por estação: angulos, recalque_mm, plano_mm, fora_plano_mm, deflexao_mm, limite_mm)
+    """
+    from armazem_casos import ArmazemCasos
+    from caso import Caso
+
+    faltantes = [tanque for tanque in levantamentos if tanque not in casos]
+    if faltantes:
+        raise ValueError(f"Tanques sem dados de projeto: {faltantes}")
+    tanques = list(levantamentos)
+    n = len(tanques)
+    colunas = ArmazemCasos.de_casos(Caso.de_dados(casos[tanque]).para_dados() for tanque in tanques).colunas()
+    valores = dict(colunas)
+    valores.setdefault('altura_liquido', valores['altura'])
+    valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+    previsto = np.broadcast_to(compilar(('recalque_mm',), 'numpy').calcular(valores)['recalque_mm'], (n,))
+    diametro = colunas['diametro']
+    altura = colunas['altura']
+
+    resultado = {nome: np.full(n, np.nan) for nome in (
+        'recalque_medio_mm', 'inclinacao_rad', 'direcao_rad', 'deflexao_max_mm', 'limite_deflexao_mm', 'utilizacao')}
+    resultado['estacoes'] = np.zeros(n, dtype=int)
+    resultado['estacao_critica'] = np.zeros(n, dtype=int)
+    por_estacao = {}
+
+    # Tanques com a mesma disposição de estações são ajustados juntos
+    grupos = {}
+    for i, tanque in enumerate(tanques):
+        dados = levantamentos[tanque]
+        m = len(dados['cotas'])
+        if m < 4:
+            raise ValueError(f"Tanque {tanque}: são necessárias ao menos 4 estações.")
+        angulos = dados['angulos'] if dados['angulos'] is not None else np.arange(m) * 2 * np.pi / m
+        grupos.setdefault(tuple(np.round(angulos, 9)), []).append(i)
+
+    for chave, indices in grupos.items():
+        angulos = np.array(chave)
+        indices = np.array(indices)
+        cotas = np.stack([levantamentos[tanques[i]]['cotas'] for i in indices])
+        referencias = [levantamentos[tanques[i]]['referencia'] for i in indices]
+        com_referencia = np.array([r is not None for r in referencias])
+        referencia = np.stack([r if r is not None else np.zeros(len(angulos)) for r in referencias])
+        recalque = (referencia - cotas) * 1000
+
+        ajuste = ajuste_cosseno(recalque, angulos)
+        deflexao, arco = _deflexao(ajuste['fora_plano'], angulos)
+        L = diametro[indices, None] / 2 * arco[None, :]
+        limite = 11 * L ** 2 * escoamento_costado / (2 * modulo_aco * altura[indices, None]) * 1000
+        utilizacao = np.abs(deflexao) / limite
+        critica = np.argmax(utilizacao, axis=1)
+        linhas = np.arange(len(indices))
+
+        resultado['estacoes'][indices] = len(angulos)
+        resultado['recalque_medio_mm'][indices] = np.where(com_referencia, ajuste['a0'], np.nan)
+        resultado['inclinacao_rad'][indices] = 2 * ajuste['amplitude'] / 1000 / diametro[indices]
+        resultado['direcao_rad'][indices] = ajuste['fase']
+        resultado['deflexao_max_mm'][indices] = np.abs(deflexao).max(axis=1)
+        resultado['limite_deflexao_mm'][indices] = limite[linhas, critica]
+        resultado['utilizacao'][indices] = utilizacao[linhas, critica]
+        resultado['estacao_critica'][indices] = [levantamentos[tanques[i]]['estacoes'][k]
+                                                 for i, k in zip(indices, critica)]
+        for k, i in enumerate(indices):
+            por_estacao[tanques[i]] = {
+                'angulos': angulos,
+                'recalque_mm': recalque[k],
+                'plano_mm': ajuste['plano'][k],
+                'fora_plano_mm': ajuste['fora_plano'][k],
+                'deflexao_mm': deflexao[k],
+                'limite_mm': limite[k],
+            }
+
+    resultado['recalque_previsto_mm'] = np.asarray(previsto, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resultado['razao_medido_previsto'] = resultado['recalque_medio_mm'] / resultado['recalque_previsto_mm']
+    resultado['atende'] = resultado['utilizacao'] <= 1.0
+    resultado['tanques'] = tanques
+    resultado['por_estacao'] = por_estacao
+    return resultado
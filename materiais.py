@@ -23,6 +23,21 @@ class Materiais:
     def definir_tensao_admissivel(self, valor: float):
         self.solo['tensao_admissivel'] = valor
 
+    def calcular_tensao_admissivel(self, geometria: dict, solo: dict) -> float:
+        """
+        Calcula a tensão admissível pela capacidade de carga do solo (ver capacidade_carga),
+        quando ela não é informada. Adota a menor entre a do anel e a do interior.
+
+        :return: tensão admissível (kN/m²)
+        """
+        from capacidade_carga import tensao_admissivel_tanque
+
+        resultado = tensao_admissivel_tanque(geometria, solo)
+        self.solo['tensao_admissivel_anel'] = float(resultado['anel']['q_adm'])
+        self.solo['tensao_admissivel_interior'] = float(resultado['interior']['q_adm'])
+        self.definir_tensao_admissivel(float(resultado['tensao_admissivel']))
+        return self.solo['tensao_admissivel']
+
     def validar_materiais(self):
         if None in self.concreto.values():
             raise ValueError("Todos os parâmetros do concreto devem ser definidos.")
@@ -0,0 +1,109 @@
+# motor_vetorizado.py
+
+"""
+Versão vetorizada (NumPy) das fórmulas de Cargas, AnaliseEstrutural,
+DimensionamentoBase e Recalque, definidas em grafo_formulas.
+
+Todas as entradas podem ser escalares ou arrays; o cálculo segue as regras de
+broadcasting do NumPy, de modo que grandezas que não dependem de um eixo de
+variação são calculadas uma única vez. A altura do líquido ('altura_liquido')
+e o seu peso específico ('densidade_liquido') são entradas próprias; por
+padrão valem 'altura' e 'densidade_fluido', como no cálculo escalar.
+
+Diferenças em relação aos métodos escalares: não há arredondamentos
+intermediários (os resultados diferem na ordem do último dígito apresentado
+no relatório) e casos inválidos resultam em nan/inf em vez de exceções.
+"""
+
+from grafo_formulas import compilar, VERIFICACOES
+
+# Entradas do cálculo (nomes das colunas), com unidades
+CAMPOS_ENTRADA = (
+    'altura',             # m, altura do costado
+    'diametro',           # m
+    'diametro_base',      # m
+    'altura_base',        # m
+    'lado_a_m',           # m, base 1
+    'lado_b_m',           # m, base 2
+    'h1', 'h2', 'h3',     # m
+    'densidade_fluido',   # kN/m³
+    'peso_tanque_vazio',  # kN
+    'vento_v0',           # m/s
+    'vento_s1', 'vento_s2', 'vento_s3',
+    'tensao_admissivel',  # kN/m²
+    'Esolo',              # kN/m²
+    'poisson',
+    'fck',                # MPa
+    'fyk',                # MPa
+    'gamma_concreto',     # kN/m³
+)
+
+# Unidades das entradas (nomes de utils.RELACOES_UNIDADES; '-' = adimensional)
+UNIDADES_ENTRADA = dict(
+    {nome: 'm' for nome in ('altura', 'diametro', 'diametro_base', 'altura_base', 'lado_a_m', 'lado_b_m',
+                            'h1', 'h2', 'h3')},
+    densidade_fluido='kN/m3', peso_tanque_vazio='kN', vento_v0='m/s', vento_s1='-', vento_s2='-', vento_s3='-',
+    tensao_admissivel='kN/m2', Esolo='kN/m2', poisson='-', fck='MPa', fyk='MPa', gamma_concreto='kN/m3',
+)
+
+# Grandezas devolvidas por avaliar()
+SAIDAS = (
+    'q_vento', 'Fv', 'Mvf', 'Mvt', 'peso_proprio', 'carga_fluido', 'esforco_vertical',
+    'fator_seguranca', 'area_minima_base', 'diametro_base_sugerido',
+    'p1', 'p2', 'p3', 'p_total', 'phi', 'p4', 'p5', 'p6', 'b_calc',
+    'Ø', 'WA', 'p7', 'p8', 'P_anel',
+    'Pg', 'ps1', 'E1', 'Pf', 'Ta', 'resistencia_arrancamento', 'sigma_cmax', 'fcd',
+    'MT', 'MF', 'qi', 'V', 'h0', 'H', 'ps2', 'ps3', 'E2', 'Tc', 'As_tracao',
+    'Md', 'y_d', 'y', 'rho', 'As', 'As_min', 'recalque_mm', 'tensao_admissivel',
+) + tuple(f'{prefixo}_{nome}' for nome in VERIFICACOES for prefixo in ('utilizacao', 'atende'))
+
+
+def colunas_de_entrada(entrada, materiais) -> dict:
+    """
+    Extrai as entradas do cálculo de EntradaDados/Materiais com as mesmas
+    chaves e valores padrão usados pelos métodos escalares.
+
+    :return: dicionário nome → float, com as chaves de CAMPOS_ENTRADA
+    """
+    g, s, c, t = entrada.geometria, entrada.solo, entrada.cargas, entrada.dados_tanque
+    ptv = t.get('peso_tanque_vazio') or t.get('PTV') or g.get('peso_tanque_vazio') or 0.0
+    return {
+        'altura': g.get('altura', 0.0),
+        'diametro': g.get('diametro', 0.0),
+        'diametro_base': g.get('diametro_base', 0.0),
+        'altura_base': g.get('altura_base', 0.9),
+        'lado_a_m': g.get('lado_a_m', 0.25),
+        'lado_b_m': g.get('lado_b_m', 0.25),
+        'h1': g.get('h1', 0.4),
+        'h2': g.get('h2', 0.5),
+        'h3': g.get('h3', 0.0),
+        'densidade_fluido': t.get('densidade_fluido', 9.96),
+        'peso_tanque_vazio': ptv,
+        'vento_v0': c.get('vento_v0', 0.0),
+        'vento_s1': c.get('vento_s1', 1.0),
+        'vento_s2': c.get('vento_s2', 1.0),
+        'vento_s3': c.get('vento_s3', 1.0),
+        'tensao_admissivel': materiais.solo.get('tensao_admissivel') or 0.0,
+        'Esolo': s.get('Esolo', materiais.solo.get('modulo_elasticidade', 20000)),
+        'poisson': s.get('poisson', 0.4),
+        'fck': materiais.concreto.get('fck', 30),
+        'fyk': materiais.aco.get('fyk', 250),
+        'gamma_concreto': materiais.concreto.get('gamma', 25),
+    }
+
+
+def avaliar(c: dict) -> dict:
+    """
+    Avalia todas as grandezas do dimensionamento.
+
+    As fórmulas são as de grafo_formulas, compiladas no modo 'numpy'.
+
+    :param c: dicionário com as chaves de CAMPOS_ENTRADA (escalares ou arrays) e,
+              opcionalmente, 'altura_liquido' e 'densidade_liquido'
+    :return: dicionário nome → array com as grandezas de SAIDAS, incluindo, para cada
+             verificação de VERIFICACOES, 'utilizacao_<nome>' e 'atende_<nome>'
+    """
+    valores = dict(c)
+    valores.setdefault('altura_liquido', c['altura'])
+    valores.setdefault('densidade_liquido', c['densidade_fluido'])
+    return compilar(SAIDAS, 'numpy').calcular(valores)
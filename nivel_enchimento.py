@@ -0,0 +1,98 @@
+# nivel_enchimento.py
+
+"""
+Varredura do nível de enchimento: avalia todas as verificações do tanque
+vazio ao cheio em uma única passada vetorizada.
+
+Os métodos escalares consideram sempre o líquido na altura total do costado
+(p2 = ρL·hT, p4, ps2...). Aqui a altura do líquido é um eixo de array; as
+grandezas que não dependem dela (vento, ϕ, WA, Pg...) são calculadas uma
+única vez e apenas as que dependem são avaliadas em cada nível. O teste
+hidrostático é a mesma varredura com água no lugar do produto.
+"""
+
+import numpy as np
+
+from motor_vetorizado import avaliar, colunas_de_entrada, VERIFICACOES
+
+DENSIDADE_AGUA = 9.81  # kN/m³
+
+# Grandezas de dimensionamento cujo pior caso é o maior valor ao longo do enchimento
+GRANDEZAS_DIMENSIONANTES = ('p_total', 'b_calc', 'P_anel', 'MT', 'MF', 'Tc', 'As_tracao', 'As', 'recalque_mm')
+
+
+def _varrer(colunas, fracao, densidade):
+    altura = np.asarray(colunas['altura'], dtype=float)
+    expandidas = {
+        chave: (np.asarray(valor)[..., np.newaxis] if np.ndim(valor) else valor)
+        for chave, valor in colunas.items()
+    }
+    altura_liquido = altura[..., np.newaxis] * fracao
+    expandidas['altura_liquido'] = altura_liquido
+    expandidas['densidade_liquido'] = (
+        np.asarray(densidade)[..., np.newaxis] if np.ndim(densidade) else densidade
+    )
+    resultados = avaliar(expandidas)
+    forma = altura_liquido.shape
+    curvas = {chave: np.broadcast_to(valor, forma) for chave, valor in resultados.items()}
+
+    pior_caso = {}
+    for nome in VERIFICACOES:
+        pior_caso[nome] = _pior(curvas[f'utilizacao_{nome}'], altura_liquido, fracao)
+    for nome in GRANDEZAS_DIMENSIONANTES:
+        pior_caso[nome] = _pior(curvas[nome], altura_liquido, fracao)
+
+    utilizacoes = np.stack([curvas[f'utilizacao_{nome}'] for nome in VERIFICACOES])
+    nomes = np.array(list(VERIFICACOES))
+    governante = nomes[np.nanargmax(np.where(np.isnan(utilizacoes), -np.inf, utilizacoes), axis=0)]
+
+    return {
+        'altura_liquido': altura_liquido,
+        'curvas': curvas,
+        'pior_caso': pior_caso,
+        'verificacao_governante': governante,
+    }
+
+
+def _pior(curva, altura_liquido, fracao):
+    valores = np.where(np.isnan(curva), -np.inf, curva)
+    indice = np.argmax(valores, axis=-1)
+    return {
+        'valor': np.take_along_axis(curva, indice[..., np.newaxis], axis=-1)[..., 0],
+        'altura_liquido': np.take_along_axis(altura_liquido, indice[..., np.newaxis], axis=-1)[..., 0],
+        'fracao': fracao[indice],
+    }
+
+
+def varrer_colunas(colunas: dict, pontos: int = 201, hidroteste: bool = True,
+                   densidade_agua: float = DENSIDADE_AGUA) -> dict:
+    """
+    Varre o nível de enchimento de um ou vários tanques.
+
+    :param colunas: entradas com as chaves de motor_vetorizado.CAMPOS_ENTRADA
+                    (escalares para um tanque, arrays de mesmo formato para vários)
+    :param pontos: número de níveis entre vazio (0) e cheio (altura do costado)
+    :param hidroteste: se True, repete a varredura com água
+    :param densidade_agua: peso específico da água do teste hidrostático (kN/m³)
+    :return: dicionário com 'fracao' e, para 'operacao' (e 'hidroteste'), as curvas de
+             cada grandeza (último eixo = nível), o pior caso de cada verificação e a
+             verificação governante em cada nível
+    """
+    fracao = np.linspace(0.0, 1.0, pontos)
+    resultado = {
+        'fracao': fracao,
+        'operacao': _varrer(colunas, fracao, colunas['densidade_fluido']),
+    }
+    if hidroteste:
+        resultado['hidroteste'] = _varrer(colunas, fracao, densidade_agua)
+    return resultado
+
+
+def varrer_enchimento(entrada, materiais, pontos: int = 201, hidroteste: bool = True,
+                      densidade_agua: float = DENSIDADE_AGUA) -> dict:
+    """
+    Varre o nível de enchimento de um tanque descrito por EntradaDados/Materiais.
+
+    Ver varrer_colunas.
+    """
+    return varrer_colunas(colunas_de_entrada(entrada, materiais), pontos, hidroteste, densidade_agua)
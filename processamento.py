@@ -0,0 +1,68 @@
+# processamento.py
+
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import os
+
+from caso import Caso
+from dados_entrada import EntradaDados
+from materiais import Materiais
+from relatorio import Relatorio
+from utils import converter_unidades
+
+
+def montar_materiais(entrada: EntradaDados) -> Materiais:
+    """
+    Monta os materiais a partir da entrada, como faz a interface gráfica.
+
+    A tensão admissível é informada em kgf/cm² e convertida para kN/m²; se não for
+    informada, é calculada pela capacidade de carga do solo.
+
+    :param entrada: Instância de EntradaDados já preenchida
+    :return: instância de Materiais
+    """
+    materiais = Materiais()
+    if 'tensao_adm_kgfcm2' in entrada.solo:
+        materiais.definir_tensao_admissivel(converter_unidades(float(entrada.solo['tensao_adm_kgfcm2']), 'kgf/cm2', 'kN/m2'))
+    else:
+        materiais.calcular_tensao_admissivel(entrada.geometria, entrada.solo)
+    return materiais
+
+
+def calcular_caso(dados) -> dict:
+    """
+    Calcula um caso completo sem interface gráfica.
+
+    O caso não é alterado: o mesmo Caso pode ser calculado por várias threads ao mesmo tempo.
+
+    :param dados: Caso ou dicionário no formato do arquivo JSON de entrada
+    :return: dicionário com os resultados de todas as seções do relatório
+    """
+    caso = Caso.de_dados(dados)
+    caso.validar_dados()
+    materiais = montar_materiais(caso)
+    return Relatorio(caso, materiais).calcular_resultados()
+
+
+def calcular_caso_silencioso(dados: dict) -> dict:
+    """
+    Igual a calcular_caso, descartando as mensagens impressas pelo cálculo.
+    """
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        return calcular_caso(dados)
+
+
+def processar_lote(casos, processos: int = 1, tamanho_bloco: int = 16):
+    """
+    Calcula uma lista de casos, opcionalmente em paralelo.
+
+    :param casos: sequência de dicionários no formato do arquivo JSON de entrada
+    :param processos: número de processos de trabalho (1 = no próprio processo)
+    :param tamanho_bloco: quantidade de casos enviada a cada processo por vez
+    :return: lista de resultados, na mesma ordem dos casos
+    """
+    if processos <= 1:
+        return [calcular_caso_silencioso(dados) for dados in casos]
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(calcular_caso_silencioso, casos, chunksize=tamanho_bloco))
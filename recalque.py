@@ -48,7 +48,7 @@ class Recalque:
         L_B = L / B
         I = 1.10  # Valor padrão; pode ser ajustado com interpolação ou tabela, se necessário
 
-        E = self.materiais.solo.get('modulo_elasticidade', 20000)  # kN/m²
+        E = self.dados.solo.get('Esolo', self.materiais.solo.get('modulo_elasticidade', 20000))  # kN/m²
         mu = self.dados.solo.get('poisson', 0.4)
 
         if E <= 0:
@@ -65,3 +65,23 @@ class Recalque:
             'recalque_estimado_m': recalque,
             'recalque_estimado_mm': recalque * 1000
         }
+
+    def calcular_recalque_acoplado(self, **opcoes):
+        """
+        Recalque com repartição de pressões anel/fundo compatível com os coeficientes de
+        reação implícitos nos recalques (ver recalque_acoplado). Parte do k_reac informado.
+
+        :param opcoes: parâmetros de recalque_acoplado.recalque_acoplado (metodo, tol, Rf, ...)
+        :return: dicionário com os resultados do caso (valores escalares) e o diagnóstico
+        """
+        from motor_vetorizado import colunas_de_entrada
+        from recalque_acoplado import recalque_acoplado
+
+        k_reac = self.dados.solo.get('k_reac') or self.materiais.solo.get('coeficiente_reacao', 10000)
+        r = recalque_acoplado(colunas_de_entrada(self.dados, self.materiais), k_reac, **opcoes)
+        diagnostico = r.pop('diagnostico')
+        resultado = {nome: valor.item() for nome, valor in r.items()}
+        resultado['k_reac_informado'] = k_reac
+        resultado['iteracoes'] = int(diagnostico['iteracoes'][0])
+        resultado['residuo'] = float(diagnostico['residuo'][0])
+        return resultado
@@ -0,0 +1,227 @@
+# recalque_acoplado.py
+
+"""
+Recalque acoplado: repartição de pressões entre anel e fundo compatível com
+os coeficientes de reação implícitos nos recalques.
+
+O cálculo simplificado adota que o anel recebe metade da pressão do
+líquido (p4 = p2 / 2) e usa o coeficiente de reação k_reac como dado fixo.
+No modo acoplado, anel e fundo são molas de Winkler em paralelo sob a faixa
+de chapa do fundo sobre o anel, e a fração da pressão do líquido levada pelo
+anel é α = k_anel / (k_anel + k_fundo) (α = 1/2 quando k_anel = k_fundo, que
+é o caso simplificado). O que o anel deixa de receber em relação a p2 / 2
+passa para o aterro, distribuído na área do fundo:
+
+    q_anel  = α·p2 + p5 + p7
+    q_fundo = p_total + (1/2 - α)·p2·A_anel / A_fundo,   A_anel = π·dT·b
+
+O solo tem módulo secante hiperbólico (Duncan & Chang),
+E(q) = Esolo · (1 - Rf · q / q_rup), q_rup = fator_ruptura · τ_adm, e os
+coeficientes de reação são os implícitos nos recalques de Recalque
+(anel, largura B × L) e da área circular flexível do fundo (centro):
+
+    k_anel  = E(q_anel) · I / ((1 - ν²) · √(B·L)),  I = 1,10
+    k_fundo = E(q_fundo) / (2 · R · (1 - ν²))
+
+A iteração k → α → q → E → k é resolvida em ln k para todos os casos de
+uma vez, com aceleração de Anderson (padrão) ou de Aitken (Steffensen).
+A cada passo os casos convergidos saem do lote e só os demais continuam.
+"""
+
+import numpy as np
+
+from grafo_formulas import compilar
+
+METODOS = ('anderson', 'aitken', 'simples')
+FATOR_INFLUENCIA = 1.10
+K_REAC_PADRAO = 10000.0  # kN/m³ (Materiais.solo['coeficiente_reacao'])
+
+_GRANDEZAS = ('p2', 'p5', 'p7', 'p_total', 'B', 'L', 'b')
+
+
+class _Problema:
+    """Dados fixos do lote e a função de ponto fixo G(ln k) = ln k(q(α(k)))."""
+    def __init__(self, colunas, Rf, fator_ruptura):
+        valores = dict(colunas)
+        valores.setdefault('altura_liquido', valores['altura'])
+        valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+        n = max([np.size(valor) for valor in colunas.values()])
+        r = compilar(_GRANDEZAS, 'numpy').calcular(valores)
+        forma = lambda x: np.broadcast_to(np.asarray(x, dtype=float), (n,))
+        self.n = n
+        self.p2, self.p5, self.p7, self.p_total = (forma(r[nome]) for nome in ('p2', 'p5', 'p7', 'p_total'))
+        self.diametro = forma(valores['diametro'])
+        self.Esolo = forma(valores['Esolo'])
+        mu = forma(valores['poisson'])
+        self.transferencia = np.pi * self.diametro * forma(r['b']) / (np.pi * self.diametro ** 2 / 4)
+        self.q_ruptura = fator_ruptura * forma(valores['tensao_admissivel'])
+        self.Rf = Rf
+        self.rigidez_anel = FATOR_INFLUENCIA / ((1 - mu ** 2) * np.sqrt(forma(r['B']) * forma(r['L'])))
+        self.rigidez_fundo = 1 / (self.diametro * (1 - mu ** 2))
+
+    def modulo_secante(self, q, i):
+        q_rup = self.q_ruptura[i]
+        reducao = np.where(q_rup > 0, self.Rf * np.maximum(q, 0.0) / np.where(q_rup > 0, q_rup, 1.0), 0.0)
+        return self.Esolo[i] * np.maximum(1 - reducao, 0.05)
+
+    def pressoes(self, k, i):
+        """Fração α e pressões (anel, fundo) para coeficientes k (m, 2) dos casos i."""
+        alfa = k[:, 0] / (k[:, 0] + k[:, 1])
+        q_anel = alfa * self.p2[i] + self.p5[i] + self.p7[i]
+        q_fundo = self.p_total[i] + (0.5 - alfa) * self.p2[i] * self.transferencia[i]
+        return alfa, q_anel, q_fundo
+
+    def G(self, y, i):
+        _, q_anel, q_fundo = self.pressoes(np.exp(y), i)
+        return np.log(np.stack([
+            self.modulo_secante(q_anel, i) * self.rigidez_anel[i],
+            self.modulo_secante(q_fundo, i) * self.rigidez_fundo[i],
+        ], axis=1))
+
+
+def _anderson(problema, y, tol, max_iter, memoria):
+    n = len(y)
+    ativos = np.arange(n)
+    iteracoes = np.zeros(n, dtype=int)
+    residuo = np.full(n, np.inf)
+    historico_y, historico_f = [], []      # (ativos, 2) por iteração, alinhados com `ativos`
+    diagnostico = {'ativos': [], 'residuo_max': []}
+    avaliacoes = 0
+    for _ in range(max_iter):
+        x = y[ativos]
+        g = problema.G(x, ativos)
+        avaliacoes += len(ativos)
+        f = g - x
+        r = np.abs(f).max(axis=1)
+        residuo[ativos] = r
+        iteracoes[ativos] += 1
+        diagnostico['ativos'].append(len(ativos))
+        diagnostico['residuo_max'].append(float(r.max()))
+
+        historico_y.append(x)
+        historico_f.append(f)
+        historico_y, historico_f = historico_y[-(memoria + 1):], historico_f[-(memoria + 1):]
+        if len(historico_f) > 1:
+            dF = np.stack([b - a for a, b in zip(historico_f[:-1], historico_f[1:])], axis=2)   # (m, 2, k)
+            dY = np.stack([b - a for a, b in zip(historico_y[:-1], historico_y[1:])], axis=2)
+            dG = dY + dF
+            normal = np.einsum('mdi,mdj->mij', dF, dF)
+            regularizacao = 1e-12 * np.trace(normal, axis1=1, axis2=2) + 1e-300
+            normal += regularizacao[:, None, None] * np.eye(normal.shape[1])
+            gamma = np.linalg.solve(normal, np.einsum('mdi,md->mi', dF, f)[..., None])[..., 0]
+            novo = g - np.einsum('mdi,mi->md', dG, gamma)
+        else:
+            novo = g
+        y[ativos] = np.where(np.isfinite(novo), novo, g)
+
+        continuar = r > tol
+        if not continuar.all():
+            y[ativos[~continuar]] = g[~continuar]
+            ativos = ativos[continuar]
+            historico_y = [h[continuar] for h in historico_y]
+            historico_f = [h[continuar] for h in historico_f]
+            if not len(ativos):
+                break
+    return y, iteracoes, residuo, avaliacoes, diagnostico
+
+
+def _aitken(problema, y, tol, max_iter, acelerar=True):
+    n = len(y)
+    ativos = np.arange(n)
+    iteracoes = np.zeros(n, dtype=int)
+    residuo = np.full(n, np.inf)
+    diagnostico = {'ativos': [], 'residuo_max': []}
+    avaliacoes = 0
+    for _ in range(max_iter):
+        x0 = y[ativos]
+        x1 = problema.G(x0, ativos)
+        avaliacoes += len(ativos)
+        r = np.abs(x1 - x0).max(axis=1)
+        residuo[ativos] = r
+        iteracoes[ativos] += 1
+        diagnostico['ativos'].append(len(ativos))
+        diagnostico['residuo_max'].append(float(r.max()))
+        continuar = r > tol
+        novo = x1
+        if acelerar and continuar.any():
+            x2 = problema.G(x1, ativos)
+            avaliacoes += len(ativos)
+            segunda = x2 - 2 * x1 + x0
+            seguro = np.abs(segunda) > 1e-14
+            novo = np.where(seguro, x2 - (x2 - x1) ** 2 / np.where(seguro, segunda, 1.0), x2)
+            novo = np.where(np.isfinite(novo), novo, x2)
+        y[ativos] = np.where(continuar[:, None], novo, x1)
+        ativos = ativos[continuar]
+        if not len(ativos):
+            break
+    return y, iteracoes, residuo, avaliacoes, diagnostico
+
+
+def recalque_acoplado(colunas: dict, k_reac=K_REAC_PADRAO, metodo: str = 'anderson', tol: float = 1e-8,
+                      max_iter: int = 200, memoria: int = 3, Rf: float = 0.9, fator_ruptura: float = 3.0) -> dict:
+    """
+    Resolve o acoplamento recalque-rigidez de um lote de casos.
+
+    :param colunas: entradas com as chaves de motor_vetorizado.CAMPOS_ENTRADA (escalares ou arrays 1D)
+    :param k_reac: coeficiente de reação informado (kN/m³), escalar ou por caso; é o ponto de
+                   partida da iteração e o valor com que o resultado é comparado
+    :param metodo: 'anderson', 'aitken' ou 'simples' (iteração de ponto fixo sem aceleração)
+    :param tol: tolerância em ln k (variação relativa de k entre iterações)
+    :param max_iter: iterações máximas por caso
+    :param memoria: número de iterações anteriores usadas pelo método de Anderson
+    :param Rf: razão de ruptura do modelo hiperbólico
+    :param fator_ruptura: q_rup / τ_adm (sem τ_adm, o solo é tratado como linear)
+    :return: dicionário com arrays por caso (k_anel, k_fundo, fracao_anel, q_anel, q_fundo,
+             recalque_anel_mm, recalque_fundo_mm, razao_k_reac, convergiu) e 'diagnostico'
+             (iterações e resíduo por caso, avaliações de G, casos ativos e resíduo máximo
+             a cada iteração)
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo}. Use um de {METODOS}.")
+    problema = _Problema(colunas, Rf, fator_ruptura)
+    k_reac = np.broadcast_to(np.asarray(k_reac, dtype=float), (problema.n,))
+    if np.any(k_reac <= 0):
+        raise ValueError("O coeficiente de reação deve ser maior que zero.")
+    y = np.log(np.stack([k_reac, k_reac], axis=1))
+
+    if metodo == 'anderson':
+        y, iteracoes, residuo, avaliacoes, diagnostico = _anderson(problema, y, tol, max_iter, memoria)
+    else:
+        y, iteracoes, residuo, avaliacoes, diagnostico = _aitken(problema, y, tol, max_iter, metodo == 'aitken')
+
+    k = np.exp(y)
+    todos = np.arange(problema.n)
+    alfa, q_anel, q_fundo = problema.pressoes(k, todos)
+    return {
+        'k_anel': k[:, 0],
+        'k_fundo': k[:, 1],
+        'fracao_anel': alfa,
+        'q_anel': q_anel,
+        'q_fundo': q_fundo,
+        'recalque_anel_mm': q_anel / k[:, 0] * 1000,
+        'recalque_fundo_mm': q_fundo / k[:, 1] * 1000,
+        'razao_k_reac': k[:, 0] / k_reac,
+        'convergiu': residuo <= tol,
+        'diagnostico': {
+            'metodo': metodo,
+            'iteracoes': iteracoes,
+            'residuo': residuo,
+            'avaliacoes': avaliacoes,
+            'ativos_por_iteracao': diagnostico['ativos'],
+            'residuo_max_por_iteracao': diagnostico['residuo_max'],
+        },
+    }
+
+
+def acoplar_casos(casos, **opcoes) -> dict:
+    """
+    recalque_acoplado para casos no formato do arquivo JSON de entrada (ou Caso), com o
+    k_reac de cada caso (padrão: Materiais.solo['coeficiente_reacao']).
+    """
+    from armazem_casos import ArmazemCasos
+    from caso import Caso
+
+    casos = [Caso.de_dados(dados) for dados in casos]
+    k_reac = [caso.solo.get('k_reac') or K_REAC_PADRAO for caso in casos]
+    colunas = ArmazemCasos.de_casos(caso.para_dados() for caso in casos).colunas()
+    return recalque_acoplado(colunas, k_reac, **opcoes)
@@ -0,0 +1,236 @@
+# recalque_parque.py
+
+"""
+Recalque de interação em parques de tanques.
+
+Cada tanque é tratado como uma área circular flexível uniformemente
+carregada sobre um semiespaço elástico. O recalque de um tanque é a soma do
+seu próprio recalque com os recalques induzidos pelos vizinhos (superposição
+das soluções elásticas). Apenas os pares dentro de um raio de corte são
+avaliados, encontrados por um índice espacial em grade, sem o laço O(n²)
+sobre todos os pares.
+
+Soluções utilizadas (Timoshenko & Goodier; Poulos & Davis):
+    centro da área carregada:  s = 2·q·a·(1 - ν²) / E
+    fora da área (r > a):      s = 4·q·(1 - ν²)·r / (π·E) · [E(k) - (1 - k²)·K(k)],  k = a / r
+    acréscimo de tensão:       Boussinesq, integrando cargas pontuais sobre a área do vizinho
+"""
+
+import numpy as np
+
+
+def _integrais_elipticas(k):
+    """
+    Integrais elípticas completas K(k) e E(k) pela média aritmético-geométrica.
+    """
+    a = np.ones_like(k)
+    b = np.sqrt(1 - k * k)
+    c = k.copy()
+    soma = 0.5 * c * c
+    peso = 0.5
+    for _ in range(8):
+        a, b, c = (a + b) / 2, np.sqrt(a * b), (a - b) / 2
+        peso *= 2
+        soma = soma + peso * c * c
+    K = np.pi / (2 * a)
+    return K, K * (1 - soma)
+
+
+def recalque_externo_circular(q, a, r, E, poisson):
+    """
+    Recalque na superfície, à distância r (> a) do centro de uma área circular
+    flexível de raio a com pressão uniforme q.
+
+    Aceita arrays (com broadcasting). Unidades: q e E em kN/m², a e r em m; resultado em m.
+    """
+    k = np.clip(a / r, 0.0, 1 - 1e-9)
+    K, Ek = _integrais_elipticas(k)
+    return 4 * q * (1 - poisson ** 2) * r / (np.pi * E) * (Ek - (1 - k * k) * K)
+
+
+def pares_vizinhos(x, y, raio_corte):
+    """
+    Pares de tanques com centros a menos de raio_corte, por índice espacial em grade.
+
+    A grade tem células de lado raio_corte; cada tanque só é comparado com os
+    tanques da própria célula e das células adjacentes.
+
+    :return: (i, j, distancia) com i < j, arrays
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    celulas = {}
+    cx = np.floor(x / raio_corte).astype(np.int64)
+    cy = np.floor(y / raio_corte).astype(np.int64)
+    for indice, chave in enumerate(zip(cx.tolist(), cy.tolist())):
+        celulas.setdefault(chave, []).append(indice)
+    celulas = {chave: np.array(indices) for chave, indices in celulas.items()}
+
+    lista_i, lista_j = [], []
+    for (gx, gy), indices in celulas.items():
+        # metade das vizinhas, para não repetir pares
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            outros = celulas.get((gx + dx, gy + dy))
+            if outros is None:
+                continue
+            i, j = np.meshgrid(indices, outros, indexing='ij')
+            i, j = i.ravel(), j.ravel()
+            manter = i < j if (dx, dy) == (0, 0) else i != j
+            lista_i.append(i[manter])
+            lista_j.append(j[manter])
+
+    if not lista_i:
+        vazio = np.array([], dtype=np.int64)
+        return vazio, vazio, np.array([])
+    i = np.concatenate(lista_i)
+    j = np.concatenate(lista_j)
+    distancia = np.hypot(x[i] - x[j], y[i] - y[j])
+    dentro = distancia < raio_corte
+    i, j, distancia = i[dentro], j[dentro], distancia[dentro]
+    trocar = i > j
+    i[trocar], j[trocar] = j[trocar], i[trocar].copy()
+    return i, j, distancia
+
+
+class RecalqueParque:
+    """
+    Recalque de um conjunto de tanques considerando a interação entre vizinhos.
+    """
+    def __init__(self, x, y, diametro, pressao, Esolo=20000.0, poisson=0.4):
+        """
+        :param x, y: coordenadas dos centros dos tanques (m)
+        :param diametro: diâmetro de cada tanque (m)
+        :param pressao: pressão de contato de cada tanque (kN/m²)
+        :param Esolo: módulo de elasticidade do solo (kN/m²), escalar ou por tanque
+        :param poisson: coeficiente de Poisson do solo, escalar ou por tanque
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        n = self.x.size
+        self.raio = np.broadcast_to(np.asarray(diametro, dtype=float) / 2, (n,)).copy()
+        self.pressao = np.broadcast_to(np.asarray(pressao, dtype=float), (n,)).copy()
+        self.Esolo = np.broadcast_to(np.asarray(Esolo, dtype=float), (n,)).copy()
+        self.poisson = np.broadcast_to(np.asarray(poisson, dtype=float), (n,)).copy()
+
+        if np.any(self.raio <= 0) or np.any(self.Esolo <= 0):
+            raise ValueError("Diâmetros e módulos de elasticidade devem ser maiores que zero.")
+
+    @classmethod
+    def de_casos(cls, casos, x, y):
+        """
+        Monta o parque a partir de casos no formato do arquivo JSON de entrada.
+
+        A pressão de contato é a tensão p = p1 + p2 - p3 de
+        DimensionamentoBase.verificar_tensao_solo_compactado.
+        """
+        from dados_entrada import EntradaDados
+        from dimensionamento_base import DimensionamentoBase
+        from processamento import montar_materiais
+
+        diametros, pressoes, modulos, poissons = [], [], [], []
+        for dados in casos:
+            entrada = EntradaDados()
+            entrada.definir_dados(dados)
+            base = DimensionamentoBase(None, entrada, montar_materiais(entrada))
+            diametros.append(entrada.geometria['diametro'])
+            pressoes.append(base.verificar_tensao_solo_compactado()['p_total'])
+            modulos.append(entrada.solo.get('Esolo', 20000.0))
+            poissons.append(entrada.solo.get('poisson', 0.4))
+        return cls(x, y, diametros, pressoes, modulos, poissons)
+
+    def raio_corte_padrao(self, tolerancia=0.02):
+        """
+        Raio de corte a partir do qual o recalque induzido pelo maior tanque
+        fica abaixo de `tolerancia` vezes o seu recalque no centro (decaimento 1/r).
+        """
+        return float(np.max(self.raio)) / (2 * tolerancia)
+
+    def calcular_recalque(self, raio_corte=None, estacoes=8, profundidade=None, divisoes=(4, 16)):
+        """
+        Calcula o recalque de cada tanque, próprio e induzido pelos vizinhos.
+
+        :param raio_corte: distância máxima entre centros para considerar interação (m);
+                           padrão: raio_corte_padrao()
+        :param estacoes: número de estações no perímetro de cada tanque
+        :param profundidade: profundidade (m) do acréscimo de tensão sob o centro;
+                             padrão: o raio do tanque receptor
+        :param divisoes: (anéis, setores) da discretização da área do vizinho no cálculo de tensão
+        :return: dicionário com os resultados por tanque e por par adjacente
+        """
+        n = self.x.size
+        raio_corte = raio_corte or self.raio_corte_padrao()
+        pi, pj, distancia = pares_vizinhos(self.x, self.y, raio_corte)
+
+        if np.any(distancia < self.raio[pi] + self.raio[pj]):
+            raise ValueError("Há tanques sobrepostos no parque.")
+
+        fator = (1 - self.poisson ** 2) / self.Esolo
+        proprio_centro = 2 * self.pressao * self.raio * fator
+        proprio_borda = 4 / np.pi * self.pressao * self.raio * fator
+
+        # Pontos de avaliação de cada tanque: centro + estações no perímetro
+        angulos = np.linspace(0, 2 * np.pi, estacoes, endpoint=False)
+        px = np.concatenate([np.zeros((1,)), np.cos(angulos)])
+        py = np.concatenate([np.zeros((1,)), np.sin(angulos)])
+
+        # Cada par contribui nos dois sentidos: receptor r recebe do emissor e
+        receptor = np.concatenate([pi, pj])
+        emissor = np.concatenate([pj, pi])
+        pontos_x = self.x[receptor, None] + self.raio[receptor, None] * px[None, :]
+        pontos_y = self.y[receptor, None] + self.raio[receptor, None] * py[None, :]
+        r = np.hypot(pontos_x - self.x[emissor, None], pontos_y - self.y[emissor, None])
+        induzido = recalque_externo_circular(
+            self.pressao[emissor, None], self.raio[emissor, None], r,
+            self.Esolo[receptor, None], self.poisson[receptor, None]
+        )
+        recalque_vizinhos = np.zeros((n, estacoes + 1))
+        np.add.at(recalque_vizinhos, receptor, induzido)
+
+        # Acréscimo de tensão sob o centro do receptor (Boussinesq, cargas pontuais sobre o vizinho)
+        z = self.raio if profundidade is None else np.broadcast_to(np.asarray(profundidade, float), (n,))
+        aneis, setores = divisoes
+        rho = (np.arange(aneis) + 0.5) / aneis
+        theta = (np.arange(setores) + 0.5) * 2 * np.pi / setores
+        rho_g, theta_g = np.meshgrid(rho, theta, indexing='ij')
+        peso = (rho_g * (1 / aneis) * (2 * np.pi / setores)).ravel()  # área relativa de cada célula (÷ a²)
+        qx = self.x[emissor, None] + self.raio[emissor, None] * (rho_g * np.cos(theta_g)).ravel()[None, :]
+        qy = self.y[emissor, None] + self.raio[emissor, None] * (rho_g * np.sin(theta_g)).ravel()[None, :]
+        carga = self.pressao[emissor, None] * self.raio[emissor, None] ** 2 * peso[None, :]
+        zr = z[receptor, None]
+        R2 = (qx - self.x[receptor, None]) ** 2 + (qy - self.y[receptor, None]) ** 2 + zr ** 2
+        tensao = (3 * carga * zr ** 3 / (2 * np.pi * R2 ** 2.5)).sum(axis=1)
+        acrescimo_tensao = np.bincount(receptor, weights=tensao, minlength=n)
+
+        estacoes_total = recalque_vizinhos.copy()
+        estacoes_total[:, 0] += proprio_centro
+        estacoes_total[:, 1:] += proprio_borda[:, None]
+
+        # Inclinação induzida: ajuste do primeiro harmônico nas estações do perímetro
+        perimetro = recalque_vizinhos[:, 1:]
+        a1 = 2 / estacoes * perimetro @ np.cos(angulos)
+        b1 = 2 / estacoes * perimetro @ np.sin(angulos)
+        inclinacao = np.hypot(a1, b1) / self.raio
+
+        # Pares adjacentes: folga entre costados menor que o maior diâmetro do par
+        folga = distancia - self.raio[pi] - self.raio[pj]
+        adjacente = folga <= 2 * np.maximum(self.raio[pi], self.raio[pj])
+        ai, aj, ad = pi[adjacente], pj[adjacente], distancia[adjacente]
+        diferencial = estacoes_total[ai, 0] - estacoes_total[aj, 0]
+
+        return {
+            'raio_corte_m': raio_corte,
+            'pares_avaliados': int(pi.size),
+            'recalque_proprio_mm': proprio_centro * 1000,
+            'recalque_vizinhos_mm': recalque_vizinhos[:, 0] * 1000,
+            'recalque_total_mm': estacoes_total[:, 0] * 1000,
+            'recalque_estacoes_mm': estacoes_total[:, 1:] * 1000,
+            'inclinacao_induzida': inclinacao,
+            'acrescimo_tensao_kN_m2': acrescimo_tensao,
+            'pares_adjacentes': {
+                'i': ai,
+                'j': aj,
+                'distancia_m': ad,
+                'recalque_diferencial_mm': diferencial * 1000,
+                'distorcao_angular': np.abs(diferencial) / ad,
+            },
+        }
@@ -20,42 +20,132 @@ class Relatorio:
         self.recalque = Recalque(entrada, materiais, self.base)
         
 
-    def gerar_html(self, caminho_saida="relatorio.html"):
-        dados_base = self.base.dimensionar()
-        dados_armadura = self.armadura.dimensionar_armaduras()
-        dados_recalque = self.recalque.calcular_recalque()
-        dados_estabilidade = self.analise.verificar_estabilidade()
-        dados_anel = self.base.calcular_espessura_anel()
-        dados_resistencia_anel = self.base.calcular_resistencia_anel()
-        tensao_fundacao = self.base.verificar_tensao_solo_compactado()
-        dados_tensao_anel = self.base.calcular_tensao_sobre_anel()
-        verificacao_arrancamento = self.base.verificar_arrancamento_concreto()
-        verificacao_pressao_apoio = self.base.verificar_pressao_maxima_apoio()
-        dados_momento_torsor = self.base.calcular_momento_torsor()
-        dados_momento_fletor = self.base.calcular_momento_fletor()
-        dados_esforco_cortante = self.base.calcular_esforco_cortante_perimetro()
-        dados_tracao_anel = self.base.calcular_tracao_anel()
-        dados_ps2 = self.base.calcular_ps2()
-        dados_altura_total = self.base.calcular_altura_total_H()
-        dados_ps3 = self.base.calcular_ps3()
-        dados_E2 = self.base.calcular_E2()
-        dados_tc = self.base.calcular_torcao_conjugada()
-        dados_armadura_tracao = self.base.calcular_armadura_tracao_lateral()
-        dados_linha_neutra = self.base.calcular_linha_neutra()
-        dados_taxa_armadura = self.base.calcular_taxa_armadura_rho()
-        dados_area_aco = self.base.calcular_area_aco_via_taxa_armadura()
-        dados_armadura_minima = self.base.calcular_armadura_minima()     
-       
-       
+    def calcular_resultados(self, rastreio=False):
+        """
+        Executa todas as verificações apresentadas no relatório, sem gerar saída.
+
+        :param rastreio: se True, inclui as linhas de memorial usadas pelos relatórios
+                         (montadas só quando exibidas); sem rastreio, o resultado contém
+                         apenas dados simples (serializável em JSON)
+        :return: dicionário com os resultados de cada seção do relatório
+        """
         fv = self.cargas.calcular_vento()
         hT = self.entrada.geometria.get('altura', 0)
         h1 = self.entrada.geometria.get('h1', 0)
         h2 = self.entrada.geometria.get('h2', 0)
         h3 = self.entrada.geometria.get('h3', 0)
-        Ca = 0.5
 
-        mvf = ((hT + h1)/2 + h2 + h3) * fv
-        mvt = (hT / 2) * fv
+        return {
+            'base': self.base.dimensionar(),
+            'armadura': self.armadura.dimensionar_armaduras(),
+            'recalque': self.recalque.calcular_recalque(),
+            'estabilidade': self.analise.verificar_estabilidade(),
+            'anel': self.base.calcular_espessura_anel(),
+            'resistencia_anel': self.base.calcular_resistencia_anel(),
+            'tensao_fundacao': self.base.verificar_tensao_solo_compactado(rastreio),
+            'tensao_anel': self.base.calcular_tensao_sobre_anel(),
+            'arrancamento': self.base.verificar_arrancamento_concreto(),
+            'pressao_apoio': self.base.verificar_pressao_maxima_apoio(),
+            'momento_torsor': self.base.calcular_momento_torsor(),
+            'momento_fletor': self.base.calcular_momento_fletor(),
+            'esforco_cortante': self.base.calcular_esforco_cortante_perimetro(),
+            'tracao_anel': self.base.calcular_tracao_anel(),
+            'ps2': self.base.calcular_ps2(),
+            'altura_total': self.base.calcular_altura_total_H(),
+            'ps3': self.base.calcular_ps3(),
+            'E2': self.base.calcular_E2(),
+            'torcao_conjugada': self.base.calcular_torcao_conjugada(),
+            'armadura_tracao': self.base.calcular_armadura_tracao_lateral(),
+            'linha_neutra': self.base.calcular_linha_neutra(),
+            'taxa_armadura': self.base.calcular_taxa_armadura_rho(),
+            'area_aco': self.base.calcular_area_aco_via_taxa_armadura(),
+            'armadura_minima': self.base.calcular_armadura_minima(),
+            'vento': {
+                'q_kN_m2': self.cargas.calcular_pressao_dinamica(),
+                'Fv_kN': fv,
+                'Ca': 0.5,
+                'Mvf_kNm': ((hT + h1) / 2 + h2 + h3) * fv,
+                'Mvt_kNm': (hT / 2) * fv
+            }
+        }
+
+    def gerar_pdf(self, caminho_saida="relatorio.pdf", resultados=None, cabecalho=None):
+        """
+        Gera o memorial de cálculo em PDF (requer o pacote reportlab).
+
+        :param caminho_saida: arquivo de saída
+        :param resultados: resultados já calculados por calcular_resultados(rastreio=True) (opcional)
+        :param cabecalho: campos do cabeçalho (numero, revisao, cliente, area, titulo, aviso)
+        """
+        from relatorio_pdf import escrever_pdf
+
+        if resultados is None:
+            resultados = self.calcular_resultados(rastreio=True)
+        escrever_pdf(self.entrada, resultados, caminho_saida, cabecalho)
+
+    def _html_sensibilidade(self, quantidade=5):
+        from sensibilidade import calcular_sensibilidade, SAIDAS_PRINCIPAIS
+
+        sensibilidade = calcular_sensibilidade(self.entrada, self.materiais)
+        linhas = []
+        for saida, descricao in SAIDAS_PRINCIPAIS:
+            if saida not in sensibilidade.saidas:
+                continue
+            itens = "".join(
+                f"<li>{entrada}: ∂/∂x = {derivada:.4g}; elasticidade = {elasticidade:+.3f}</li>"
+                for entrada, derivada, elasticidade in sensibilidade.principais(saida, quantidade)
+            )
+            linhas.append(f"<li><strong>{descricao}</strong><ul>{itens}</ul></li>")
+
+        return f"""
+            <h2>Análise de Sensibilidade</h2>
+            <p>Elasticidade = (∂y/∂x)⋅(x/y): variação percentual da saída para 1 % de variação da entrada.</p>
+            <ul>
+                {"".join(linhas)}
+            </ul>
+        """
+
+    def gerar_html(self, caminho_saida="relatorio.html", resultados=None, sensibilidade=False):
+        """
+        Gera o relatório em HTML.
+
+        :param caminho_saida: arquivo de saída
+        :param resultados: resultados já calculados por calcular_resultados(rastreio=True) (opcional)
+        :param sensibilidade: se True, inclui as elasticidades das principais verificações
+        """
+        if resultados is None:
+            resultados = self.calcular_resultados(rastreio=True)
+        secao_sensibilidade = self._html_sensibilidade() if sensibilidade else ""
+
+        dados_base = resultados['base']
+        dados_armadura = resultados['armadura']
+        dados_recalque = resultados['recalque']
+        dados_estabilidade = resultados['estabilidade']
+        dados_anel = resultados['anel']
+        dados_resistencia_anel = resultados['resistencia_anel']
+        tensao_fundacao = resultados['tensao_fundacao']
+        dados_tensao_anel = resultados['tensao_anel']
+        verificacao_arrancamento = resultados['arrancamento']
+        verificacao_pressao_apoio = resultados['pressao_apoio']
+        dados_momento_torsor = resultados['momento_torsor']
+        dados_momento_fletor = resultados['momento_fletor']
+        dados_esforco_cortante = resultados['esforco_cortante']
+        dados_tracao_anel = resultados['tracao_anel']
+        dados_ps2 = resultados['ps2']
+        dados_altura_total = resultados['altura_total']
+        dados_ps3 = resultados['ps3']
+        dados_E2 = resultados['E2']
+        dados_tc = resultados['torcao_conjugada']
+        dados_armadura_tracao = resultados['armadura_tracao']
+        dados_linha_neutra = resultados['linha_neutra']
+        dados_taxa_armadura = resultados['taxa_armadura']
+        dados_area_aco = resultados['area_aco']
+        dados_armadura_minima = resultados['armadura_minima']
+
+        fv = resultados['vento']['Fv_kN']
+        Ca = resultados['vento']['Ca']
+        mvf = resultados['vento']['Mvf_kNm']
+        mvt = resultados['vento']['Mvt_kNm']
 
         html = f"""
         <html>
@@ -81,7 +171,7 @@ class Relatorio:
                     self.entrada.cargas.get('vento_s1', 1.0) *
                     self.entrada.cargas.get('vento_s2', 1.0) *
                     self.entrada.cargas.get('vento_s3', 1.0):.2f} m/s</li>
-                <li>q (Pressão dinâmica): {self.entrada.cargas.get('pressao_vento', 0):.2f} kN/m²</li>
+                <li>q (Pressão dinâmica): {resultados['vento']['q_kN_m2']:.2f} kN/m²</li>
                 <li>Área Projetada (Ae): {
                     self.entrada.geometria.get('altura', 0) *
                     self.entrada.geometria.get('diametro', 0):.2f} m²</li>
@@ -294,6 +384,8 @@ class Relatorio:
                 <li>Recalque Estimado: {dados_recalque['recalque_estimado_mm']:.2f} mm</li>
             </ul>
 
+            {secao_sensibilidade}
+
             <p><strong>Observação:</strong> Todos os cálculos seguem parâmetros típicos de projeto e devem ser validados com base nas condições reais de obra e normas aplicáveis.</p>
         </body>
         </html>
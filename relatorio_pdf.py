@@ -0,0 +1,308 @@
+# relatorio_pdf.py
+
+"""
+Geração direta da memória de cálculo em PDF, no formato do documento de
+referência MC-31PE.05-6251-122-M9C-001 (cabeçalho com número, revisão,
+área, folha e título em todas as páginas e seções numeradas).
+
+Usa o pacote reportlab (sem navegador). Fontes, estilos e o modelo de
+página são preparados uma única vez por processo; gerar_pdfs distribui os
+casos entre processos, um memorial por caso.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import os
+from xml.sax.saxutils import escape
+
+from dados_entrada import EntradaDados
+
+# Fontes TrueType com símbolos gregos (σ, ϕ, ρ...), na ordem de preferência
+FONTES_CANDIDATAS = [
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
+    ('/Library/Fonts/Arial Unicode.ttf', '/Library/Fonts/Arial Unicode.ttf'),
+    ('/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+     '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf'),
+]
+
+CABECALHO_PADRAO = {
+    'numero': '',
+    'revisao': '0',
+    'cliente': '',
+    'area': '',
+    'titulo': 'BASE DE TANQUE',
+    'aviso': '',
+}
+
+_LAYOUT = None  # fontes, estilos e classe de página, preparados uma vez por processo
+
+
+def preparar_layout(fonte=None, fonte_negrito=None) -> dict:
+    """
+    Registra as fontes e monta estilos e modelo de página (uma vez por processo).
+
+    :param fonte: caminho de uma fonte TrueType (opcional)
+    :param fonte_negrito: caminho da variante em negrito (opcional)
+    :return: dicionário com os objetos de layout
+    """
+    global _LAYOUT
+    if _LAYOUT is not None:
+        return _LAYOUT
+
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.units import mm
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, KeepTogether
+    except ImportError:
+        raise ImportError("A geração de PDF requer o pacote reportlab (pip install reportlab).")
+
+    normal, negrito = 'Helvetica', 'Helvetica-Bold'
+    candidatas = [(fonte, fonte_negrito or fonte)] if fonte else FONTES_CANDIDATAS
+    for regular, bold in candidatas:
+        if os.path.exists(regular) and os.path.exists(bold):
+            pdfmetrics.registerFont(TTFont('IBcalc', regular))
+            pdfmetrics.registerFont(TTFont('IBcalc-Negrito', bold))
+            pdfmetrics.registerFontFamily('IBcalc', normal='IBcalc', bold='IBcalc-Negrito',
+                                          italic='IBcalc', boldItalic='IBcalc-Negrito')
+            normal, negrito = 'IBcalc', 'IBcalc-Negrito'
+            break
+
+    estilos = {
+        'secao': ParagraphStyle('secao', fontName=negrito, fontSize=11, leading=14, spaceBefore=10, spaceAfter=4),
+        'subsecao': ParagraphStyle('subsecao', fontName=negrito, fontSize=10, leading=13, spaceBefore=6, spaceAfter=2),
+        'texto': ParagraphStyle('texto', fontName=normal, fontSize=9.5, leading=12.5),
+        'item': ParagraphStyle('item', fontName=normal, fontSize=9.5, leading=12.5, leftIndent=14, bulletIndent=4),
+    }
+
+    class CanvasNumerado(canvas.Canvas):
+        """Canvas que adia o cabeçalho até saber o total de folhas ("FOLHA i de n")."""
+        def __init__(self, *args, cabecalho=None, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._cabecalho = cabecalho or CABECALHO_PADRAO
+            self._paginas = []
+
+        def showPage(self):
+            self._paginas.append(dict(self.__dict__))
+            self._startPage()
+
+        def save(self):
+            total = len(self._paginas)
+            for estado in self._paginas:
+                self.__dict__.update(estado)
+                _desenhar_cabecalho(self, self._cabecalho, self._pageNumber, total)
+                canvas.Canvas.showPage(self)
+            canvas.Canvas.save(self)
+
+    def _desenhar_cabecalho(c, cab, folha, total):
+        largura, altura = A4
+        x0, x1 = 15 * mm, largura - 15 * mm
+        topo, base = altura - 12 * mm, altura - 38 * mm
+        meio = x0 + 0.62 * (x1 - x0)
+        c.saveState()
+        c.setLineWidth(0.6)
+        c.rect(x0, base, x1 - x0, topo - base)
+        c.line(meio, base, meio, topo)
+        c.line(x0, topo - 9 * mm, x1, topo - 9 * mm)
+        c.line(meio, topo - 17.5 * mm, x1, topo - 17.5 * mm)
+        c.setFont(negrito, 12)
+        c.drawString(x0 + 3 * mm, topo - 6.5 * mm, "MEMÓRIA DE CÁLCULO")
+        c.setFont(normal, 7)
+        c.drawString(meio + 2 * mm, topo - 3.5 * mm, "Nº")
+        c.drawString(meio + 2 * mm, topo - 12 * mm, "REV.")
+        c.drawString(x0 + 2 * mm, topo - 12 * mm, "ÁREA:")
+        c.drawString(x0 + 2 * mm, topo - 20 * mm, "TÍTULO:")
+        c.setFont(negrito, 8.5)
+        c.drawString(meio + 8 * mm, topo - 7 * mm, cab.get('numero', ''))
+        c.drawString(meio + 12 * mm, topo - 15.5 * mm, str(cab.get('revisao', '')))
+        c.drawString(x0 + 14 * mm, topo - 15.5 * mm, cab.get('area', ''))
+        c.drawString(x0 + 14 * mm, topo - 23.5 * mm, cab.get('titulo', ''))
+        c.drawString(meio + 2 * mm, topo - 23.5 * mm, f"FOLHA {folha} de {total}")
+        if cab.get('cliente'):
+            c.setFont(normal, 7.5)
+            c.drawString(meio + 32 * mm, topo - 15.5 * mm, f"CLIENTE: {cab['cliente']}")
+        if cab.get('aviso'):
+            c.setFont(normal, 6.5)
+            c.drawCentredString(largura / 2, 8 * mm, cab['aviso'])
+        c.restoreState()
+
+    _LAYOUT = {
+        'A4': A4,
+        'mm': mm,
+        'estilos': estilos,
+        'CanvasNumerado': CanvasNumerado,
+        'Paragraph': Paragraph,
+        'Spacer': Spacer,
+        'KeepTogether': KeepTogether,
+        'SimpleDocTemplate': SimpleDocTemplate,
+    }
+    return _LAYOUT
+
+
+def _e(valor):
+    return escape(str(valor))
+
+
+def montar_secoes(entrada: EntradaDados, r: dict) -> list:
+    """
+    Organiza os resultados de Relatorio.calcular_resultados nas seções do memorial.
+
+    :return: lista de tuplas (nivel, titulo, linhas); nivel 1 = seção, 2 = subseção
+    """
+    g, s, c = entrada.geometria, entrada.solo, entrada.cargas
+    vento = r['vento']
+    Vk = c.get('vento_v0', 0) * c.get('vento_s1', 1.0) * c.get('vento_s2', 1.0) * c.get('vento_s3', 1.0)
+    tf, anel, ta = r['tensao_fundacao'], r['anel'], r['tensao_anel']
+    arr, ap = r['arrancamento'], r['pressao_apoio']
+    mt, mf, ec = r['momento_torsor'], r['momento_fletor'], r['esforco_cortante']
+    rec = r['recalque']
+
+    return [
+        (1, "1. OBJETIVO", [
+            "Esta memória apresenta as premissas e os cálculos desenvolvidos para o "
+            "dimensionamento da base em anel de concreto armado do tanque.",
+        ]),
+        (1, "2. ESPECIFICAÇÃO DOS MATERIAIS E DO SOLO", [
+            f"Tipo de solo: {_e(s.get('tipo', 'N/A'))}",
+            f"Tensão admissível do solo: σ<sub>adm</sub> = {r['base']['tensao_admissivel']:.2f} kN/m²",
+        ]),
+        (1, "3. DADOS DO EQUIPAMENTO E GEOMETRIA", [
+            f"Altura do tanque: {g.get('altura', 'N/A')} m",
+            f"Diâmetro do tanque: {g.get('diametro', 'N/A')} m",
+            f"Diâmetro da base: {g.get('diametro_base', 'N/A')} m",
+            f"Altura da base: {g.get('altura_base', 'N/A')} m",
+            f"Base 1 / Base 2: {g.get('lado_a_m', 'N/A')} m / {g.get('lado_b_m', 'N/A')} m",
+        ]),
+        (1, "4. CARGAS ATUANTES - VENTO (NBR 6123)", [
+            f"V₀ = {c.get('vento_v0', 0)} m/s; S₁ = {c.get('vento_s1', 1.0)}; "
+            f"S₂ = {c.get('vento_s2', 1.0)}; S₃ = {c.get('vento_s3', 1.0)}",
+            f"Vk = {Vk:.2f} m/s; q = {vento['q_kN_m2']:.2f} kN/m²",
+            f"Ae = {g.get('altura', 0) * g.get('diametro', 0):.2f} m²; Ca = {vento['Ca']}",
+            f"<b>Fv = {vento['Fv_kN']:.2f} kN</b>",
+            f"Mvf = ((hT + h1)/2 + h2 + h3)⋅Fv = {vento['Mvf_kNm']:.2f} kN⋅m",
+            f"Mvt = (hT/2)⋅Fv = {vento['Mvt_kNm']:.2f} kN⋅m",
+        ]),
+        (1, "5. ANÁLISE ESTRUTURAL E DIMENSIONAMENTO", []),
+        (2, "5.1 VERIFICAÇÃO DA BASE", [
+            _e(tf['p1_expressao']), _e(tf['p2_expressao']), _e(tf['p3_expressao']),
+            f"<b>{_e(tf['comparacao'])} → {_e(tf['verificacao'])}</b>",
+            f"ϕ = PTV / (π⋅dT) = {anel['phi_kN_m']} kN/m",
+            f"p6 = p1 + p2 - p4 - p5 = {anel['p6_kN_m2']} kN/m²; "
+            f"<b>b = ϕ / p6 = {anel['b_calc_m']} m</b>",
+            f"WA = (π/32)⋅[(ØB⁴ - Ø⁴)/ØB] = {r['resistencia_anel']['WA_m3']} m³",
+            f"p7 = {ta['p7_kN_m2']} kN/m²; p8 = {ta['p8_kN_m2']} kN/m²; "
+            f"<b>P = p4 + p5 + p7 + p8 = {ta['p_total_kN_m2']} kN/m²</b>",
+            f"Arrancamento: Pg = {arr['Pg']} kN; Pf = {arr['Pf']} kN; Ta = {arr['Ta']} kN/m; "
+            f"Pg + Pf + ϕ = {arr['resistencia_total']} → <b>{_e(arr['verificacao'])}</b>",
+            f"σC'máx = (ϕ + Mvt/Área) / e = {ap['tensao_maxima_kN_m2']} kN/m²",
+            f"σ<sub>adm</sub> = {ap['tensao_admissivel_kN_m2']} kN/m² → <b>{_e(ap['verificacao_adm'])}</b>; "
+            f"f<sub>cd</sub> = {ap['fcd_kN_m2']} kN/m² → <b>{_e(ap['verificacao_fcd'])}</b>",
+        ]),
+        (2, "5.2 DIMENSIONAMENTO DAS ARMADURAS", [
+            f"MT = ρL⋅hT⋅b₂⋅(b/2 − b₂/2) − ϕ⋅(b/2 − b₁) = {mt['MT_kN_m_por_m']} kN⋅m/m",
+            f"MF = MT⋅(Ø + b)/2 = {mf['MF_kN_m_por_m']} kN⋅m/m",
+            f"Cortante: qi = {_e(ec.get('qi_kN_m2', 'N/A'))} kN/m²; V = {_e(ec.get('V_kN_m', 'N/A'))} kN/m",
+            f"h₀ = p₂/ρL = {r['tracao_anel']['h0_m']} m; H = h + h₀ = {r['altura_total']['H_m']} m",
+            f"ps₂ = {r['ps2']['ps2_kN_m2']} kN/m²; ps₃ = {r['ps3']['ps3_kN_m2']} kN/m²; "
+            f"E₂ = {r['E2']['E2_kN']} kN; Tc = {r['torcao_conjugada']['Tc_kN_m']} kN⋅m",
+            f"<b>As (tração lateral) = {r['armadura_tracao']['As_tracao_cm2']} cm²</b>",
+            f"Md = {r['linha_neutra']['Md_kNm_m']} kN⋅m/m; y/d = {r['linha_neutra']['y_d_ratio']}; "
+            f"ρ = {r['taxa_armadura']['rho_taxa_armadura']}",
+            f"<b>As = ρ⋅b<sub>w</sub>⋅d = {r['area_aco']['As_cm2']} cm²</b>; "
+            f"A<sub>s,min</sub> = {r['armadura_minima']['As_min_cm2']} cm²",
+        ]),
+        (2, "5.3 AVALIAÇÃO DO RECALQUE IMEDIATO", [
+            f"q = {rec['tensao_media_kN_m2']:.2f} kN/m²; E = {rec['modulo_elasticidade_kN_m2']} kN/m²; "
+            f"ν = {rec['coef_poisson']}; I = {rec['fator_influencia']}",
+            f"<b>Recalque estimado: {rec['recalque_estimado_mm']:.2f} mm</b>",
+            f"Fator de segurança ao tombamento: {r['estabilidade']['fator_seguranca']:.2f}",
+        ]),
+        (1, "6. CONCLUSÃO", [
+            f"Tensão no solo compactado: {_e(tf['verificacao'])}",
+            f"Arrancamento do concreto: {_e(arr['verificacao'])}",
+            f"Pressão máxima de apoio (σ<sub>adm</sub>): {_e(ap['verificacao_adm'])}",
+            f"Pressão máxima de apoio (f<sub>cd</sub>): {_e(ap['verificacao_fcd'])}",
+        ]),
+    ]
+
+
+def escrever_pdf(entrada: EntradaDados, resultados: dict, caminho_saida: str, cabecalho: dict = None):
+    """
+    Grava o memorial em PDF a partir de resultados já calculados.
+
+    :param entrada: Instância de EntradaDados do caso
+    :param resultados: dicionário de Relatorio.calcular_resultados(rastreio=True)
+    :param caminho_saida: arquivo PDF de saída
+    :param cabecalho: campos do cabeçalho (numero, revisao, cliente, area, titulo, aviso)
+    """
+    layout = preparar_layout()
+    mm, estilos = layout['mm'], layout['estilos']
+    Paragraph = layout['Paragraph']
+    cab = dict(CABECALHO_PADRAO, **(cabecalho or {}))
+
+    historia = []
+    for nivel, titulo, linhas in montar_secoes(entrada, resultados):
+        bloco = [Paragraph(titulo, estilos['secao' if nivel == 1 else 'subsecao'])]
+        bloco += [Paragraph(linha, estilos['item'], bulletText='•') for linha in linhas]
+        historia.append(layout['KeepTogether'](bloco))
+    historia.append(layout['Spacer'](1, 6 * mm))
+    historia.append(Paragraph(
+        "<b>Observação:</b> Todos os cálculos seguem parâmetros típicos de projeto e devem ser "
+        "validados com base nas condições reais de obra e normas aplicáveis.", estilos['texto']))
+
+    documento = layout['SimpleDocTemplate'](
+        caminho_saida, pagesize=layout['A4'],
+        leftMargin=18 * mm, rightMargin=18 * mm, topMargin=44 * mm, bottomMargin=16 * mm,
+        title=f"Memória de Cálculo {cab['numero']}".strip(), author="IBcalc",
+    )
+    documento.build(historia, canvasmaker=lambda *a, **k: layout['CanvasNumerado'](*a, cabecalho=cab, **k))
+
+
+def _gerar_pdf_caso(tarefa):
+    from processamento import montar_materiais
+    from relatorio import Relatorio
+
+    dados, caminho = tarefa
+    entrada = EntradaDados()
+    entrada.definir_dados(dados)
+    entrada.validar_dados()
+    relatorio = Relatorio(entrada, montar_materiais(entrada))
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        resultados = relatorio.calcular_resultados(rastreio=True)
+    escrever_pdf(entrada, resultados, caminho, dados.get('documento'))
+    return caminho
+
+
+def gerar_pdfs(casos, diretorio: str, processos: int = None, nomes=None) -> list:
+    """
+    Gera um memorial em PDF por caso, em paralelo.
+
+    Cada caso pode trazer uma seção opcional 'documento' com os campos do
+    cabeçalho (numero, revisao, cliente, area, titulo, aviso).
+
+    :param casos: sequência de dicionários no formato do arquivo JSON de entrada
+    :param diretorio: diretório de saída (criado se necessário)
+    :param processos: número de processos (padrão: os.cpu_count())
+    :param nomes: nomes dos arquivos; padrão: número do documento ou 'memorial_0001.pdf'...
+    :return: lista de caminhos gerados, na ordem dos casos
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    tarefas = []
+    for i, dados in enumerate(casos):
+        if nomes is not None:
+            nome = nomes[i]
+        else:
+            numero = dados.get('documento', {}).get('numero')
+            nome = f"{numero}.pdf" if numero else f"memorial_{i + 1:04d}.pdf"
+        tarefas.append((dados, os.path.join(diretorio, nome)))
+
+    processos = processos or os.cpu_count() or 1
+    if processos <= 1:
+        return [_gerar_pdf_caso(tarefa) for tarefa in tarefas]
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=preparar_layout) as executor:
+        return list(executor.map(_gerar_pdf_caso, tarefas, chunksize=max(1, len(tarefas) // (4 * processos))))
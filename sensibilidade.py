@@ -0,0 +1,262 @@
+# sensibilidade.py
+
+"""
+Análise de sensibilidade por diferenciação automática em modo direto.
+
+Cada entrada numérica é substituída por um número dual (valor + vetor de
+derivadas parciais) e o cálculo completo do relatório é executado uma única
+vez com esses números. As fórmulas existentes em Cargas, AnaliseEstrutural,
+DimensionamentoBase e Recalque propagam as derivadas exatas de todas as
+saídas em relação a todas as entradas, sem as N+1 execuções das diferenças
+finitas.
+
+Os arredondamentos intermediários (round) são tratados como identidade para
+as derivadas: o resultado é a derivada da fórmula, não da função em degraus.
+"""
+
+import copy
+import math
+
+import numpy as np
+
+from caso import Caso
+from dados_entrada import EntradaDados
+from materiais import Materiais
+
+# Saídas apresentadas na seção de sensibilidade do memorial
+SAIDAS_PRINCIPAIS = [
+    ('tensao_fundacao.p_total', 'Tensão no solo compactado (p)'),
+    ('anel.b_calc_m', 'Espessura calculada do anel (b)'),
+    ('tensao_anel.p_total_kN_m2', 'Tensão sobre o anel (P)'),
+    ('arrancamento.Ta', 'Tração no arrancamento (Ta)'),
+    ('pressao_apoio.tensao_maxima_kN_m2', "Pressão máxima de apoio (σC'máx)"),
+    ('armadura_tracao.As_tracao_cm2', 'Armadura de tração lateral (As)'),
+    ('area_aco.As_cm2', 'Armadura de flexão (As)'),
+    ('recalque.recalque_estimado_mm', 'Recalque estimado'),
+]
+
+
+class Dual:
+    """
+    Número dual com vetor de derivadas: valor + Σ derivadas[i]·εᵢ.
+    """
+    __slots__ = ('valor', 'derivadas')
+    __hash__ = None
+    __array_ufunc__ = None  # operações com escalares do NumPy retornam Dual
+
+    def __init__(self, valor, derivadas):
+        self.valor = valor
+        self.derivadas = derivadas
+
+    @staticmethod
+    def _partes(outro):
+        if isinstance(outro, Dual):
+            return outro.valor, outro.derivadas
+        return outro, 0.0
+
+    def __add__(self, outro):
+        v, d = self._partes(outro)
+        return Dual(self.valor + v, self.derivadas + d)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        v, d = self._partes(outro)
+        return Dual(self.valor - v, self.derivadas - d)
+
+    def __rsub__(self, outro):
+        return Dual(outro - self.valor, -self.derivadas)
+
+    def __mul__(self, outro):
+        if isinstance(outro, Dual):
+            return Dual(self.valor * outro.valor, self.derivadas * outro.valor + outro.derivadas * self.valor)
+        return Dual(self.valor * outro, self.derivadas * outro)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        if isinstance(outro, Dual):
+            valor = self.valor / outro.valor
+            return Dual(valor, (self.derivadas - outro.derivadas * valor) / outro.valor)
+        return Dual(self.valor / outro, self.derivadas / outro)
+
+    def __rtruediv__(self, outro):
+        valor = outro / self.valor
+        return Dual(valor, -self.derivadas * (valor / self.valor))
+
+    def __pow__(self, expoente):
+        if isinstance(expoente, Dual):
+            valor = self.valor ** expoente.valor
+            return Dual(valor, valor * (expoente.derivadas * math.log(self.valor)
+                                        + expoente.valor * self.derivadas / self.valor))
+        return Dual(self.valor ** expoente, self.derivadas * (expoente * self.valor ** (expoente - 1)))
+
+    def __rpow__(self, base):
+        valor = base ** self.valor
+        return Dual(valor, self.derivadas * (valor * math.log(base)))
+
+    def __neg__(self):
+        return Dual(-self.valor, -self.derivadas)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.valor < 0 else self
+
+    def __round__(self, casas=None):
+        return Dual(round(self.valor, casas), self.derivadas)
+
+    def __float__(self):
+        return float(self.valor)
+
+    def __bool__(self):
+        return bool(self.valor)
+
+    def __eq__(self, outro):
+        return self.valor == self._partes(outro)[0]
+
+    def __ne__(self, outro):
+        return self.valor != self._partes(outro)[0]
+
+    def __lt__(self, outro):
+        return self.valor < self._partes(outro)[0]
+
+    def __le__(self, outro):
+        return self.valor <= self._partes(outro)[0]
+
+    def __gt__(self, outro):
+        return self.valor > self._partes(outro)[0]
+
+    def __ge__(self, outro):
+        return self.valor >= self._partes(outro)[0]
+
+    def __format__(self, especificacao):
+        return format(self.valor, especificacao)
+
+    def __str__(self):
+        return str(self.valor)
+
+    def __repr__(self):
+        return f"Dual({self.valor!r})"
+
+
+def _numerico(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def listar_entradas(entrada: EntradaDados, materiais: Materiais) -> list:
+    """
+    Lista as entradas numéricas do cálculo, como caminhos 'secao.chave'.
+
+    :return: lista de tuplas (nome, dicionário de origem, chave)
+    """
+    fontes = [
+        ('geometria', entrada.geometria),
+        ('solo', entrada.solo),
+        ('cargas', entrada.cargas),
+        ('dados_tanque', entrada.dados_tanque),
+        ('materiais.concreto', materiais.concreto),
+        ('materiais.aco', materiais.aco),
+        ('materiais.solo', materiais.solo),
+    ]
+    entradas = []
+    for secao, dicionario in fontes:
+        for chave, valor in dicionario.items():
+            if _numerico(valor) and chave != 'pressao_vento':  # pressao_vento é saída de Cargas
+                entradas.append((f"{secao}.{chave}", dicionario, chave))
+    return entradas
+
+
+def _coletar_saidas(resultados, prefixo, saidas):
+    for chave, valor in resultados.items():
+        nome = f"{prefixo}.{chave}" if prefixo else chave
+        if isinstance(valor, dict):
+            _coletar_saidas(valor, nome, saidas)
+        elif isinstance(valor, Dual):
+            saidas[nome] = valor
+
+
+class Sensibilidade:
+    """
+    Resultado de uma análise de sensibilidade: valores e matriz jacobiana.
+    """
+    def __init__(self, entradas, valores_entrada, saidas, valores_saida, jacobiana):
+        self.entradas = entradas              # nomes das entradas (colunas)
+        self.valores_entrada = valores_entrada
+        self.saidas = saidas                  # nomes das saídas (linhas)
+        self.valores_saida = valores_saida
+        self.jacobiana = jacobiana            # ∂saída/∂entrada, shape (n_saidas, n_entradas)
+
+    def derivada(self, saida: str, entrada: str) -> float:
+        """
+        Retorna ∂saida/∂entrada, ex.: derivada('pressao_apoio.tensao_maxima_kN_m2', 'geometria.lado_a_m').
+        """
+        return float(self.jacobiana[self.saidas.index(saida), self.entradas.index(entrada)])
+
+    def elasticidades(self) -> np.ndarray:
+        """
+        Elasticidades normalizadas (∂y/∂x)·(x/y): variação percentual da saída
+        para 1 % de variação da entrada. Saídas nulas resultam em zero.
+        """
+        x = np.asarray(self.valores_entrada, dtype=float)
+        y = np.asarray(self.valores_saida, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            e = self.jacobiana * x[np.newaxis, :] / y[:, np.newaxis]
+        return np.where(np.isfinite(e), e, 0.0)
+
+    def principais(self, saida: str, quantidade: int = 5) -> list:
+        """
+        Entradas de maior elasticidade (em módulo) para uma saída.
+
+        :return: lista de tuplas (entrada, derivada, elasticidade)
+        """
+        i = self.saidas.index(saida)
+        elasticidades = self.elasticidades()[i]
+        ordem = np.argsort(-np.abs(elasticidades))
+        return [
+            (self.entradas[j], float(self.jacobiana[i, j]), float(elasticidades[j]))
+            for j in ordem[:quantidade] if elasticidades[j] != 0
+        ]
+
+
+def calcular_sensibilidade(entrada: EntradaDados, materiais: Materiais) -> Sensibilidade:
+    """
+    Calcula as derivadas exatas de todas as saídas do relatório em relação a
+    todas as entradas numéricas, em uma única execução com números duais.
+
+    As instâncias recebidas não são alteradas.
+
+    :param entrada: Instância de EntradaDados ou Caso
+    :param materiais: Instância de Materiais
+    :return: instância de Sensibilidade
+    """
+    from relatorio import Relatorio
+
+    entrada_dual = entrada.para_entrada() if isinstance(entrada, Caso) else copy.deepcopy(entrada)
+    materiais_dual = copy.deepcopy(materiais)
+    entradas = listar_entradas(entrada_dual, materiais_dual)
+    n = len(entradas)
+
+    valores_entrada = []
+    for i, (_, dicionario, chave) in enumerate(entradas):
+        semente = np.zeros(n)
+        semente[i] = 1.0
+        valores_entrada.append(float(dicionario[chave]))
+        dicionario[chave] = Dual(float(dicionario[chave]), semente)
+
+    saidas = {}
+    _coletar_saidas(Relatorio(entrada_dual, materiais_dual).calcular_resultados(), '', saidas)
+
+    nomes_saida = list(saidas)
+    jacobiana = np.zeros((len(nomes_saida), n))
+    for linha, nome in enumerate(nomes_saida):
+        jacobiana[linha] = saidas[nome].derivadas
+
+    return Sensibilidade(
+        [nome for nome, _, _ in entradas],
+        valores_entrada,
+        nomes_saida,
+        [saidas[nome].valor for nome in nomes_saida],
+        jacobiana,
+    )
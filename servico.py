@@ -0,0 +1,286 @@
+# servico.py
+
+"""
+Serviço local de cálculo (HTTP/JSON) para uso por outras ferramentas.
+
+Rotas:
+    POST /calcular   corpo: caso no formato do arquivo JSON de entrada
+                     resposta: {"hash": ..., "origem": "calculo"|"cache"|"agrupado", "resultados": {...}}
+    GET  /saude      estado do serviço (fila, cache, contadores)
+
+O cálculo roda em um pool de processos aquecido na inicialização. Pedidos
+simultâneos com a mesma entrada (mesmo hash) são agrupados em um único
+cálculo, e os resultados ficam em um cache LRU limitado. Quando a fila de
+cálculos atinge o limite, novos pedidos recebem 503 com Retry-After.
+
+Uso:
+    python servico.py --porta 8765 --processos 4
+"""
+
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import http.client
+import json
+import os
+
+from caso import Caso
+from processamento import calcular_caso_silencioso
+
+MOTIVOS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+TAMANHO_MAXIMO_CORPO = 1 << 20  # 1 MiB
+
+
+def _aquecer():
+    """Inicializador dos processos: importa o motor e calcula o caso de referência uma vez."""
+    from gerador_casos import gerar_casos
+    calcular_caso_silencioso(gerar_casos(1)[0])
+
+
+def _pronto():
+    return os.getpid()
+
+
+def hash_entrada(dados: dict) -> str:
+    """
+    Hash do conteúdo de um caso, independente da ordem das chaves (Caso.hash).
+    """
+    return Caso.de_dados(dados).hash
+
+
+class ErroServico(Exception):
+    """Erro com código de status HTTP."""
+    def __init__(self, status, mensagem, cabecalhos=None):
+        super().__init__(mensagem)
+        self.status = status
+        self.cabecalhos = cabecalhos or {}
+
+
+class ServicoCalculo:
+    """
+    Servidor HTTP/JSON assíncrono sobre um pool de processos de cálculo.
+    """
+    def __init__(self, host='127.0.0.1', porta=8765, processos=None, tamanho_cache=1024, limite_fila=64):
+        """
+        :param host: endereço de escuta
+        :param porta: porta de escuta (0 = porta livre escolhida pelo sistema)
+        :param processos: número de processos de cálculo (padrão: os.cpu_count())
+        :param tamanho_cache: número máximo de resultados mantidos em cache
+        :param limite_fila: número máximo de cálculos distintos em andamento
+        """
+        self.host = host
+        self.porta = porta
+        self.processos = processos or os.cpu_count() or 1
+        self.tamanho_cache = tamanho_cache
+        self.limite_fila = limite_fila
+        self._cache = OrderedDict()
+        self._em_andamento = {}
+        self._executor = None
+        self._servidor = None
+        self.contadores = {'pedidos': 0, 'calculos': 0, 'cache': 0, 'agrupados': 0, 'recusados': 0, 'erros': 0}
+
+    async def iniciar(self):
+        """Cria e aquece o pool de processos e começa a aceitar conexões."""
+        loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(max_workers=self.processos, initializer=_aquecer)
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _pronto) for _ in range(self.processos)))
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def encerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def executar(self):
+        """Inicia o serviço e atende até ser interrompido."""
+        await self.iniciar()
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.encerrar()
+
+    def estado(self) -> dict:
+        return {
+            'processos': self.processos,
+            'em_andamento': len(self._em_andamento),
+            'limite_fila': self.limite_fila,
+            'cache': len(self._cache),
+            'tamanho_cache': self.tamanho_cache,
+            'contadores': dict(self.contadores),
+        }
+
+    async def calcular(self, dados: dict):
+        """
+        Calcula um caso, usando o cache e agrupando pedidos idênticos em andamento.
+
+        :return: (hash, origem, resultados)
+        """
+        caso = Caso.de_dados(dados)
+        chave = caso.hash
+
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            self.contadores['cache'] += 1
+            return chave, 'cache', self._cache[chave]
+
+        if chave in self._em_andamento:
+            self.contadores['agrupados'] += 1
+            return chave, 'agrupado', await asyncio.shield(self._em_andamento[chave])
+
+        if len(self._em_andamento) >= self.limite_fila:
+            self.contadores['recusados'] += 1
+            raise ErroServico(503, "Fila de cálculo cheia; tente novamente.", {'Retry-After': '1'})
+
+        loop = asyncio.get_running_loop()
+        futuro = loop.run_in_executor(self._executor, calcular_caso_silencioso, caso)
+        self._em_andamento[chave] = futuro
+        try:
+            resultados = await asyncio.shield(futuro)
+        finally:
+            del self._em_andamento[chave]
+
+        self.contadores['calculos'] += 1
+        self._cache[chave] = resultados
+        if len(self._cache) > self.tamanho_cache:
+            self._cache.popitem(last=False)
+        return chave, 'calculo', resultados
+
+    async def _rotear(self, metodo, caminho, corpo):
+        if caminho == '/saude':
+            if metodo != 'GET':
+                raise ErroServico(405, "Use GET em /saude.")
+            return self.estado()
+
+        if caminho == '/calcular':
+            if metodo != 'POST':
+                raise ErroServico(405, "Use POST em /calcular.")
+            try:
+                dados = json.loads(corpo or b'{}')
+            except ValueError as e:
+                raise ErroServico(400, f"JSON inválido: {e}")
+            if not isinstance(dados, dict):
+                raise ErroServico(400, "O corpo deve ser um objeto JSON.")
+            try:
+                chave, origem, resultados = await self.calcular(dados)
+            except (ValueError, KeyError, TypeError, ZeroDivisionError) as e:
+                raise ErroServico(400, str(e))
+            return {'hash': chave, 'origem': origem, 'resultados': resultados}
+
+        raise ErroServico(404, f"Rota desconhecida: {caminho}")
+
+    async def _ler_pedido(self, leitor):
+        linha = await leitor.readline()
+        if not linha:
+            return None
+        try:
+            metodo, caminho, _ = linha.decode('latin-1').split()
+        except ValueError:
+            raise ErroServico(400, "Linha de pedido inválida.")
+
+        cabecalhos = {}
+        while True:
+            linha = await leitor.readline()
+            if linha in (b'\r\n', b'\n', b''):
+                break
+            nome, _, valor = linha.decode('latin-1').partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+
+        try:
+            tamanho = int(cabecalhos.get('content-length', 0) or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            raise ErroServico(400, "Content-Length inválido.")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroServico(413, "Corpo do pedido muito grande.")
+        corpo = await leitor.readexactly(tamanho) if tamanho else b''
+        manter = cabecalhos.get('connection', '').lower() != 'close'
+        return metodo.upper(), caminho.split('?', 1)[0], corpo, manter
+
+    async def _atender(self, leitor, escritor):
+        try:
+            while True:
+                manter = False
+                cabecalhos = {}
+                try:
+                    pedido = await self._ler_pedido(leitor)
+                    if pedido is None:
+                        break
+                    metodo, caminho, corpo, manter = pedido
+                    self.contadores['pedidos'] += 1
+                    status, resposta = 200, await self._rotear(metodo, caminho, corpo)
+                except ErroServico as e:
+                    status, resposta, cabecalhos = e.status, {'erro': str(e)}, e.cabecalhos
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    self.contadores['erros'] += 1
+                    status, resposta = 500, {'erro': str(e)}
+
+                conteudo = json.dumps(resposta, ensure_ascii=False, default=str).encode('utf-8')
+                cabecalhos.update({
+                    'Content-Type': 'application/json; charset=utf-8',
+                    'Content-Length': str(len(conteudo)),
+                    'Connection': 'keep-alive' if manter else 'close',
+                })
+                cabecalho = f"HTTP/1.1 {status} {MOTIVOS.get(status, '')}\r\n" + "".join(
+                    f"{nome}: {valor}\r\n" for nome, valor in cabecalhos.items()
+                ) + "\r\n"
+                escritor.write(cabecalho.encode('latin-1') + conteudo)
+                await escritor.drain()
+                if not manter:
+                    break
+        finally:
+            escritor.close()
+
+
+class ClienteServico:
+    """
+    Cliente mínimo (bloqueante) do serviço, mantendo a conexão aberta entre pedidos.
+    """
+    def __init__(self, host='127.0.0.1', porta=8765, tempo_limite=60):
+        self.conexao = http.client.HTTPConnection(host, porta, timeout=tempo_limite)
+
+    def _pedir(self, metodo, caminho, dados=None):
+        corpo = json.dumps(dados).encode('utf-8') if dados is not None else None
+        self.conexao.request(metodo, caminho, body=corpo, headers={'Content-Type': 'application/json'})
+        resposta = self.conexao.getresponse()
+        conteudo = json.loads(resposta.read().decode('utf-8'))
+        if resposta.status != 200:
+            raise ErroServico(resposta.status, conteudo.get('erro', ''), dict(resposta.getheaders()))
+        return conteudo
+
+    def calcular(self, dados: dict) -> dict:
+        return self._pedir('POST', '/calcular', dados)
+
+    def saude(self) -> dict:
+        return self._pedir('GET', '/saude')
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço local de cálculo do IBcalc.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--cache', type=int, default=1024, help="resultados mantidos em cache")
+    parser.add_argument('--fila', type=int, default=64, help="cálculos simultâneos antes de recusar pedidos")
+    args = parser.parse_args(argv)
+
+    servico = ServicoCalculo(args.host, args.porta, args.processos, args.cache, args.fila)
+    try:
+        asyncio.run(servico.executar())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# sismo.py
+
+"""
+Ação sísmica em tanques: massas hidrodinâmicas, períodos, altura de onda,
+cortante e momento de tombamento, e as verificações do anel com o momento
+sísmico no lugar do momento do vento.
+
+Modelo (Malhotra, Wenk & Wieland, 2000; EN 1998-4, Anexo A; combinação e
+coeficientes da API 650, Anexo E), para tanque apoiado com líquido de altura
+H e raio R:
+  - massas impulsiva e convectiva, alturas de aplicação e coeficientes dos
+    períodos tabelados em função de H/R (TABELA_MASSAS), interpolados
+    linearmente (fora da faixa da tabela, adota-se o valor extremo);
+  - Ti = Ci · H · √ρ / (√(s/R) · √E)   (s: espessura equivalente do costado)
+    Tc = Cc · √R;
+  - Ai = Sa(Ti) · I / Rwi, Ac = K · Sa(Tc) · I / Rwc (K converte o espectro
+    de 5% para 0,5% de amortecimento);
+  - cortante V = √((Ai·(Wi + Ws))² + (Ac·Wc)²) e momento sobre o anel
+    M = √((Ai·(Wi·hi + Ws·hs))² + (Ac·Wc·hc)²), com Ws = PTV aplicado a hT/2;
+  - altura da onda δs = 0,42 · D · Af, Af = K · Sa(Tc) · I (sem Rwc: a onda
+    não é reduzida pela ductilidade).
+
+As verificações são as do vento, compiladas de grafo_formulas com o momento
+sísmico M no lugar de Mvt e Mvf (compilar(..., fixas=('Mvt', 'Mvf'))): Ta
+(arrancamento), σc,max (pressão de apoio), P_anel e o fator de segurança ao
+tombamento.
+
+Espectros de resposta (Sa em g) são guardados em uma grade comum de
+períodos (Espectros); a consulta de todos os períodos do lote em todos os
+espectros é uma única interpolação vetorizada. Os resultados têm a forma
+(espectros, casos, níveis de enchimento).
+"""
+
+import numpy as np
+
+from grafo_formulas import compilar
+
+# H/R, Ci, Cc (s/m^0,5), mi/m, mc/m, hi/H, hc/H (Malhotra et al., 2000, Tabela 1)
+TABELA_MASSAS = np.array([
+    (0.3, 9.28, 2.09, 0.176, 0.824, 0.400, 0.521),
+    (0.5, 7.74, 1.74, 0.300, 0.700, 0.400, 0.543),
+    (0.7, 6.97, 1.60, 0.414, 0.586, 0.401, 0.571),
+    (1.0, 6.36, 1.52, 0.548, 0.452, 0.419, 0.616),
+    (1.5, 6.06, 1.48, 0.686, 0.314, 0.439, 0.690),
+    (2.0, 6.21, 1.48, 0.763, 0.237, 0.448, 0.751),
+    (2.5, 6.56, 1.48, 0.810, 0.190, 0.452, 0.794),
+    (3.0, 7.03, 1.48, 0.842, 0.158, 0.453, 0.825),
+])
+
+# NBR 15421, Tabela 3: classe do terreno → (Ca, Cv) para ag <= 0,10 g
+FATORES_SOLO_NBR15421 = {'A': (0.8, 0.8), 'B': (1.0, 1.0), 'C': (1.2, 1.7), 'D': (1.6, 2.4), 'E': (2.5, 3.5)}
+
+PERIODOS_PADRAO = np.concatenate([[0.0], np.logspace(-2, 1.5, 400)])
+MODULO_ACO = 200000e6  # N/m² (Materiais.aco['modulo_elasticidade'])
+GRAVIDADE = 9.81
+
+_VERIFICACOES_ANEL = ('arrancamento', 'pressao_apoio_adm', 'pressao_apoio_fcd')
+_GRANDEZAS = ('Ta', 'sigma_cmax', 'P_anel', 'fator_seguranca') + tuple(
+    f'{prefixo}_{nome}' for nome in _VERIFICACOES_ANEL for prefixo in ('utilizacao', 'atende'))
+_MOMENTOS = ('Mvt', 'Mvf')
+
+
+class Espectros:
+    """
+    Conjunto de espectros de resposta (Sa em g, 5% de amortecimento) em uma grade comum de períodos.
+    """
+    def __init__(self, periodos, aceleracoes, nomes=None):
+        """
+        :param periodos: grade crescente de períodos (s), começando em 0
+        :param aceleracoes: array (espectros, períodos) com Sa (g)
+        :param nomes: identificação de cada espectro
+        """
+        self.periodos = np.asarray(periodos, dtype=float)
+        self.aceleracoes = np.atleast_2d(np.asarray(aceleracoes, dtype=float))
+        if self.aceleracoes.shape[1] != self.periodos.size or np.any(np.diff(self.periodos) <= 0):
+            raise ValueError("Os espectros devem ser dados em uma grade crescente de períodos.")
+        self.nomes = list(nomes) if nomes is not None else [str(i) for i in range(len(self))]
+
+    def __len__(self):
+        return len(self.aceleracoes)
+
+    @classmethod
+    def de_pontos(cls, espectros, nomes=None, periodos=PERIODOS_PADRAO) -> 'Espectros':
+        """
+        Reamostra espectros dados por pontos para a grade comum.
+
+        :param espectros: lista de pares (períodos, Sa) — por exemplo, os de cada sítio
+        """
+        aceleracoes = [np.interp(periodos, np.asarray(T, dtype=float), np.asarray(Sa, dtype=float))
+                       for T, Sa in espectros]
+        return cls(periodos, aceleracoes, nomes)
+
+    @classmethod
+    def nbr15421(cls, ag, classe='C', periodos=PERIODOS_PADRAO) -> 'Espectros':
+        """
+        Espectros de projeto da NBR 15421 (item 6.3).
+
+        :param ag: aceleração sísmica horizontal característica (g), escalar ou array
+        :param classe: classe do terreno ('A' a 'E'), escalar ou array do tamanho de ag
+        """
+        ag = np.atleast_1d(np.asarray(ag, dtype=float))
+        classes = np.broadcast_to(np.asarray(classe), ag.shape)
+        Ca, Cv = np.array([FATORES_SOLO_NBR15421[str(c).upper()] for c in classes]).T
+        ags0, ags1 = (Ca * ag)[:, None], (Cv * ag)[:, None]
+        T = periodos[None, :]
+        limite_1 = (Cv / Ca)[:, None] * 0.08
+        limite_2 = (Cv / Ca)[:, None] * 0.4
+        Sa = np.where(T < limite_1, ags0 * (18.75 * T * (Ca / Cv)[:, None] + 1.0),
+                      np.where(T < limite_2, 2.5 * ags0, ags1 / np.maximum(T, 1e-12)))
+        nomes = [f'NBR 15421 ag={a:g}g classe {c}' for a, c in zip(ag, classes)]
+        return cls(periodos, Sa, nomes)
+
+    def consultar(self, T) -> np.ndarray:
+        """Sa (g) de todos os espectros nos períodos T (qualquer forma) → (espectros, *T.shape)."""
+        T = np.clip(np.asarray(T, dtype=float), self.periodos[0], self.periodos[-1])
+        indice = np.clip(np.searchsorted(self.periodos, T, side='right') - 1, 0, self.periodos.size - 2)
+        peso = (T - self.periodos[indice]) / (self.periodos[indice + 1] - self.periodos[indice])
+        return self.aceleracoes[:, indice] * (1 - peso) + self.aceleracoes[:, indice + 1] * peso
+
+
+def parametros_hidrodinamicos(diametro, altura_liquido):
+    """
+    Coeficientes tabelados interpolados em H/R.
+
+    :return: dicionário com Ci, Cc, razao_impulsiva (mi/m), razao_convectiva (mc/m),
+             altura_impulsiva (hi/H) e altura_convectiva (hc/H)
+    """
+    razao = np.asarray(altura_liquido, dtype=float) / (np.asarray(diametro, dtype=float) / 2)
+    colunas = ('Ci', 'Cc', 'razao_impulsiva', 'razao_convectiva', 'altura_impulsiva', 'altura_convectiva')
+    return {nome: np.interp(razao, TABELA_MASSAS[:, 0], TABELA_MASSAS[:, k + 1]) for k, nome in enumerate(colunas)}
+
+
+def sismo(colunas: dict, espectros: Espectros, fracoes=(1.0,), espessura_costado: float = 0.008,
+          fator_importancia: float = 1.0, Rwi: float = 3.5, Rwc: float = 2.0, fator_convectivo: float = 1.5,
+          modulo_aco: float = MODULO_ACO) -> dict:
+    """
+    Esforços sísmicos e verificações do anel para todos os casos, espectros e níveis.
+
+    :param colunas: entradas com as chaves de motor_vetorizado.CAMPOS_ENTRADA (escalares ou arrays 1D)
+    :param espectros: Espectros
+    :param fracoes: níveis de enchimento (fração da altura do costado)
+    :param espessura_costado: espessura equivalente uniforme do costado (m), escalar ou por caso
+    :param fator_importancia: I
+    :param Rwi, Rwc: coeficientes de modificação de resposta impulsivo e convectivo
+    :param fator_convectivo: K (amortecimento de 0,5% no modo convectivo)
+    :param modulo_aco: módulo de elasticidade do costado (N/m²)
+    :return: dicionário com arrays (espectros, casos, níveis): Sa_impulsivo, Sa_convectivo,
+             cortante_kN, momento_kNm, altura_onda_m, Ta, sigma_cmax, P_anel, fator_seguranca e
+             utilizacao_/atende_ de arrancamento, pressao_apoio_adm e pressao_apoio_fcd; arrays
+             (casos, níveis): periodo_impulsivo, periodo_convectivo, peso_impulsivo_kN,
+             peso_convectivo_kN; e 'pior' (por caso: maior utilização e o espectro e o nível em
+             que ocorre, por verificação)
+    """
+    n = max([np.size(valor) for valor in colunas.values()])
+    coluna = lambda nome: np.broadcast_to(np.asarray(colunas[nome], dtype=float), (n,))[:, None]
+    fracoes = np.atleast_1d(np.asarray(fracoes, dtype=float))[None, :]
+
+    D, hT = coluna('diametro'), coluna('altura')
+    R = D / 2
+    gamma = coluna('densidade_fluido')
+    H = hT * fracoes                                                    # (casos, níveis)
+
+    valores = {nome: np.asarray(valor, dtype=float)[:, None] if np.ndim(valor) else valor
+               for nome, valor in colunas.items()}
+    valores['altura_liquido'] = H
+    valores['densidade_liquido'] = valores['densidade_fluido']
+
+    # Massas, alturas e períodos
+    coef = parametros_hidrodinamicos(D, H)
+    W = gamma * np.pi * R ** 2 * H                                      # kN
+    Wi, Wc = coef['razao_impulsiva'] * W, coef['razao_convectiva'] * W
+    hi, hc = coef['altura_impulsiva'] * H, coef['altura_convectiva'] * H
+    Ws, hs = coluna('peso_tanque_vazio'), hT / 2
+    rho = gamma / GRAVIDADE * 1000                                       # kg/m³
+    s = np.broadcast_to(np.asarray(espessura_costado, dtype=float), (n,))[:, None]
+    Ti = coef['Ci'] * H * np.sqrt(rho) / (np.sqrt(s / R) * np.sqrt(modulo_aco))
+    Tc = coef['Cc'] * np.sqrt(R) * np.ones_like(H)
+
+    # Espectros: (espectros, casos, níveis)
+    Sai, Sac = espectros.consultar(Ti), espectros.consultar(Tc)
+    Ai = Sai * fator_importancia / Rwi
+    Af = fator_convectivo * Sac * fator_importancia
+    Ac = Af / Rwc
+    cortante = np.hypot(Ai * (Wi + Ws), Ac * Wc)
+    momento = np.hypot(Ai * (Wi * hi + Ws * hs), Ac * Wc * hc)
+    altura_onda = 0.42 * D * Af
+
+    # Verificações do anel: fórmulas do grafo com o momento sísmico no lugar do momento do vento
+    for nome in _MOMENTOS:
+        valores[nome] = momento
+    g = {nome: np.broadcast_to(valor, momento.shape)
+         for nome, valor in compilar(_GRANDEZAS, 'numpy', _MOMENTOS).calcular(valores).items()}
+
+    resultado = {
+        'periodo_impulsivo': Ti,
+        'periodo_convectivo': Tc,
+        'peso_impulsivo_kN': Wi,
+        'peso_convectivo_kN': Wc,
+        'Sa_impulsivo': Sai,
+        'Sa_convectivo': Sac,
+        'cortante_kN': cortante,
+        'momento_kNm': momento,
+        'altura_onda_m': altura_onda,
+        'Ta': g['Ta'],
+        'sigma_cmax': g['sigma_cmax'],
+        'P_anel': g['P_anel'],
+        'fator_seguranca': g['fator_seguranca'],
+        'espectros': espectros.nomes,
+        'fracoes': fracoes[0],
+        'pior': {},
+    }
+    for nome in _VERIFICACOES_ANEL:
+        utilizacao = g[f'utilizacao_{nome}']
+        resultado[f'utilizacao_{nome}'] = utilizacao
+        resultado[f'atende_{nome}'] = g[f'atende_{nome}']
+        plano = np.moveaxis(np.where(np.isnan(utilizacao), -np.inf, utilizacao), 1, 0).reshape(n, -1)
+        indice = plano.argmax(axis=1)
+        espectro, nivel = np.unravel_index(indice, (len(espectros), fracoes.size))
+        resultado['pior'][nome] = {
+            'utilizacao': plano[np.arange(n), indice],
+            'espectro': espectro,
+            'fracao': fracoes[0][nivel],
+        }
+    return resultado
@@ -0,0 +1,205 @@
+# substituto.py
+
+"""
+Modelo substituto (caos polinomial) para exploração rápida do espaço de projeto.
+
+Ajusta, para algumas grandezas do grafo de fórmulas, um polinômio de Legendre
+de grau total limitado nas variáveis de projeto, dentro de um domínio
+retangular (as demais entradas ficam fixas). O ajuste é feito por mínimos
+quadrados sobre amostras do motor (hipercubo latino) e validado em um
+segundo conjunto independente de amostras. Os erros de validação ficam
+guardados com o modelo.
+
+Consultas:
+  - pontos dentro do domínio, para grandezas cujo erro de validação está
+    dentro da tolerância, usam o polinômio (uma multiplicação de matrizes);
+  - pontos fora do domínio, ou grandezas que o polinômio não representa bem
+    (por exemplo, com ramos de onde(...) no domínio), são calculados pelo motor.
+
+O modelo é gravado em um único .npz (coeficientes + metadados em JSON) e
+carregado sem recompilar nem reamostrar.
+"""
+
+import itertools
+import json
+
+import numpy as np
+from numpy.polynomial import legendre
+
+from grafo_formulas import compilar
+
+SAIDAS_PADRAO = ('sigma_cmax', 'b_calc', 'As', 'recalque_mm')
+
+
+def _indices_grau_total(dimensao, grau):
+    """Multi-índices (nb, d) com soma <= grau, do termo constante aos de maior grau."""
+    indices = [i for i in itertools.product(range(grau + 1), repeat=dimensao) if sum(i) <= grau]
+    return np.array(sorted(indices, key=lambda i: (sum(i), tuple(-k for k in i))), dtype=np.int64)
+
+
+def _matriz_base(x, indices, grau):
+    """Polinômios de Legendre da base avaliados em x (n, d) ∈ [-1, 1]^d → (n, nb)."""
+    matriz = np.ones((len(x), len(indices)))
+    for j in range(x.shape[1]):
+        matriz *= legendre.legvander(x[:, j], grau)[:, indices[:, j]]
+    return matriz
+
+
+def _hipercubo_latino(rng, quantidade, dimensao):
+    """Amostras em [-1, 1]^d, uma por faixa em cada variável."""
+    faixas = np.stack([rng.permutation(quantidade) for _ in range(dimensao)], axis=1)
+    return 2 * (faixas + rng.random((quantidade, dimensao))) / quantidade - 1
+
+
+class Substituto:
+    """
+    Polinômios de Legendre ajustados a grandezas do motor, com erros de validação.
+    """
+    def __init__(self, base: dict, dominio: dict, saidas, grau: int, coeficientes, erros: dict,
+                 tolerancia: float):
+        """
+        Use Substituto.treinar ou Substituto.carregar.
+
+        :param coeficientes: array (nb, saídas)
+        :param erros: saída → {'maximo', 'rms', 'relativo'} na validação
+        """
+        self.base = {chave: float(valor) for chave, valor in base.items()}
+        self.dominio = {nome: (float(a), float(b)) for nome, (a, b) in dominio.items()}
+        self.variaveis = list(self.dominio)
+        self.saidas = tuple(saidas)
+        self.grau = int(grau)
+        self.indices = _indices_grau_total(len(self.variaveis), self.grau)
+        self.coeficientes = np.asarray(coeficientes, dtype=float)
+        self.erros = erros
+        self.tolerancia = float(tolerancia)
+        self._minimos = np.array([a for a, _ in self.dominio.values()])
+        self._maximos = np.array([b for _, b in self.dominio.values()])
+
+    # ------------------------------------------------------------------ ajuste
+
+    @classmethod
+    def treinar(cls, base: dict, dominio: dict, saidas=SAIDAS_PADRAO, grau: int = 4, amostras: int = None,
+                validacao: int = None, tolerancia: float = 0.01, semente: int = 0) -> 'Substituto':
+        """
+        Ajusta o modelo a amostras do motor.
+
+        :param base: entradas fixas (chaves de motor_vetorizado.CAMPOS_ENTRADA, escalares)
+        :param dominio: variável → (mínimo, máximo)
+        :param saidas: grandezas do grafo a representar
+        :param grau: grau total dos polinômios
+        :param amostras: amostras de ajuste (padrão: 3 × número de termos)
+        :param validacao: amostras de validação, independentes das de ajuste (padrão: 4 × termos, mínimo 500)
+        :param tolerancia: erro máximo de validação, relativo à amplitude da grandeza no domínio,
+                           para que o polinômio seja usado
+        """
+        modelo = cls(base, dominio, saidas, grau, np.zeros((0, len(saidas))), {}, tolerancia)
+        termos = len(modelo.indices)
+        rng = np.random.default_rng(semente)
+
+        x = _hipercubo_latino(rng, amostras or 3 * termos, len(modelo.variaveis))
+        y = modelo._motor(modelo._fisico(x))
+        matriz = _matriz_base(x, modelo.indices, modelo.grau)
+        modelo.coeficientes = np.linalg.lstsq(matriz, y, rcond=None)[0]
+
+        xv = _hipercubo_latino(rng, validacao or max(500, 4 * termos), len(modelo.variaveis))
+        yv = modelo._motor(modelo._fisico(xv))
+        erro = _matriz_base(xv, modelo.indices, modelo.grau) @ modelo.coeficientes - yv
+        amplitude = np.ptp(yv, axis=0)
+        for k, nome in enumerate(modelo.saidas):
+            maximo = float(np.abs(erro[:, k]).max())
+            modelo.erros[nome] = {
+                'maximo': maximo,
+                'rms': float(np.sqrt(np.mean(erro[:, k] ** 2))),
+                'relativo': float(maximo / amplitude[k]) if amplitude[k] > 0 else (0.0 if maximo == 0 else np.inf),
+                'amostras': int(len(xv)),
+            }
+        return modelo
+
+    def _fisico(self, x):
+        return self._minimos + (x + 1) / 2 * (self._maximos - self._minimos)
+
+    def _normalizado(self, pontos):
+        return 2 * (pontos - self._minimos) / (self._maximos - self._minimos) - 1
+
+    def _motor(self, pontos, saidas=None):
+        """Grandezas calculadas pelo motor nos pontos (n, d) → (n, saídas)."""
+        saidas = tuple(saidas or self.saidas)
+        valores = dict(self.base)
+        for j, nome in enumerate(self.variaveis):
+            valores[nome] = pontos[:, j]
+        valores.setdefault('altura_liquido', valores['altura'])
+        valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+        r = compilar(saidas, 'numpy').calcular(valores)
+        return np.stack([np.broadcast_to(r[nome], (len(pontos),)) for nome in saidas], axis=1).astype(float)
+
+    # ------------------------------------------------------------------ consulta
+
+    @property
+    def confiaveis(self) -> tuple:
+        """Grandezas cujo erro de validação relativo está dentro da tolerância."""
+        return tuple(nome for nome in self.saidas if self.erros[nome]['relativo'] <= self.tolerancia)
+
+    def no_dominio(self, pontos) -> np.ndarray:
+        """Máscara dos pontos (n, d) dentro do domínio de ajuste."""
+        return np.all((pontos >= self._minimos) & (pontos <= self._maximos), axis=1)
+
+    def prever(self, valores: dict, saidas=None) -> dict:
+        """
+        Grandezas nos pontos pedidos: pelo polinômio dentro do domínio (grandezas
+        confiáveis) e pelo motor nos demais casos.
+
+        :param valores: variável → escalar ou array (todas as variáveis do domínio)
+        :param saidas: grandezas desejadas (padrão: todas as do modelo)
+        :return: grandeza → array, e 'substituto' (grandeza → máscara dos pontos em que o
+                 polinômio foi usado)
+        """
+        saidas = tuple(saidas or self.saidas)
+        faltantes = [nome for nome in self.variaveis if nome not in valores]
+        if faltantes:
+            raise ValueError(f"Variáveis do substituto não informadas: {faltantes}")
+        colunas = np.broadcast_arrays(*[np.asarray(valores[nome], dtype=float) for nome in self.variaveis])
+        forma = colunas[0].shape
+        pontos = np.stack([c.ravel() for c in colunas], axis=1)
+
+        dentro = self.no_dominio(pontos)
+        usar = {nome: dentro if nome in self.confiaveis else np.zeros(len(pontos), dtype=bool) for nome in saidas}
+        resultado = {nome: np.empty(len(pontos)) for nome in saidas}
+
+        modelados = [nome for nome in saidas if nome in self.confiaveis]
+        if modelados and dentro.any():
+            colunas_coef = [self.saidas.index(nome) for nome in modelados]
+            y = _matriz_base(self._normalizado(pontos[dentro]), self.indices, self.grau) @ self.coeficientes[:, colunas_coef]
+            for k, nome in enumerate(modelados):
+                resultado[nome][dentro] = y[:, k]
+
+        pelo_motor = [nome for nome in saidas if not usar[nome].all()]
+        if pelo_motor:
+            fora = np.nonzero(~np.logical_and.reduce([usar[nome] for nome in pelo_motor]))[0]
+            y = self._motor(pontos[fora], pelo_motor)
+            for k, nome in enumerate(pelo_motor):
+                calcular = ~usar[nome][fora]
+                resultado[nome][fora[calcular]] = y[calcular, k]
+
+        saida = {nome: valor.reshape(forma) for nome, valor in resultado.items()}
+        saida['substituto'] = {nome: mascara.reshape(forma) for nome, mascara in usar.items()}
+        return saida
+
+    # ------------------------------------------------------------------ persistência
+
+    def salvar(self, caminho: str):
+        """Grava o modelo em um arquivo .npz."""
+        meta = {
+            'base': self.base, 'dominio': self.dominio, 'saidas': list(self.saidas), 'grau': self.grau,
+            'erros': self.erros, 'tolerancia': self.tolerancia,
+        }
+        with open(caminho, 'wb') as f:
+            np.savez(f, coeficientes=self.coeficientes, meta=np.array(json.dumps(meta, ensure_ascii=False)))
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'Substituto':
+        """Carrega um modelo gravado por salvar()."""
+        with np.load(caminho) as arquivo:
+            meta = json.loads(str(arquivo['meta']))
+            coeficientes = arquivo['coeficientes']
+        return cls(meta['base'], meta['dominio'], meta['saidas'], meta['grau'], coeficientes, meta['erros'],
+                   meta['tolerancia'])
@@ -0,0 +1,55 @@
+# test_fronteira_adaptativa.py
+
+"""
+Fronteira adaptativa em domínios sem fronteira (tudo atende ou nada atende)
+e em um domínio que a atravessa, com o tanque de referência.
+"""
+
+import json
+import os
+import unittest
+
+import numpy as np
+
+from caso import Caso
+from fronteira_adaptativa import fronteira_adaptativa
+from motor_vetorizado import colunas_de_entrada
+from processamento import montar_materiais
+
+ARQUIVO_REFERENCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados_MC-31PE-6251.json')
+
+
+class TestFronteiraAdaptativa(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(ARQUIVO_REFERENCIA, 'r', encoding='utf-8') as f:
+            caso = Caso.de_dados(json.load(f))
+        cls.base = colunas_de_entrada(caso, montar_materiais(caso))
+
+    def verificar_sem_fronteira(self, variaveis):
+        resultado = fronteira_adaptativa(self.base, variaveis, niveis=3)
+        self.assertEqual(resultado['fronteira']['centros'].shape, (0, len(variaveis)))
+        self.assertEqual(len(resultado['fronteira']['governante']), 0)
+        # só a grade inicial é avaliada
+        self.assertEqual(resultado['avaliacoes'], 9 ** len(variaveis))
+        return resultado
+
+    def test_tudo_atende(self):
+        resultado = self.verificar_sem_fronteira({'altura': (5, 10), 'densidade_fluido': (8, 9)})
+        self.assertTrue(resultado['atende'].all())
+
+    def test_nada_atende(self):
+        resultado = self.verificar_sem_fronteira({'altura': (50, 80), 'densidade_fluido': (20, 30)})
+        self.assertFalse(resultado['atende'].any())
+
+    def test_fronteira(self):
+        resultado = fronteira_adaptativa(self.base, {'altura': (5, 40), 'densidade_fluido': (8, 30)}, niveis=3)
+        centros = resultado['fronteira']['centros']
+        self.assertGreater(len(centros), 0)
+        self.assertEqual(len(resultado['fronteira']['governante']), len(centros))
+        self.assertLess(resultado['avaliacoes'], resultado['avaliacoes_grade_uniforme'])
+        self.assertTrue(np.all((centros >= [5, 8]) & (centros <= [40, 30])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# test_servico.py
+
+"""
+Serviço de cálculo rodando localmente, exercitado pelo ClienteServico.
+
+O único processo de cálculo é ocupado por uma espera (time.sleep) enquanto os
+pedidos concorrentes são enviados, para que o agrupamento e a fila cheia
+ocorram de forma determinística.
+"""
+
+import asyncio
+import http.client
+import threading
+import time
+import unittest
+
+from gerador_casos import gerar_casos
+from servico import ClienteServico, ErroServico, ServicoCalculo
+
+
+def _aguardar(condicao, limite=30.0):
+    inicio = time.monotonic()
+    while not condicao():
+        if time.monotonic() - inicio > limite:
+            raise AssertionError("Tempo esgotado aguardando o serviço.")
+        time.sleep(0.01)
+
+
+class TestServico(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        cls.servico = ServicoCalculo(porta=0, processos=1, limite_fila=1)
+        asyncio.run_coroutine_threadsafe(cls.servico.iniciar(), cls.loop).result(timeout=120)
+        cls.casos = gerar_casos(3, semente=7)
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.servico.encerrar(), cls.loop).result(timeout=60)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+
+    def cliente(self):
+        cliente = ClienteServico(porta=self.servico.porta)
+        self.addCleanup(cliente.fechar)
+        return cliente
+
+    def pedido_bruto(self, corpo: bytes):
+        conexao = http.client.HTTPConnection('127.0.0.1', self.servico.porta, timeout=30)
+        self.addCleanup(conexao.close)
+        conexao.request('POST', '/calcular', body=corpo, headers={'Content-Type': 'application/json'})
+        resposta = conexao.getresponse()
+        resposta.read()
+        return resposta.status
+
+    def test_content_length_invalido(self):
+        for valor in ('abc', '-5'):
+            conexao = http.client.HTTPConnection('127.0.0.1', self.servico.porta, timeout=30)
+            self.addCleanup(conexao.close)
+            conexao.putrequest('POST', '/calcular')
+            conexao.putheader('Content-Length', valor)
+            conexao.endheaders()
+            resposta = conexao.getresponse()
+            resposta.read()
+            self.assertEqual(resposta.status, 400, valor)
+        self.assertEqual(self.servico.contadores['erros'], 0)
+
+    def test_fluxo_completo(self):
+        cliente = self.cliente()
+
+        # Cálculo e, na repetição, cache
+        primeira = cliente.calcular(self.casos[0])
+        segunda = cliente.calcular(self.casos[0])
+        self.assertEqual(primeira['origem'], 'calculo')
+        self.assertEqual(segunda['origem'], 'cache')
+        self.assertEqual(primeira['hash'], segunda['hash'])
+        self.assertEqual(primeira['resultados'], segunda['resultados'])
+
+        # Corpo inválido
+        self.assertEqual(self.pedido_bruto(b'{"geometria": '), 400)
+        with self.assertRaises(ErroServico) as erro:
+            cliente._pedir('POST', '/calcular', [1, 2, 3])
+        self.assertEqual(erro.exception.status, 400)
+
+        # Processo ocupado: pedidos idênticos agrupados e fila cheia
+        bloqueio = self.servico._executor.submit(time.sleep, 1.0)
+        respostas = {}
+
+        def pedir(nome):
+            cliente = ClienteServico(porta=self.servico.porta)
+            try:
+                respostas[nome] = cliente.calcular(self.casos[1])
+            finally:
+                cliente.fechar()
+
+        primeiro = threading.Thread(target=pedir, args=('primeiro',))
+        primeiro.start()
+        _aguardar(lambda: len(self.servico._em_andamento) == 1)
+        agrupado = threading.Thread(target=pedir, args=('agrupado',))
+        agrupado.start()
+        _aguardar(lambda: self.servico.contadores['agrupados'] == 1)
+
+        with self.assertRaises(ErroServico) as erro:
+            cliente.calcular(self.casos[2])
+        self.assertEqual(erro.exception.status, 503)
+        self.assertIn('Retry-After', erro.exception.cabecalhos)
+
+        primeiro.join(timeout=60)
+        agrupado.join(timeout=60)
+        bloqueio.result(timeout=60)
+        self.assertEqual(respostas['primeiro']['origem'], 'calculo')
+        self.assertEqual(respostas['agrupado']['origem'], 'agrupado')
+        self.assertEqual(respostas['primeiro']['resultados'], respostas['agrupado']['resultados'])
+
+        # Contadores em /saude
+        saude = cliente.saude()
+        contadores = saude['contadores']
+        self.assertEqual(contadores['calculos'], 2)
+        self.assertEqual(contadores['cache'], 1)
+        self.assertEqual(contadores['agrupados'], 1)
+        self.assertEqual(contadores['recusados'], 1)
+        self.assertEqual(contadores['pedidos'], 8)
+        self.assertEqual(saude['em_andamento'], 0)
+        self.assertEqual(saude['limite_fila'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
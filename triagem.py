@@ -0,0 +1,101 @@
+# triagem.py
+
+"""
+Triagem rápida (aprovado / reprovado) de muitos candidatos.
+
+Para otimização e varreduras de viabilidade basta saber se o candidato
+atende a todas as verificações. A triagem avalia uma verificação de cada vez,
+cada uma com um núcleo de grafo_formulas que calcula só o que ela exige, e
+após cada verificação compacta os candidatos sobreviventes: as verificações
+seguintes só são calculadas para quem ainda não foi reprovado.
+
+A ordem das verificações é aprendida durante a execução: para cada uma
+são acumulados o tempo por candidato (c) e a taxa de reprovação (p), e a
+ordem passa a ser a crescente de c / p (a que minimiza o custo esperado para
+filtros independentes). Antes de haver estatísticas, a ordem inicial começa
+pelas verificações de tensão no solo e de pressão máxima de apoio.
+"""
+
+import time
+
+import numpy as np
+
+from grafo_formulas import compilar, VERIFICACOES
+
+ORDEM_INICIAL = ('tensao_solo', 'pressao_apoio_adm') + tuple(
+    nome for nome in VERIFICACOES if nome not in ('tensao_solo', 'pressao_apoio_adm')
+)
+
+
+class Triagem:
+    """
+    Avaliação aprovado/reprovado com parada na primeira verificação não atendida.
+    """
+    def __init__(self, verificacoes=ORDEM_INICIAL):
+        self.ordem = [nome for nome in verificacoes if nome in VERIFICACOES]
+        self._nucleos = {nome: compilar((f'atende_{nome}',), 'numpy') for nome in self.ordem}
+        self.tempo = dict.fromkeys(self.ordem, 0.0)
+        self.avaliados = dict.fromkeys(self.ordem, 0)
+        self.reprovados = dict.fromkeys(self.ordem, 0)
+
+    def custo_esperado(self, nome: str) -> float:
+        """c / p: tempo por candidato dividido pela taxa de reprovação (com suavização de Laplace)."""
+        avaliados = self.avaliados[nome]
+        custo = self.tempo[nome] / avaliados if avaliados else 0.0
+        taxa = (self.reprovados[nome] + 1) / (avaliados + 2)
+        return custo / taxa
+
+    def _reordenar(self):
+        if all(self.avaliados.values()):
+            self.ordem.sort(key=self.custo_esperado)
+
+    def triar(self, colunas: dict) -> dict:
+        """
+        Triagem de um lote de candidatos.
+
+        :param colunas: entradas com as chaves de motor_vetorizado.CAMPOS_ENTRADA (escalares ou
+                        arrays 1D, todos com o mesmo número de candidatos)
+        :return: dicionário com 'atende' (bool por candidato), 'reprovado_por' (nome da primeira
+                 verificação não atendida, ou None) e 'ordem' (ordem usada)
+        """
+        n = max([np.size(valor) for valor in colunas.values()])
+        valores = dict(colunas)
+        valores.setdefault('altura_liquido', valores['altura'])
+        valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+        vetoriais = [chave for chave, valor in valores.items() if np.ndim(valor)]
+
+        reprovado_por = np.full(n, None, dtype=object)
+        ativos = np.arange(n)
+        ordem = list(self.ordem)
+        for nome in ordem:
+            inicio = time.perf_counter()
+            atende = np.broadcast_to(self._nucleos[nome].calcular(valores)[f'atende_{nome}'], (len(ativos),))
+            self.tempo[nome] += time.perf_counter() - inicio
+            self.avaliados[nome] += len(ativos)
+
+            falhas = ~atende.astype(bool)
+            self.reprovados[nome] += int(np.count_nonzero(falhas))
+            reprovado_por[ativos[falhas]] = nome
+            if falhas.any():
+                ativos = ativos[~falhas]
+                if not len(ativos):
+                    break
+                valores = {chave: (valor[~falhas] if chave in vetoriais else valor) for chave, valor in valores.items()}
+
+        self._reordenar()
+        return {
+            'atende': np.equal(reprovado_por, None),
+            'reprovado_por': reprovado_por,
+            'ordem': ordem,
+        }
+
+    def estatisticas(self) -> dict:
+        """Por verificação: candidatos avaliados, taxa de reprovação e tempo por candidato (µs)."""
+        return {
+            nome: {
+                'avaliados': self.avaliados[nome],
+                'taxa_reprovacao': self.reprovados[nome] / self.avaliados[nome] if self.avaliados[nome] else None,
+                'tempo_por_caso_us': 1e6 * self.tempo[nome] / self.avaliados[nome] if self.avaliados[nome] else None,
+            }
+            for nome in self.ordem
+        }
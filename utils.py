@@ -1,30 +1,125 @@
 # utils.py
 
 import math
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+# Relações diretas entre unidades: (unidade, fator, outra) significa 1 unidade = fator · outra.
+# As demais conversões são obtidas por busca de caminho neste grafo (fator_conversao).
+RELACOES_UNIDADES = (
+    # comprimento
+    ('m', 100, 'cm'), ('cm', 10, 'mm'), ('m', 1000, 'mm'), ('km', 1000, 'm'),
+    ('ft', 0.3048, 'm'), ('in', 25.4, 'mm'),
+    # área e volume
+    ('m2', 10000, 'cm2'), ('cm2', 100, 'mm2'), ('m2', 1e6, 'mm2'), ('ft2', 0.09290304, 'm2'),
+    ('m3', 1000, 'l'), ('m3', 1e6, 'cm3'),
+    # força
+    ('kN', 1000, 'N'), ('tf', 9.80665, 'kN'), ('tf', 1000, 'kgf'), ('kgf', 9.80665, 'N'),
+    ('MN', 1000, 'kN'), ('kip', 4.4482216152605, 'kN'), ('kip', 1000, 'lbf'),
+    # momento
+    ('kNm', 100, 'kNcm'), ('kNm', 1000, 'Nm'), ('Nm', 1000, 'Nmm'), ('tfm', 9.80665, 'kNm'),
+    # força por comprimento
+    ('kN/m', 1000, 'N/m'), ('tf/m', 9.80665, 'kN/m'),
+    # pressão e tensão
+    ('kN/m2', 1, 'kPa'), ('kPa', 1000, 'Pa'), ('MPa', 1000, 'kPa'), ('GPa', 1000, 'MPa'),
+    ('MPa', 1, 'N/mm2'), ('N/m2', 1, 'Pa'), ('kN/cm2', 10000, 'kN/m2'), ('kN/cm2', 10, 'MPa'),
+    ('kgf/cm2', 98.0665, 'kN/m2'), ('tf/m2', 9.80665, 'kN/m2'), ('MN/m2', 1, 'MPa'), ('bar', 100, 'kPa'),
+    ('psi', 6.894757293168, 'kPa'), ('ksi', 1000, 'psi'),
+    # peso específico
+    ('kN/m3', 1000, 'N/m3'), ('tf/m3', 9.80665, 'kN/m3'), ('lbf/ft3', 0.15708746, 'kN/m3'),
+    # velocidade
+    ('m/s', 3.6, 'km/h'),
+    # adimensional
+    ('-', 1, ''),
+)
+
+_SUBSTITUICOES = (('²', '2'), ('³', '3'), ('·', ''), ('*', ''), ('.', ''), (' ', ''))
+
+
+def _normalizar_unidade(unidade: str) -> str:
+    """'kN/m²', 'kN·m' e 'kN.m' viram 'kN/m2', 'kNm' e 'kNm'."""
+    unidade = unidade.strip()
+    for antigo, novo in _SUBSTITUICOES:
+        unidade = unidade.replace(antigo, novo)
+    return unidade
+
+
+def _grafo_unidades():
+    grafo = {}
+    for origem, fator, destino in RELACOES_UNIDADES:
+        grafo.setdefault(origem, []).append((destino, fator))
+        grafo.setdefault(destino, []).append((origem, 1 / fator))
+    return grafo
+
+
+_GRAFO_UNIDADES = _grafo_unidades()
+
+
+def _fator(origem, destino):
+    if origem == destino:
+        return 1.0
+    if origem not in _GRAFO_UNIDADES or destino not in _GRAFO_UNIDADES:
+        return None
+    # Busca em largura: menor número de relações (menos arredondamentos acumulados)
+    fatores = {origem: 1.0}
+    fila = deque([origem])
+    while fila:
+        atual = fila.popleft()
+        for vizinha, fator in _GRAFO_UNIDADES[atual]:
+            if vizinha not in fatores:
+                fatores[vizinha] = fatores[atual] * fator
+                if vizinha == destino:
+                    return fatores[vizinha]
+                fila.append(vizinha)
+    return None
+
+
+@lru_cache(maxsize=None)
+def fator_conversao(unidade_origem: str, unidade_destino: str) -> float:
+    """
+    Fator f tal que valor_destino = f · valor_origem.
+
+    O fator é obtido pelo caminho entre as unidades no grafo de RELACOES_UNIDADES
+    e guardado em cache, pelas unidades como informadas, após a primeira consulta
+    (as consultas seguintes não repetem a normalização dos nomes).
+    """
+    fator = _fator(_normalizar_unidade(unidade_origem), _normalizar_unidade(unidade_destino))
+    if fator is None:
+        raise ValueError(f"Conversão de {unidade_origem} para {unidade_destino} não suportada.")
+    return fator
 
 
 def converter_unidades(valor, unidade_origem, unidade_destino):
     """
     Converte valor entre unidades de medida comuns usadas em engenharia estrutural.
-    """
-    fatores_conversao = {
-        ('kNm', 'kNcm'): 100,
-        ('kNcm', 'kNm'): 0.01,
-        ('MPa', 'kN/cm2'): 0.01,
-        ('kN/cm2', 'MPa'): 100,
-        ('tf', 'kN'): 9.80665,
-        ('kN', 'tf'): 1/9.80665
-    }
-
-    chave = (unidade_origem, unidade_destino)
 
+    Aceita escalares, listas e arrays NumPy (convertidos com uma única multiplicação).
+    """
     if unidade_origem == unidade_destino:
         return valor
+    fator = fator_conversao(unidade_origem, unidade_destino)
+    if isinstance(valor, (list, tuple)):
+        valor = np.asarray(valor, dtype=float)
+    return valor * fator
+
 
-    if chave in fatores_conversao:
-        return valor * fatores_conversao[chave]
-    
-    raise ValueError(f"Conversão de {unidade_origem} para {unidade_destino} não suportada.")
+def converter_colunas(colunas: dict, unidades_origem: dict, unidades_destino: dict) -> dict:
+    """
+    Converte várias colunas de uma vez.
+
+    :param colunas: nome → valores (escalar ou array)
+    :param unidades_origem: nome → unidade em que a coluna está
+    :param unidades_destino: nome → unidade desejada
+    :return: novo dicionário; colunas sem unidade de origem ou de destino são repassadas
+    """
+    convertidas = dict(colunas)
+    for nome, valores in colunas.items():
+        origem, destino = unidades_origem.get(nome), unidades_destino.get(nome)
+        if origem is not None and destino is not None:
+            convertidas[nome] = converter_unidades(valores, origem, destino)
+    return convertidas
 
 
 def calcular_area_circular(diametro_m):
@@ -0,0 +1,123 @@
+# varredura_grade.py
+
+"""
+Varredura em grade (produto cartesiano de algumas entradas) sem recalcular o
+que não depende dos eixos varridos.
+
+Cada entrada varrida recebe um eixo próprio (formas (n0, 1), (1, n1), ...) e
+as demais ficam escalares. Como o núcleo numpy de grafo_formulas opera por
+broadcasting, cada grandeza intermediária é calculada apenas sobre os eixos de
+que depende: q_vento e Fv pela geometria do tanque, phi por PTV e diâmetro,
+WA por diametro_base, e assim por diante. Só no final as saídas são expandidas
+para a grade completa (np.broadcast_to, sem cópia).
+
+Em uma grade 200 × 200 de lado_b_m × altura_base, por exemplo, as grandezas do
+costado e do solo são calculadas uma vez, as que dependem só da largura 200
+vezes e apenas as que dependem das duas, 40 000 vezes.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from grafo_formulas import compilar, ENTRADAS, GRAFO, VERIFICACOES
+from motor_vetorizado import SAIDAS
+
+
+@lru_cache(maxsize=None)
+def entradas_de(nome: str) -> frozenset:
+    """Entradas (folhas do grafo) de que uma grandeza depende, direta ou indiretamente."""
+    if nome not in GRAFO:
+        return frozenset((nome,))
+    entradas, pendentes, vistos = set(), [nome], set()
+    while pendentes:
+        atual = pendentes.pop()
+        if atual in vistos:
+            continue
+        vistos.add(atual)
+        for ref in GRAFO[atual].referencias:
+            if ref in GRAFO:
+                pendentes.append(ref)
+            elif ref in ENTRADAS:
+                entradas.add(ref)
+    return frozenset(entradas)
+
+
+def _eixos(eixos: dict):
+    """
+    Normaliza os eixos: nome (ou tupla de nomes variando juntos) → valores.
+
+    :return: lista de (nomes, lista de arrays 1D de mesmo tamanho)
+    """
+    normalizados = []
+    for chave, valores in eixos.items():
+        nomes = chave if isinstance(chave, tuple) else (chave,)
+        series = [np.asarray(v, dtype=float) for v in (valores if len(nomes) > 1 else (valores,))]
+        if len(series) != len(nomes) or any(s.ndim != 1 or s.size != series[0].size for s in series):
+            raise ValueError(f"Eixo {chave}: informe um array 1D por entrada, todos do mesmo tamanho.")
+        normalizados.append((nomes, series))
+    return normalizados
+
+
+def varrer_grade(base: dict, eixos: dict, saidas=SAIDAS, expandir: bool = True) -> dict:
+    """
+    Avalia as saídas em todos os pontos da grade formada pelos eixos.
+
+    :param base: entradas fixas (chaves de motor_vetorizado.CAMPOS_ENTRADA, escalares), por
+                 exemplo motor_vetorizado.colunas_de_entrada(entrada, materiais)
+    :param eixos: nome da entrada → valores (1D), na ordem dos eixos da grade; para entradas
+                  que variam juntas, (nome1, nome2) → (valores1, valores2)
+    :param saidas: grandezas do grafo a calcular
+    :param expandir: se True, todas as saídas têm a forma da grade (vistas somente leitura);
+                     se False, cada saída mantém só os eixos de que depende
+    :return: dicionário com 'eixos' (nomes por eixo), 'forma', 'resultados' (nome → array),
+             'eixos_dependencia' (nome → índices dos eixos de que a saída depende) e
+             'avaliacoes' (pontos efetivamente calculados por saída)
+    """
+    normalizados = _eixos(eixos)
+    forma = tuple(series[0].size for _, series in normalizados)
+    valores = dict(base)
+    for posicao, (nomes, series) in enumerate(normalizados):
+        formato = [1] * len(forma)
+        formato[posicao] = -1
+        for nome, serie in zip(nomes, series):
+            valores[nome] = serie.reshape(formato)
+    valores.setdefault('altura_liquido', valores['altura'])
+    valores.setdefault('densidade_liquido', valores['densidade_fluido'])
+
+    resultados = compilar(tuple(saidas), 'numpy').calcular(valores)
+
+    dependencia, avaliacoes = {}, {}
+    for nome, valor in resultados.items():
+        entradas = entradas_de(nome)
+        dependencia[nome] = tuple(i for i, (nomes, _) in enumerate(normalizados) if entradas.intersection(nomes))
+        avaliacoes[nome] = int(np.size(valor))
+        if expandir:
+            resultados[nome] = np.broadcast_to(valor, forma)
+
+    return {
+        'eixos': [nomes for nomes, _ in normalizados],
+        'forma': forma,
+        'resultados': resultados,
+        'eixos_dependencia': dependencia,
+        'avaliacoes': avaliacoes,
+    }
+
+
+def mapa_verificacoes(resultados: dict) -> dict:
+    """
+    Mapa de aprovação da grade: atende a todas as verificações, maior utilização e
+    verificação governante (a de maior utilização) em cada ponto.
+
+    :param resultados: 'resultados' de varrer_grade (com as utilizações de VERIFICACOES)
+    """
+    nomes = list(VERIFICACOES)
+    utilizacoes = np.stack(np.broadcast_arrays(*[resultados[f'utilizacao_{nome}'] for nome in nomes]))
+    utilizacoes = np.where(np.isnan(utilizacoes), -np.inf, utilizacoes)
+    indice = np.argmax(utilizacoes, axis=0)
+    atende = np.logical_and.reduce(np.broadcast_arrays(*[resultados[f'atende_{nome}'] for nome in nomes]))
+    return {
+        'atende': atende,
+        'utilizacao_maxima': np.take_along_axis(utilizacoes, indice[None], axis=0)[0],
+        'governante': np.array(nomes, dtype=object)[indice],
+    }